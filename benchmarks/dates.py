@@ -0,0 +1,116 @@
+"""
+Microbenchmark of the parsing of Heurist dates, with and without the cache of \
+    parsed dates, and of the conversion of temporal objects, with and without \
+    the `TemporalObject` model, over the date fixtures in `mock_data.date`.
+
+Run from the root of the repository:
+
+    python benchmarks/dates.py --repeat 100000
+"""
+
+import argparse
+
+from heurist.models.dynamic.date import TemporalObject, dump_temporal_object
+from heurist.validators.parse_heurist_date import (
+    _parse_heurist_date,
+    _parse_heurist_date_cached,
+    parse_heurist_date,
+)
+from mock_data.date import (
+    compound_repeated,
+    compound_single,
+    simple_single,
+    timestamp_repeated,
+)
+from timing import best_time
+
+DATE_KEYS = {"earliest", "latest", "value", "estMinDate", "estMaxDate", "in"}
+
+
+def raw_dates(obj) -> list:
+    """Collect the raw dates nested in a fixture's details."""
+
+    dates = []
+    if isinstance(obj, list):
+        for item in obj:
+            dates.extend(raw_dates(item))
+    elif isinstance(obj, dict):
+        for key, value in obj.items():
+            if isinstance(value, (dict, list)):
+                dates.extend(raw_dates(value))
+            elif key in DATE_KEYS and value is not None:
+                dates.append(value)
+    return dates
+
+
+def date_details() -> list[dict]:
+    details = []
+    for module in [compound_repeated, compound_single, simple_single]:
+        detail = module.DETAIL
+        details.extend(detail if isinstance(detail, list) else [detail])
+    details.extend(timestamp_repeated.DETAIL)
+    return details
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    details = date_details()
+    dates = raw_dates(details) * args.repeat
+
+    # The cached path must return the same dates as the uncached one
+    for d in set(dates):
+        uncached = _parse_heurist_date(d)
+        assert parse_heurist_date(d).model_dump() == uncached.model_dump()
+
+    def uncached():
+        for d in dates:
+            _parse_heurist_date(d).model_dump()
+
+    def cached():
+        _parse_heurist_date_cached.cache_clear()
+        for d in dates:
+            parse_heurist_date(d).model_dump()
+
+    raw_objects = []
+    for detail in details:
+        value = detail.get("value")
+        raw_objects.append(value if isinstance(value, dict) else detail)
+    raw_objects *= args.repeat
+
+    def with_model():
+        for raw in raw_objects:
+            TemporalObject.model_validate(raw).model_dump(by_alias=True)
+
+    def without_model():
+        for raw in raw_objects:
+            dump_temporal_object(raw)
+
+    print(f"{len(dates)} raw dates, best of {args.rounds}")
+    baseline = None
+    for name, func in [("uncached", uncached), ("cached", cached)]:
+        seconds = best_time(func, repeat=args.rounds)
+        baseline = baseline or seconds
+        print(
+            f"{name:>10}: {seconds:7.3f} s"
+            f"  {len(dates) / seconds:10.0f} dates/s"
+            f"  x{baseline / seconds:.2f}"
+        )
+
+    print(f"\n{len(raw_objects)} temporal objects, best of {args.rounds}")
+    baseline = None
+    for name, func in [("model", with_model), ("plain", without_model)]:
+        seconds = best_time(func, repeat=args.rounds)
+        baseline = baseline or seconds
+        print(
+            f"{name:>10}: {seconds:7.3f} s"
+            f"  {len(raw_objects) / seconds:10.0f} objects/s"
+            f"  x{baseline / seconds:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
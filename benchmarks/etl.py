@@ -0,0 +1,184 @@
+"""
+End-to-end benchmark of the stages that load a record type's records into \
+    DuckDB, over a synthetic corpus of any size and mix of data types, with a \
+    JSON report that can be compared to the report of a previous run.
+
+Run from the root of the repository:
+
+    python benchmarks/etl.py --records 100000 --output etl.json
+    python benchmarks/etl.py --records 100000 --baseline etl.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+from datetime import datetime
+from importlib.metadata import version
+
+from heurist.api.client import filter_records
+from heurist.database import TransformedDatabase
+from heurist.models.dynamic import HeuristRecord
+from heurist.utils.metrics import ETLMetrics
+from mock_data import DB_STRUCTURE_XML
+from mock_data.synthetic import (
+    DEFAULT_FIELD_MIX,
+    generate_records,
+    synthesize_detail_metadata,
+)
+from timing import summarize
+
+RECORD_TYPE = 103
+STAGES = [
+    "structure parse",
+    "json decode",
+    "model creation",
+    "flatten",
+    "validate",
+    "dataframe build",
+    "table create",
+]
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    """Parse a field mix such as "date=2,enum=1,geo=1"."""
+
+    mix = {}
+    for item in value.split(","):
+        data_type, _, count = item.partition("=")
+        mix[data_type.strip()] = int(count or 1)
+    return mix
+
+
+def run_stages(payload: bytes, detail_metadata: list[dict]) -> dict[str, float]:
+    """Run every stage once, in order, through the same methods and metrics as \
+        the ETL workflow, and return the seconds each one took."""
+
+    metrics = ETLMetrics()
+    with metrics.stage("structure parse"):
+        db = TransformedDatabase(DB_STRUCTURE_XML)
+    with metrics.stage("json decode", rty_ID=RECORD_TYPE):
+        records = filter_records(content=payload, record_type_id=RECORD_TYPE)
+    # Replace the mock record type's model with the model of the synthetic fields
+    with metrics.stage("model creation", rty_ID=RECORD_TYPE):
+        db.pydantic_models[RECORD_TYPE] = HeuristRecord(
+            rty_ID=RECORD_TYPE,
+            rty_Name="Synthetic",
+            detail_metadata=detail_metadata,
+        )
+    validated = db.validate_records(
+        record_type_id=RECORD_TYPE, records=records, metrics=metrics
+    )
+    table = db.load_records(validated=validated, metrics=metrics)
+    inserted = table.count("*").fetchone()[0]
+    assert inserted == len(records), (inserted, len(records))
+    return {row["stage"]: row["seconds"] for row in metrics.rows}
+
+
+def build_report(args: argparse.Namespace, runs: list[dict], payload: bytes) -> dict:
+    stages = {
+        stage: summarize([run[stage] for run in runs], args.records) for stage in STAGES
+    }
+    return {
+        "benchmark": "etl",
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            **{
+                package: version(package)
+                for package in ["heurist-api", "duckdb", "pyarrow", "pydantic"]
+            },
+        },
+        "parameters": {
+            "records": args.records,
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "fill_rate": args.fill_rate,
+            "mix": args.mix,
+            "payload_bytes": len(payload),
+        },
+        "stages": stages,
+        "total_best_seconds": round(sum(s["best_seconds"] for s in stages.values()), 6),
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """List the stages that are slower than in the baseline, beyond a tolerance."""
+
+    regressions = []
+    for stage, result in report["stages"].items():
+        before = baseline.get("stages", {}).get(stage)
+        if not before or not before["best_seconds"]:
+            continue
+        ratio = result["best_seconds"] / before["best_seconds"]
+        print(f"{stage:>16}: x{ratio:.2f} of baseline")
+        if ratio > 1 + tolerance:
+            regressions.append(stage)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fill-rate", type=float, default=0.8)
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=DEFAULT_FIELD_MIX,
+        help='Number of fields of each data type, e.g. "date=2,enum=2,geo=1".',
+    )
+    parser.add_argument("--output", help="Path to the JSON report.")
+    parser.add_argument("--baseline", help="Path to the JSON report of a previous run.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="Slowdown, as a fraction of the baseline, that counts as a regression.",
+    )
+    args = parser.parse_args()
+
+    detail_metadata = synthesize_detail_metadata(args.mix)
+    records = list(
+        generate_records(
+            args.records,
+            detail_metadata,
+            record_type_id=RECORD_TYPE,
+            seed=args.seed,
+            fill_rate=args.fill_rate,
+        )
+    )
+    payload = json.dumps({"heurist": {"records": records}}).encode("utf-8")
+    del records
+
+    runs = [run_stages(payload, detail_metadata) for _ in range(args.repeat)]
+    report = build_report(args, runs, payload)
+
+    print(
+        f"{args.records} records, {len(detail_metadata)} fields, "
+        f"{len(payload) / 2**20:.1f} MiB of JSON, best of {args.repeat}"
+    )
+    for stage, result in report["stages"].items():
+        print(
+            f"{stage:>16}: {result['best_seconds']:8.3f} s"
+            f"  {result['records_per_second'] or 0:10.0f} records/s"
+        )
+    print(f"{'total':>16}: {report['total_best_seconds']:8.3f} s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print("\nCompared to the baseline")
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print("Slower than the baseline: {}".format(", ".join(regressions)))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
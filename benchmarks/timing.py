@@ -0,0 +1,51 @@
+"""Timing helpers shared by the benchmarks."""
+
+import statistics
+import time
+
+
+def measure(func, *args, repeat: int) -> list[float]:
+    """
+    Call a function `repeat` times and return the seconds each call took.
+
+    Examples:
+        >>> len(measure(sum, [1, 2], repeat=3))
+        3
+    """
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def best_time(func, *args, repeat: int) -> float:
+    """The seconds of the fastest of `repeat` calls to a function."""
+
+    return min(measure(func, *args, repeat=repeat))
+
+
+def summarize(seconds: list[float], count: int) -> dict:
+    """
+    Summarize the seconds of several runs that each handled `count` items.
+
+    Examples:
+        >>> summarize([2.0, 1.0, 4.0], count=100)
+        {'best_seconds': 1.0, 'median_seconds': 2.0, 'records_per_second': 100}
+
+    Args:
+        seconds (list[float]): Seconds of each run.
+        count (int): Number of items handled by each run.
+
+    Returns:
+        dict: The best and median seconds, and the throughput of the best run.
+    """
+
+    best = min(seconds)
+    return {
+        "best_seconds": round(best, 6),
+        "median_seconds": round(statistics.median(seconds), 6),
+        "records_per_second": round(count / best) if best else None,
+    }
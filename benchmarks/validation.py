@@ -0,0 +1,93 @@
+"""
+Benchmark of the validation of a record type's records: one record at a time \
+    with `model_validate` and `model_dump`, or in batches through a `TypeAdapter`.
+
+Run from the root of the repository:
+
+    python benchmarks/validation.py --records 50000
+"""
+
+import argparse
+from itertools import chain
+
+from heurist.database import TransformedDatabase
+from heurist.validators.record_validator import (
+    BATCH_SIZE,
+    RecordValidator,
+    list_adapter,
+)
+from mock_data import DB_STRUCTURE_XML
+from mock_data.synthetic import generate_records
+from timing import best_time
+
+RECORD_TYPE = 103
+
+
+def per_record(model, records: list[dict]) -> list[dict]:
+    validator = RecordValidator(model, records, rty_ID=RECORD_TYPE)
+    return [m.model_dump(by_alias=True) for m in validator]
+
+
+def batched(model, records: list[dict]) -> list[dict]:
+    validator = RecordValidator(model, records, rty_ID=RECORD_TYPE)
+    return list(chain.from_iterable(validator.iter_batches()))
+
+
+def validate_dump_per_record(model, kwargs: list[dict]) -> list[dict]:
+    return [model.model_validate(k).model_dump(by_alias=True) for k in kwargs]
+
+
+def validate_dump_batched(model, kwargs: list[dict]) -> list[dict]:
+    adapter = list_adapter(model)
+    rows = []
+    for i in range(0, len(kwargs), BATCH_SIZE):
+        models = adapter.validate_python(kwargs[i : i + BATCH_SIZE])
+        rows.extend(adapter.dump_python(models, by_alias=True))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    db = TransformedDatabase(DB_STRUCTURE_XML)
+    model = db.pydantic_models[RECORD_TYPE].model
+    metadata = db.get_detail_metadata([RECORD_TYPE])[RECORD_TYPE]
+    records = list(generate_records(args.records, metadata, RECORD_TYPE))
+    assert per_record(model, records) == batched(model, records)
+
+    validator = RecordValidator(model, [], rty_ID=RECORD_TYPE)
+    kwargs = [validator.flatten_details_to_dynamic_pydantic_fields(r) for r in records]
+
+    print(f"{args.records} records of type {RECORD_TYPE}, best of {args.repeat}")
+    for title, benchmarks, data in [
+        (
+            "Flatten, validate and dump",
+            [("per record", per_record), ("batched", batched)],
+            records,
+        ),
+        (
+            "Validate and dump (already flattened)",
+            [
+                ("per record", validate_dump_per_record),
+                ("batched", validate_dump_batched),
+            ],
+            kwargs,
+        ),
+    ]:
+        print(f"\n{title}")
+        baseline = None
+        for name, func in benchmarks:
+            seconds = best_time(func, model, data, repeat=args.repeat)
+            baseline = baseline or seconds
+            print(
+                f"{name:>12}: {seconds:7.3f} s"
+                f"  {args.records / seconds:10.0f} records/s"
+                f"  x{baseline / seconds:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Asynchronous Heurist API client"""
+
+import asyncio
+import time
+from contextlib import nullcontext
+from typing import ByteString, Literal
+
+import httpx
+from heurist.api.client import check_response, filter_records
+from heurist.api.constants import (
+    HUMA_NUM_SERVER,
+    MAX_CONCURRENT_REQUESTS,
+    READTIMEOUT,
+    SESSION_REJECTED_STATUS_CODES,
+)
+from heurist.api.rate_limit import RateLimiter
+from heurist.api.retry import AdaptiveTimeout, RetryableStatus, RetryPolicy
+from heurist.api.url_builder import URLBuilder
+from heurist.api.utils import log_event
+from tenacity import RetryError
+
+# Exceptions after which a request is retried: timeouts, and connection errors
+# such as a connection reset by the server
+RETRY_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+TIMEOUT_ERRORS = (httpx.ReadTimeout,)
+
+
+class AsyncHeuristAPIClient:
+    """
+    Asynchronous client for Heurist API, with the same methods as the \
+        `HeuristAPIClient`.
+
+    All the requests go through one pooled `httpx.AsyncClient`. A semaphore caps \
+        the number of requests that are waiting on the Heurist server at the same \
+        time, so that many record types can be requested together without \
+        overloading the server. A request is retried, outside of the semaphore, \
+        according to the client's `RetryPolicy`. If the client has a \
+        `RateLimiter`, which can be shared with other clients, each request also \
+        waits for it.
+
+    Examples:
+        >>> import asyncio
+        >>> import httpx
+        >>> def handler(request):
+        ...     return httpx.Response(200, content=b"<hml_structure/>")
+        >>> async def main():
+        ...     async with httpx.AsyncClient(
+        ...         transport=httpx.MockTransport(handler)
+        ...     ) as session:
+        ...         client = AsyncHeuristAPIClient("mock_db", session=session)
+        ...         return await client.get_structure()
+        >>> asyncio.run(main())
+        b'<hml_structure/>'
+    """
+
+    def __init__(
+        self,
+        database_name: str,
+        session: httpx.AsyncClient,
+        timeout_seconds: int | None = READTIMEOUT,
+        max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+        server: str = HUMA_NUM_SERVER,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ) -> None:
+        self.database_name = database_name
+        self.url_builder = URLBuilder(database_name=database_name, server=server)
+        self.session = session
+        self.timeout = timeout_seconds
+        self.timeouts = AdaptiveTimeout(base=timeout_seconds)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        # Whether the server refused the session, i.e. because it expired
+        self.session_rejected = False
+        self.semaphore = asyncio.Semaphore(max_concurrent_requests)
+
+    async def call_heurist_api(self, url: str) -> httpx.Response:
+        retrying = self.retry_policy.retrying(
+            errors=RETRY_ERRORS, url=url, asynchronous=True
+        )
+        async for attempt in retrying:
+            with attempt:
+                response = await self._attempt(
+                    url=url, number=attempt.retry_state.attempt_number
+                )
+        return response
+
+    async def _attempt(self, url: str, number: int) -> httpx.Response:
+        timeout = self.timeouts.get(attempt=number)
+        fields = {"url": url, "attempt": number, "timeout": timeout}
+        limit = nullcontext()
+        if self.rate_limiter:
+            limit = self.rate_limiter.request_async()
+        async with self.semaphore, limit:
+            start = time.perf_counter()
+            try:
+                # The response's body is read before the slot is freed, as in
+                # the synchronous client
+                response = await self.session.get(url, timeout=timeout)
+            except RETRY_ERRORS as e:
+                seconds = round(time.perf_counter() - start, 3)
+                log_event("attempt", **fields, seconds=seconds, error=type(e).__name__)
+                if self.rate_limiter and isinstance(e, TIMEOUT_ERRORS):
+                    self.rate_limiter.back_off()
+                raise
+            seconds = time.perf_counter() - start
+        size = len(response.content)
+        log_event(
+            "attempt",
+            **fields,
+            seconds=round(seconds, 3),
+            status=response.status_code,
+            bytes=size,
+        )
+        if response.status_code in SESSION_REJECTED_STATUS_CODES:
+            self.session_rejected = True
+        if response.status_code == 200:
+            self.timeouts.observe(seconds=seconds, size=size)
+            if self.rate_limiter:
+                self.rate_limiter.observe(seconds=seconds, size=size)
+        try:
+            self.retry_policy.check_status(response)
+        except RetryableStatus:
+            if self.rate_limiter:
+                self.rate_limiter.back_off()
+            raise
+        return response
+
+    async def get_response_content(self, url: str) -> ByteString | None:
+        """Request resources from the Heurist server.
+
+        Args:
+            url (str): Heurist API entry point.
+
+        Returns:
+            ByteString | None: Binary response returned from Heurist server.
+        """
+
+        try:
+            response = await self.call_heurist_api(url=url)
+        except RetryError as error:
+            timeout = self.timeouts.get(attempt=self.retry_policy.max_attempts)
+            e = self.retry_policy.give_up(
+                error=error, url=url, timeout=timeout, timeout_errors=TIMEOUT_ERRORS
+            )
+            raise SystemExit(e)
+        return check_response(response)
+
+    async def get_records(
+        self,
+        record_type_id: int,
+        form: Literal["xml", "json"] = "json",
+        users: tuple[int] = (),
+        modified_since: str | None = None,
+    ) -> bytes | list | None:
+        """Request all records of a certain type and in a certain data format.
+
+        Args:
+            record_type_id (int): Heurist ID of targeted record type.
+            form (Literal["xml", "json"], optional): Data format for requested
+                records. Defaults to "json".
+            users (tuple): Array of IDs of users who added the target records.
+            modified_since (str | None): Only request the records modified after \
+                this date, i.e. "2024-08-28 14:43:43". Defaults to None.
+
+        Returns:
+            bytes | list | None: If XML, binary response returned from Heurist
+                server, else JSON array.
+        """
+
+        url = self.url_builder.get_records(
+            record_type_id=record_type_id,
+            form=form,
+            users=users,
+            modified_since=modified_since,
+        )
+        content = await self.get_response_content(url)
+        if form == "json":
+            return filter_records(
+                content=content, record_type_id=record_type_id, users=users
+            )
+        else:
+            return content
+
+    async def get_structure(self) -> bytes | None:
+        """Request the Heurist database's overall structure in XML format.
+
+        Returns:
+            bytes | None: Binary response returned from Heurist server.
+        """
+
+        url = self.url_builder.get_db_structure()
+        return await self.get_response_content(url)
+
+    async def get_relationship_markers(
+        self, form: Literal["xml", "json"] = "xml"
+    ) -> bytes | list | None:
+        return await self.get_records(record_type_id=1, form=form)
@@ -0,0 +1,180 @@
+"""Persistent cache of the Heurist server's responses."""
+
+import gzip
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from heurist.api.constants import CACHE_MAX_SIZE, CACHE_TTL
+
+SUFFIX = ".gz"
+
+
+class CacheWriter:
+    """
+    Compress a response into the cache while it's being received. The entry is \
+        only visible in the cache once the whole response has been written.
+    """
+
+    def __init__(self, cache: "ResponseCache", url: str) -> None:
+        self.cache = cache
+        self.url = url
+        fd, self._tmp = tempfile.mkstemp(dir=cache.directory, suffix=".tmp")
+        self._raw = os.fdopen(fd, "wb")
+        self._file = gzip.GzipFile(fileobj=self._raw, mode="wb")
+
+    def write(self, chunk: bytes) -> None:
+        self._file.write(chunk)
+
+    def close(self) -> None:
+        self._file.close()
+        self._raw.close()
+
+    def commit(self) -> None:
+        """Close the compressed file and add it to the cache."""
+
+        self.close()
+        os.replace(self._tmp, self.cache.path(self.url))
+        self.cache.evict()
+
+    def discard(self) -> None:
+        """Close and delete the incomplete compressed file."""
+
+        self.close()
+        Path(self._tmp).unlink(missing_ok=True)
+
+
+class ResponseCache:
+    """
+    On-disk cache of the Heurist server's responses, which are keyed by their \
+        URL and stored in gzip-compressed files.
+
+    An entry is served for `ttl_seconds` after it was downloaded. When the \
+        compressed entries take up more than `max_size_bytes`, the least recently \
+        used entries are deleted.
+
+    Examples:
+        >>> import tempfile
+        >>> cache = ResponseCache(directory=tempfile.mkdtemp())
+        >>> url = "https://heurist.huma-num.fr/heurist/api?db=mock_db"
+        >>> cache.get(url) is None
+        True
+        >>> cache.set(url, b"<hml_structure/>")
+        >>> cache.get(url)
+        b'<hml_structure/>'
+        >>> cache.clear()
+        >>> cache.get(url) is None
+        True
+    """
+
+    def __init__(
+        self,
+        directory: Path | str,
+        ttl_seconds: int | None = CACHE_TTL,
+        max_size_bytes: int = CACHE_MAX_SIZE,
+    ) -> None:
+        """
+        Args:
+            directory (Path | str): Directory in which the responses are stored.
+            ttl_seconds (int | None, optional): Seconds during which a stored \
+                response is served. If None, responses never expire. Defaults \
+                to 1 day.
+            max_size_bytes (int, optional): Maximum size of the compressed \
+                responses in the directory. Defaults to 1 GB.
+        """
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl_seconds
+        self.max_size = max_size_bytes
+        self._lock = threading.Lock()
+
+    @classmethod
+    def key(cls, url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def path(self, url: str) -> Path:
+        return self.directory.joinpath(self.key(url)).with_suffix(SUFFIX)
+
+    def entries(self) -> list[Path]:
+        return list(self.directory.glob(f"*{SUFFIX}"))
+
+    def get(self, url: str) -> bytes | None:
+        """Get a stored response, if it exists and has not expired.
+
+        Args:
+            url (str): URL of the request.
+
+        Returns:
+            bytes | None: The response's content.
+        """
+
+        path = self.path(url)
+        try:
+            # The modification time records when the response was downloaded
+            downloaded = path.stat().st_mtime
+            if self.ttl is not None and time.time() - downloaded > self.ttl:
+                path.unlink(missing_ok=True)
+                return
+            with gzip.open(path, "rb") as f:
+                content = f.read()
+            # The access time records when the response was last used
+            os.utime(path, times=(time.time(), downloaded))
+        except (FileNotFoundError, EOFError, gzip.BadGzipFile):
+            return
+        return content
+
+    def set(self, url: str, content: bytes) -> None:
+        """Store a response.
+
+        Args:
+            url (str): URL of the request.
+            content (bytes): The response's content.
+        """
+
+        writer = self.writer(url)
+        try:
+            writer.write(content)
+        except BaseException:
+            writer.discard()
+            raise
+        writer.commit()
+
+    def writer(self, url: str) -> CacheWriter:
+        """Open a writer that stores a response as it's received.
+
+        Args:
+            url (str): URL of the request.
+
+        Returns:
+            CacheWriter: Writer for the response's content.
+        """
+
+        return CacheWriter(cache=self, url=url)
+
+    def evict(self) -> None:
+        """Delete the least recently used responses until the cache fits in its \
+            maximum size."""
+
+        with self._lock:
+            stats = []
+            for path in self.entries():
+                try:
+                    stats.append((path, path.stat()))
+                except FileNotFoundError:
+                    continue
+            total = sum(s.st_size for _, s in stats)
+            for path, stat in sorted(stats, key=lambda e: e[1].st_atime):
+                if total <= self.max_size:
+                    break
+                path.unlink(missing_ok=True)
+                total -= stat.st_size
+
+    def clear(self) -> None:
+        """Delete all the stored responses."""
+
+        for path in self.entries():
+            path.unlink(missing_ok=True)
@@ -1,24 +1,134 @@
 """Heurist API client"""
 
 import json
-from typing import ByteString, Literal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from itertools import chain
+from typing import ByteString, Iterable, Iterator, Literal
 
 import requests
-from heurist.api.constants import MAX_RETRY, READTIMEOUT
-from heurist.api.exceptions import APIException, ReadTimeout
-from heurist.api.url_builder import URLBuilder
-from heurist.api.utils import log_attempt_number
-from tenacity import (
-    RetryError,
-    retry,
-    retry_if_exception_type,
-    stop_after_attempt,
+from heurist.api.cache import CacheWriter, ResponseCache
+from heurist.api.constants import (
+    HUMA_NUM_SERVER,
+    MAX_CONCURRENT_REQUESTS,
+    READTIMEOUT,
+    SESSION_REJECTED_STATUS_CODES,
+    STREAM_CHUNK_SIZE,
 )
+from heurist.api.exceptions import APIException
+from heurist.api.json_stream import filter_record_stream, iter_json_array
+from heurist.api.rate_limit import RateLimiter
+from heurist.api.retry import AdaptiveTimeout, RetryableStatus, RetryPolicy
+from heurist.api.url_builder import URLBuilder
+from heurist.api.utils import log_event
+from tenacity import RetryError
+
+# Exceptions after which a request is retried: timeouts, and connection errors
+# such as a connection reset by the server
+RETRY_ERRORS = (requests.exceptions.Timeout, requests.exceptions.ConnectionError)
+
+TIMEOUT_ERRORS = (requests.exceptions.ReadTimeout,)
+
+# Attribute of a streamed response that holds its slot in the rate limiter
+SLOT_ATTRIBUTE = "_heurist_rate_limit_slot"
+
+
+def check_response(response) -> ByteString:
+    """Confirm that the Heurist server answered with data.
+
+    Args:
+        response (requests.Response | httpx.Response): Response from the Heurist \
+            server.
+
+    Raises:
+        SystemExit: If the Heurist server did not send data.
+
+    Returns:
+        ByteString: Binary response returned from Heurist server.
+    """
+
+    if response is None:
+        e = APIException("No response.")
+        raise SystemExit(e)
+    elif response.status_code != 200:
+        e = APIException(f"Status {response.status_code}")
+        raise SystemExit(e)
+    elif "Cannot connect to database" == response.content.decode("utf-8"):
+        e = APIException("Could not connect to database.")
+        raise SystemExit(e)
+    else:
+        return response.content
+
+
+def filter_records(
+    content: ByteString, record_type_id: int, users: tuple[int] = ()
+) -> list:
+    """Parse a JSON export of records and keep only the targeted records.
+
+    Examples:
+        >>> content = b'''{"heurist": {"records": [
+        ... {"rec_ID": "1", "rec_RecTypeID": "103", "rec_AddedByUGrpID": "2"},
+        ... {"rec_ID": "2", "rec_RecTypeID": "102", "rec_AddedByUGrpID": "2"},
+        ... {"rec_ID": "3", "rec_RecTypeID": "103", "rec_AddedByUGrpID": "16"}
+        ... ]}}'''
+        >>> [r["rec_ID"] for r in filter_records(content, 103)]
+        ['1', '3']
+        >>> [r["rec_ID"] for r in filter_records(content, 103, users=(16,))]
+        ['3']
+
+    Args:
+        content (ByteString): JSON export of records from the Heurist server.
+        record_type_id (int): Heurist ID of targeted record type.
+        users (tuple): Array of IDs of users who added the target records.
+
+    Returns:
+        list: JSON array of the targeted records.
+    """
+
+    json_string = content.decode("utf-8")
+    all_records = json.loads(json_string)["heurist"]["records"]
+    return list(
+        filter_record_stream(
+            records=all_records, record_type_id=record_type_id, users=users
+        )
+    )
+
+
+def merge_pages(pages: Iterable[list[dict]]) -> list[dict]:
+    """Merge pages of records, in their order, without the records that are \
+        repeated by a later page, i.e. records linked from several pages.
+
+    Examples:
+        >>> pages = [[{"rec_ID": "1"}, {"rec_ID": "2"}], [{"rec_ID": "2"}], []]
+        >>> [r["rec_ID"] for r in merge_pages(pages)]
+        ['1', '2']
+
+    Args:
+        pages (Iterable[list[dict]]): Pages of records.
+
+    Returns:
+        list: The records of all the pages.
+    """
+
+    seen = set()
+    records = []
+    for record in chain.from_iterable(pages):
+        if record["rec_ID"] not in seen:
+            seen.add(record["rec_ID"])
+            records.append(record)
+    return records
 
 
 class HeuristAPIClient:
     """
     Client for Heurist API.
+
+    A request that fails because of a timeout, a connection error, or a status \
+        code such as 503 is retried according to the client's `RetryPolicy`. The \
+        read timeout adapts to the size of the responses received so far. If the \
+        client has a `RateLimiter`, which can be shared with other clients, each \
+        request waits for it.
     """
 
     def __init__(
@@ -26,23 +136,120 @@ class HeuristAPIClient:
         database_name: str,
         session: requests.Session,
         timeout_seconds: int | None = READTIMEOUT,
+        cache: ResponseCache | None = None,
+        server: str = HUMA_NUM_SERVER,
+        page_size: int | None = None,
+        page_workers: int = MAX_CONCURRENT_REQUESTS,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
     ) -> None:
         self.database_name = database_name
-        self.url_builder = URLBuilder(database_name=database_name)
+        self.url_builder = URLBuilder(database_name=database_name, server=server)
         self.session = session
         self.timeout = timeout_seconds
+        self.timeouts = AdaptiveTimeout(base=timeout_seconds)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        # Whether the server refused the session, i.e. because it expired
+        self.session_rejected = False
+        self.cache = cache
+        # If set, records are requested in pages of this many records, of which
+        # `page_workers` are requested at the same time
+        self.page_size = page_size
+        self.page_workers = max(page_workers, 1)
 
-    @retry(
-        retry=retry_if_exception_type(requests.exceptions.ReadTimeout),
-        stop=stop_after_attempt(MAX_RETRY),
-        after=log_attempt_number,
-    )
-    def call_heurist_api(self, url: str) -> ByteString | None:
-        response = self.session.get(url, timeout=(self.timeout))
+    def call_heurist_api(self, url: str, stream: bool = False) -> requests.Response:
+        """Send a GET request to the Heurist server, and retry it according to \
+            the client's retry policy.
+
+        Args:
+            url (str): Heurist API entry point.
+            stream (bool): Whether to defer the download of the response's \
+                body. Defaults to False.
+
+        Raises:
+            RetryError: If every attempt failed.
+
+        Returns:
+            requests.Response: Response of the first successful attempt.
+        """
+
+        for attempt in self.retry_policy.retrying(errors=RETRY_ERRORS, url=url):
+            with attempt:
+                response = self._attempt(
+                    url=url, stream=stream, number=attempt.retry_state.attempt_number
+                )
         return response
 
+    def _attempt(self, url: str, stream: bool, number: int) -> requests.Response:
+        # The rate limiter's slot is held until the response's body has been
+        # read, which, for a streamed response, is when the response is closed
+        slot = ExitStack()
+        if self.rate_limiter:
+            slot.enter_context(self.rate_limiter.request())
+        with slot:
+            response = self._send(url=url, stream=stream, number=number)
+            if stream:
+                setattr(response, SLOT_ATTRIBUTE, slot.pop_all())
+        return response
+
+    @classmethod
+    def _close(cls, response: requests.Response) -> None:
+        """Close a response, and free its slot in the rate limiter, if any."""
+
+        response.close()
+        slot = getattr(response, SLOT_ATTRIBUTE, None)
+        if slot:
+            slot.close()
+
+    def _send(self, url: str, stream: bool, number: int) -> requests.Response:
+        timeout = self.timeouts.get(attempt=number)
+        fields = {"url": url, "attempt": number, "timeout": timeout}
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, timeout=timeout, stream=stream)
+        except RETRY_ERRORS as e:
+            seconds = round(time.perf_counter() - start, 3)
+            log_event("attempt", **fields, seconds=seconds, error=type(e).__name__)
+            if self.rate_limiter and isinstance(e, TIMEOUT_ERRORS):
+                self.rate_limiter.back_off()
+            raise
+        seconds = time.perf_counter() - start
+        # A streamed response's size is only known once it's been read
+        size = None if stream else len(response.content)
+        log_event(
+            "attempt",
+            **fields,
+            seconds=round(seconds, 3),
+            status=response.status_code,
+            bytes=size,
+        )
+        if response.status_code in SESSION_REJECTED_STATUS_CODES:
+            self.session_rejected = True
+        if response.status_code == 200:
+            if size is not None:
+                self.timeouts.observe(seconds=seconds, size=size)
+            if self.rate_limiter:
+                self.rate_limiter.observe(seconds=seconds, size=size)
+        try:
+            self.retry_policy.check_status(response)
+        except RetryableStatus:
+            response.close()
+            if self.rate_limiter:
+                self.rate_limiter.back_off()
+            raise
+        return response
+
+    def _give_up(self, error: RetryError, url: str) -> SystemExit:
+        timeout = self.timeouts.get(attempt=self.retry_policy.max_attempts)
+        e = self.retry_policy.give_up(
+            error=error, url=url, timeout=timeout, timeout_errors=TIMEOUT_ERRORS
+        )
+        return SystemExit(e)
+
     def get_response_content(self, url: str) -> ByteString | None:
-        """Request resources from the Heurist server.
+        """Request resources from the Heurist server. If the client has a cache \
+            that holds a response to the URL, serve it without calling the server.
 
         Args:
             url (str): Heurist API entry point.
@@ -51,61 +258,375 @@ class HeuristAPIClient:
             ByteString | None: Binary response returned from Heurist server.
         """
 
+        if self.cache:
+            content = self.cache.get(url)
+            if content is not None:
+                return content
+
         try:
             response = self.call_heurist_api(url=url)
-        except RetryError:
-            e = ReadTimeout(url=url, timeout=self.timeout)
-            raise SystemExit(e)
-        if not response:
-            e = APIException("No response.")
-            raise SystemExit(e)
-        elif response.status_code != 200:
+        except RetryError as e:
+            raise self._give_up(error=e, url=url)
+        content = check_response(response)
+
+        if self.cache:
+            self.cache.set(url, content)
+        return content
+
+    def stream_response_records(
+        self,
+        url: str,
+        record_type_id: int,
+        users: tuple[int] = (),
+        timings: dict | None = None,
+    ) -> Iterator[dict]:
+        """Request a JSON export of records from the Heurist server and parse it \
+            while it's being received, without holding the whole response in memory.
+
+        Args:
+            url (str): Heurist API entry point.
+            record_type_id (int): Heurist ID of targeted record type.
+            users (tuple): Array of IDs of users who added the target records.
+            timings (dict | None): If given, the seconds spent decoding the \
+                records and the size of the response are added to its "json \
+                decode" and "payload_bytes" keys, as the records are read. \
+                Defaults to None.
+
+        Returns:
+            Iterator[dict]: Targeted records, one at a time.
+        """
+
+        if self.cache:
+            content = self.cache.get(url)
+            if content is not None:
+                return self._iter_records(
+                    chunks=[content],
+                    record_type_id=record_type_id,
+                    users=users,
+                    timings=timings,
+                )
+
+        try:
+            response = self.call_heurist_api(url=url, stream=True)
+        except RetryError as e:
+            raise self._give_up(error=e, url=url)
+        if response.status_code != 200:
+            self._close(response)
             e = APIException(f"Status {response.status_code}")
             raise SystemExit(e)
-        elif "Cannot connect to database" == response.content.decode("utf-8"):
-            e = APIException("Could not connect to database.")
-            raise SystemExit(e)
-        else:
-            return response.content
+        return self._iter_response_records(
+            url=url,
+            response=response,
+            record_type_id=record_type_id,
+            users=users,
+            timings=timings,
+        )
+
+    def _iter_response_records(
+        self,
+        url: str,
+        response: requests.Response,
+        record_type_id: int,
+        users: tuple[int],
+        timings: dict | None = None,
+    ) -> Iterator[dict]:
+        writer = self.cache.writer(url) if self.cache else None
+        completed = False
+        try:
+            chunks = response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+            if writer:
+                chunks = self._tee_chunks(chunks=chunks, writer=writer)
+            yield from self._iter_records(
+                chunks=chunks,
+                record_type_id=record_type_id,
+                users=users,
+                timings=timings,
+            )
+            completed = True
+        finally:
+            self._close(response)
+            # Only store the response in the cache if it was entirely read
+            if writer and completed:
+                writer.commit()
+            elif writer:
+                writer.discard()
+
+    @classmethod
+    def _tee_chunks(
+        cls, chunks: Iterator[bytes], writer: CacheWriter
+    ) -> Iterator[bytes]:
+        for chunk in chunks:
+            writer.write(chunk)
+            yield chunk
+
+    @classmethod
+    def _count_decoding(cls, timings: dict | None, seconds: float, size: int) -> None:
+        if timings is not None:
+            timings["json decode"] = timings.get("json decode", 0.0) + seconds
+            timings["payload_bytes"] = timings.get("payload_bytes", 0) + size
+
+    @classmethod
+    def _iter_records(
+        cls,
+        chunks: Iterable[bytes],
+        record_type_id: int,
+        users: tuple[int],
+        timings: dict | None = None,
+    ) -> Iterator[dict]:
+        # Seconds spent waiting for the response's chunks, and their size
+        download = {"seconds": 0.0, "bytes": 0}
+
+        def read(chunks: Iterable[bytes]) -> Iterator[bytes]:
+            iterator = iter(chunks)
+            while True:
+                start = time.perf_counter()
+                chunk = next(iterator, None)
+                download["seconds"] += time.perf_counter() - start
+                if chunk is None:
+                    return
+                download["bytes"] += len(chunk)
+                yield chunk
+
+        records = filter_record_stream(
+            records=iter_json_array(chunks=read(chunks)),
+            record_type_id=record_type_id,
+            users=users,
+        )
+        seconds = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    record = next(records)
+                except StopIteration:
+                    return
+                except json.JSONDecodeError:
+                    e = APIException("Could not connect to database.")
+                    raise SystemExit(e)
+                finally:
+                    seconds += time.perf_counter() - start
+                yield record
+        finally:
+            # The time spent getting the records, other than waiting for the
+            # response, is the time spent decoding them
+            cls._count_decoding(
+                timings, seconds=seconds - download["seconds"], size=download["bytes"]
+            )
+
+    def _page_url(
+        self,
+        record_type_id: int,
+        users: tuple[int],
+        modified_since: str | None,
+        offset: int,
+    ) -> str:
+        return self.url_builder.get_records(
+            record_type_id=record_type_id,
+            form="json",
+            users=users,
+            modified_since=modified_since,
+            limit=self.page_size,
+            offset=offset,
+        )
+
+    def get_records_in_pages(
+        self,
+        record_type_id: int,
+        users: tuple[int] = (),
+        modified_since: str | None = None,
+        timings: dict | None = None,
+    ) -> list[dict]:
+        """Request a record type's records in pages of `page_size` records, so \
+            that a timeout only concerns one page, which is retried on its own.
+
+        The first page is requested alone, so that a small record type takes only \
+            one request. If it's full, the next pages are requested `page_workers` \
+            at a time, until a page isn't full. The pages are merged in order.
+
+        Args:
+            record_type_id (int): Heurist ID of targeted record type.
+            users (tuple): Array of IDs of users who added the target records.
+            modified_since (str | None): Only request the records modified after \
+                this date, i.e. "2024-08-28 14:43:43". Defaults to None.
+            timings (dict | None): If given, the seconds spent decoding the pages \
+                and their size are added to its "json decode" and \
+                "payload_bytes" keys. Defaults to None.
+
+        Returns:
+            list: JSON array of the targeted records.
+        """
+
+        def fetch(offset: int) -> tuple[list[dict], float, int]:
+            url = self._page_url(record_type_id, users, modified_since, offset)
+            content = self.get_response_content(url)
+            start = time.perf_counter()
+            page = filter_records(
+                content=content, record_type_id=record_type_id, users=users
+            )
+            return page, time.perf_counter() - start, len(content)
+
+        def collect(fetched: tuple[list[dict], float, int]) -> list[dict]:
+            # The pages' timings are added up by the calling thread
+            page, seconds, size = fetched
+            self._count_decoding(timings, seconds=seconds, size=size)
+            return page
+
+        pages = [collect(fetch(0))]
+        if len(pages[0]) < self.page_size:
+            return merge_pages(pages)
+        with ThreadPoolExecutor(max_workers=self.page_workers) as executor:
+            offset = self.page_size
+            while len(pages[-1]) >= self.page_size:
+                offsets = [
+                    offset + i * self.page_size for i in range(self.page_workers)
+                ]
+                # The pages are returned in the order of their offsets
+                for page in map(collect, executor.map(fetch, offsets)):
+                    pages.append(page)
+                    if len(page) < self.page_size:
+                        break
+                offset = offsets[-1] + self.page_size
+        return merge_pages(pages)
+
+    def stream_records_in_pages(
+        self,
+        record_type_id: int,
+        users: tuple[int] = (),
+        modified_since: str | None = None,
+        timings: dict | None = None,
+    ) -> Iterator[dict]:
+        """Request a record type's records in pages, like `get_records_in_pages`, \
+            but one page at a time, each parsed while it's being received.
+
+        Args:
+            record_type_id (int): Heurist ID of targeted record type.
+            users (tuple): Array of IDs of users who added the target records.
+            modified_since (str | None): Only request the records modified after \
+                this date, i.e. "2024-08-28 14:43:43". Defaults to None.
+            timings (dict | None): If given, the seconds spent decoding the pages \
+                and their size are added to its "json decode" and \
+                "payload_bytes" keys, as the records are read. Defaults to None.
+
+        Yields:
+            Iterator[dict]: Targeted records, one at a time.
+        """
+
+        seen = set()
+        offset = 0
+        while True:
+            url = self._page_url(record_type_id, users, modified_since, offset)
+            count = 0
+            for record in self.stream_response_records(
+                url=url, record_type_id=record_type_id, users=users, timings=timings
+            ):
+                count += 1
+                if record["rec_ID"] not in seen:
+                    seen.add(record["rec_ID"])
+                    yield record
+            if count < self.page_size:
+                return
+            offset += self.page_size
 
     def get_records(
         self,
         record_type_id: int,
         form: Literal["xml", "json"] = "json",
         users: tuple[int] = (),
-    ) -> bytes | list | None:
+        stream: bool = False,
+        modified_since: str | None = None,
+        timings: dict | None = None,
+    ) -> bytes | list | Iterator[dict] | None:
         """Request all records of a certain type and in a certain data format.
 
+        If the client has a `page_size`, a JSON export is requested in pages, \
+            which are merged in order.
+
         Args:
             record_type_id (int): Heurist ID of targeted record type.
             form (Literal["xml", "json"], optional): Data format for requested
                 records. Defaults to "json".
             users (tuple): Array of IDs of users who added the target records.
+            stream (bool): If JSON, parse the response while it's being received \
+                and return an iterator of the records instead of a list. \
+                Defaults to False.
+            modified_since (str | None): Only request the records modified after \
+                this date, i.e. "2024-08-28 14:43:43". Defaults to None.
+            timings (dict | None): If given, the seconds spent decoding the JSON \
+                export, and its size, are added to its "json decode" and \
+                "payload_bytes" keys, so that the decoding can be measured apart \
+                from the download. If the records are streamed, the timings are \
+                added as the records are read. Defaults to None.
 
         Returns:
-            bytes | list | None: If XML, binary response returned from Heurist
-                server, else JSON array.
+            bytes | list | Iterator[dict] | None: If XML, binary response returned \
+                from Heurist server, else JSON array or iterator of records.
         """
 
+        if form == "json" and self.page_size:
+            if stream:
+                return self.stream_records_in_pages(
+                    record_type_id=record_type_id,
+                    users=users,
+                    modified_since=modified_since,
+                    timings=timings,
+                )
+            return self.get_records_in_pages(
+                record_type_id=record_type_id,
+                users=users,
+                modified_since=modified_since,
+                timings=timings,
+            )
+
         url = self.url_builder.get_records(
-            record_type_id=record_type_id, form=form, users=users
+            record_type_id=record_type_id,
+            form=form,
+            users=users,
+            modified_since=modified_since,
         )
-        if form == "json":
+        if form == "json" and stream:
+            return self.stream_response_records(
+                url=url, record_type_id=record_type_id, users=users, timings=timings
+            )
+        elif form == "json":
             content = self.get_response_content(url)
-            json_string = content.decode("utf-8")
-            all_records = json.loads(json_string)["heurist"]["records"]
-            # Filter out linked records of a not the target type
-            correct_ids = [
-                r for r in all_records if r["rec_RecTypeID"] == str(record_type_id)
-            ]
-            # Filter out records by non-targeted users
-            if users and len(users) > 0:
-                return [r for r in correct_ids if int(r["rec_AddedByUGrpID"]) in users]
-            else:
-                return correct_ids
+            start = time.perf_counter()
+            records = filter_records(
+                content=content, record_type_id=record_type_id, users=users
+            )
+            seconds = time.perf_counter() - start
+            self._count_decoding(timings, seconds=seconds, size=len(content))
+            return records
         else:
             return self.get_response_content(url)
 
+    def get_records_content(
+        self,
+        record_type_id: int,
+        users: tuple[int] = (),
+        modified_since: str | None = None,
+    ) -> bytes | None:
+        """Request the JSON export of a record type's records, without parsing \
+            it, i.e. to measure the download apart from the parsing. The export \
+            can then be parsed with `filter_records`.
+
+        Args:
+            record_type_id (int): Heurist ID of targeted record type.
+            users (tuple): Array of IDs of users who added the target records.
+            modified_since (str | None): Only request the records modified after \
+                this date, i.e. "2024-08-28 14:43:43". Defaults to None.
+
+        Returns:
+            bytes | None: Binary response returned from Heurist server.
+        """
+
+        url = self.url_builder.get_records(
+            record_type_id=record_type_id,
+            form="json",
+            users=users,
+            modified_since=modified_since,
+        )
+        return self.get_response_content(url)
+
     def get_structure(self) -> bytes | None:
         """Request the Heurist database's overall structure in XML format.
 
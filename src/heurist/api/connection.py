@@ -1,9 +1,20 @@
 """Heurist API session"""
 
 import requests
+from heurist.api.cache import ResponseCache
 from heurist.api.client import HeuristAPIClient
-from heurist.api.constants import READTIMEOUT
+from heurist.api.constants import (
+    ADAPTER_MAX_RETRIES,
+    HUMA_NUM_SERVER,
+    LOGIN_PATH,
+    MAX_CONCURRENT_REQUESTS,
+    READTIMEOUT,
+)
 from heurist.api.exceptions import AuthenticationError
+from heurist.api.rate_limit import RateLimiter
+from heurist.api.retry import RetryPolicy
+from heurist.api.session import SessionStore, build_session
+from heurist.api.url_builder import URLBuilder
 from requests import Session
 
 
@@ -15,10 +26,24 @@ class HeuristAPIConnection:
         password: str,
         read_timeout: int = READTIMEOUT,
         post_timeout: int = 10,
+        max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+        cache: ResponseCache | None = None,
+        pool_size: int | None = None,
+        max_retries: int = ADAPTER_MAX_RETRIES,
+        keep_alive: bool = True,
+        session_store: SessionStore | None = None,
+        server: str = HUMA_NUM_SERVER,
+        page_size: int | None = None,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
     ) -> None:
         """
         Session context for a connection to the Heurist server.
 
+        The connection can be opened as a synchronous context (`with`), which \
+            returns a `HeuristAPIClient`, or as an asynchronous context \
+            (`async with`), which returns an `AsyncHeuristAPIClient`.
+
         Args:
             db (str): Heurist database name.
             login (str): Username.
@@ -26,6 +51,38 @@ class HeuristAPIConnection:
             read_timeout (int): Seconds to wait before raising a ReadTimeout.
             post_timeout (int): Seconds to wait before raising an error when \
                 establishing a login connection.
+            max_concurrent_requests (int): In an asynchronous context, the maximum \
+                number of requests sent to the Heurist server at the same time.
+            cache (ResponseCache | None): On-disk cache of the Heurist server's \
+                responses, used by the synchronous client. Defaults to None.
+            pool_size (int | None): Number of connections to the Heurist server \
+                kept open by the synchronous session. Defaults to the maximum \
+                number of concurrent requests.
+            max_retries (int): Number of times the HTTP transport retries a \
+                failed connection to the Heurist server, inside each attempt \
+                at a request. Defaults to 0, because the `retry_policy` \
+                retries the requests.
+            keep_alive (bool): Whether to turn on TCP keep-alive for the \
+                synchronous session's connections. Defaults to True.
+            session_store (SessionStore | None): On-disk store of the session's \
+                cookies. If it holds a session for the database and user that \
+                the server still accepts, the login is skipped. Otherwise, the \
+                user logs in again and the stored session is replaced. If the \
+                server refuses the session during the download, the stored \
+                session is deleted. Defaults to None.
+            server (str): Base URL of the Heurist server, i.e. of a local \
+                stand-in server. Defaults to Huma-Num's Heurist server.
+            page_size (int | None): If given, the synchronous client requests \
+                each record type's JSON export in pages of this many records, \
+                `max_concurrent_requests` at a time. Defaults to None, which \
+                requests each record type's records at once.
+            retry_policy (RetryPolicy | None): Policy of the retries of the \
+                requests that fail because of a timeout, a connection error, \
+                or a status code such as 503. Defaults to None, the default \
+                policy.
+            rate_limiter (RateLimiter | None): Limit on the rate of requests \
+                sent to the Heurist server, shared by the client's threads or \
+                tasks. Defaults to None, no limit.
 
         Raises:
             e: If the requests method fails, raise that exception.
@@ -38,34 +95,207 @@ class HeuristAPIConnection:
         self.__password = password
         self._readtimeout = read_timeout
         self._posttimeout = post_timeout
+        self._max_concurrent_requests = max_concurrent_requests
+        self._cache = cache
+        self._pool_size = pool_size or max_concurrent_requests
+        self._max_retries = max_retries
+        self._keep_alive = keep_alive
+        self._session_store = session_store
+        self._restored_session = False
+        self._client = None
+        self.server = server.rstrip("/")
+        self._page_size = page_size
+        self._retry_policy = retry_policy
+        self._rate_limiter = rate_limiter
 
-    def __enter__(self) -> Session:
-        self.session = requests.Session()
-        url = "https://heurist.huma-num.fr/heurist/api/login"
+    @property
+    def login_url(self) -> str:
+        return f"{self.server}{LOGIN_PATH}"
 
-        body = {
+    @property
+    def _login_body(self) -> dict:
+        return {
             "db": self.db,
             "login": self.__login,
             "password": self.__password,
         }
-        try:
-            response = self.session.post(url=url, data=body, timeout=self._posttimeout)
-        except requests.exceptions.ConnectTimeout as e:
-            print(
-                "\nUnable to log in to Heurist Huma-Num server. \
-                  Connection timed out."
-            )
-            raise e
+
+    @classmethod
+    def _check_login(cls, response) -> None:
         if response.status_code != 200:
             message = response.json()["message"]
             e = AuthenticationError(message)
             raise SystemExit(e)
 
-        return HeuristAPIClient(
+    def _restore_session(self, jar) -> bool:
+        if not self._session_store:
+            return False
+        self._restored_session = self._session_store.load(
+            db=self.db, login=self.__login, jar=jar, server=self.server
+        )
+        return self._restored_session
+
+    @property
+    def _check_session_url(self) -> str:
+        return URLBuilder(database_name=self.db, server=self.server).check_session()
+
+    @classmethod
+    def _is_logged_in(cls, response) -> bool:
+        # The server also answers a guest, whose user ID is 0, and whose exports
+        # leave out the records that aren't public
+        if response.status_code != 200:
+            return False
+        try:
+            data = response.json()
+        except ValueError:
+            return False
+        data = data.get("data") if isinstance(data, dict) else None
+        user = data.get("currentUser") if isinstance(data, dict) else None
+        if not isinstance(user, dict):
+            return False
+        try:
+            return int(user.get("ugr_ID") or 0) > 0
+        except (TypeError, ValueError):
+            return False
+
+    def _check_session(self) -> bool:
+        # A stored session might have expired on the server before its time in
+        # the store ran out, i.e. because the server was restarted.
+        try:
+            response = self.session.get(
+                self._check_session_url, timeout=self._posttimeout
+            )
+        except requests.exceptions.RequestException:
+            return False
+        return self._is_logged_in(response)
+
+    async def _check_async_session(self) -> bool:
+        import httpx
+
+        try:
+            response = await self.async_session.get(
+                self._check_session_url, timeout=self._posttimeout
+            )
+        except httpx.HTTPError:
+            return False
+        return self._is_logged_in(response)
+
+    def _save_session(self, jar) -> None:
+        if self._session_store:
+            self._session_store.save(
+                db=self.db, login=self.__login, jar=jar, server=self.server
+            )
+
+    def _discard_session(self) -> None:
+        if self._session_store:
+            self._session_store.discard(
+                db=self.db, login=self.__login, server=self.server
+            )
+
+    def _forget_rejected_session(self) -> None:
+        # If the server refused the session, i.e. because it expired during the
+        # download, log in again on the next run. Other errors, such as invalid
+        # records or an interrupted command, keep the session.
+        if self._client and self._client.session_rejected:
+            self._discard_session()
+
+    def __enter__(self) -> Session:
+        self.session = build_session(
+            pool_size=self._pool_size,
+            max_retries=self._max_retries,
+            keep_alive=self._keep_alive,
+        )
+        if self._restore_session(jar=self.session.cookies):
+            self._restored_session = self._check_session()
+            if not self._restored_session:
+                self._discard_session()
+                self.session.cookies.clear()
+        if not self._restored_session:
+            try:
+                response = self.session.post(
+                    url=self.login_url,
+                    data=self._login_body,
+                    timeout=self._posttimeout,
+                )
+            except requests.exceptions.ConnectTimeout as e:
+                print(
+                    "\nUnable to log in to Heurist Huma-Num server. \
+                    Connection timed out."
+                )
+                self.session.close()
+                raise e
+            try:
+                self._check_login(response)
+            except SystemExit:
+                self.session.close()
+                raise
+            self._save_session(jar=self.session.cookies)
+
+        self._client = HeuristAPIClient(
             database_name=self.db,
             session=self.session,
             timeout_seconds=self._readtimeout,
+            cache=self._cache,
+            server=self.server,
+            page_size=self._page_size,
+            page_workers=self._max_concurrent_requests,
+            retry_policy=self._retry_policy,
+            rate_limiter=self._rate_limiter,
         )
+        return self._client
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        self._forget_rejected_session()
         self.session.close()
+
+    async def __aenter__(self):
+        # The asynchronous client's dependency is only imported when it's used
+        import httpx
+        from heurist.api.async_client import AsyncHeuristAPIClient
+
+        self.async_session = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(max_connections=self._max_concurrent_requests),
+                retries=self._max_retries,
+            ),
+        )
+        if self._restore_session(jar=self.async_session.cookies.jar):
+            self._restored_session = await self._check_async_session()
+            if not self._restored_session:
+                self._discard_session()
+                self.async_session.cookies.clear()
+        if not self._restored_session:
+            try:
+                response = await self.async_session.post(
+                    url=self.login_url,
+                    data=self._login_body,
+                    timeout=self._posttimeout,
+                )
+            except httpx.ConnectTimeout as e:
+                print(
+                    "\nUnable to log in to Heurist Huma-Num server. \
+                    Connection timed out."
+                )
+                await self.async_session.aclose()
+                raise e
+            try:
+                self._check_login(response)
+            except SystemExit:
+                await self.async_session.aclose()
+                raise
+            self._save_session(jar=self.async_session.cookies.jar)
+
+        self._client = AsyncHeuristAPIClient(
+            database_name=self.db,
+            session=self.async_session,
+            timeout_seconds=self._readtimeout,
+            max_concurrent_requests=self._max_concurrent_requests,
+            server=self.server,
+            retry_policy=self._retry_policy,
+            rate_limiter=self._rate_limiter,
+        )
+        return self._client
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._forget_rejected_session()
+        await self.async_session.aclose()
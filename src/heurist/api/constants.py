@@ -4,16 +4,86 @@ import os
 
 HUMA_NUM_SERVER = "https://heurist.huma-num.fr/heurist"
 
+LOGIN_PATH = "/api/login"
+
 RECORD_XML_EXPORT_PATH = "/export/xml/flathml.php"
 
 RECORD_JSON_EXPORT_PATH = "/hserv/controller/record_output.php"
 
 STRUCTURE_EXPORT_PATH = "/hserv/structure/export/getDBStructureAsXML.php"
 
+USER_INFO_PATH = "/hserv/controller/usr_info.php"
+
 timeout_var = os.environ.get("READTIMEOUT", 10)
 if isinstance(timeout_var, str):
     timeout_var = int(timeout_var)
 
 READTIMEOUT = timeout_var
 
-MAX_RETRY = 3
+max_retry_var = os.environ.get("MAX_RETRY", 3)
+if isinstance(max_retry_var, str):
+    max_retry_var = int(max_retry_var)
+
+# Number of attempts at a request before giving up
+MAX_RETRY = max_retry_var
+
+# Status codes with which the Heurist server answers when it's overloaded or
+# restarting, after which a request is retried
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+
+# Status codes with which the Heurist server refuses a session that isn't
+# logged in anymore
+SESSION_REJECTED_STATUS_CODES = (401, 403)
+
+# Seconds of the backoff before the first retry, which doubles with each retry
+BACKOFF_BASE = 0.5
+
+BACKOFF_MAX = 30
+
+# Longest wait asked by a response's Retry-After header that is honoured
+RETRY_AFTER_MAX = 120
+
+# Factor by which the read timeout grows with each retry of a request
+TIMEOUT_GROWTH = 1.5
+
+# Factor of the time the server is expected to take to answer, given the largest
+# response seen so far, that the read timeout allows
+TIMEOUT_MARGIN = 3
+
+MAX_READTIMEOUT = 300
+
+# Smallest response whose duration is used to estimate the server's rate, below
+# which the server's fixed latency outweighs the size of the response
+TIMEOUT_SAMPLE_BYTES = 1024**2
+
+STREAM_CHUNK_SIZE = 1024 * 64
+
+CACHE_TTL = 60 * 60 * 24
+
+CACHE_MAX_SIZE = 1024**3
+
+MAX_CONCURRENT_REQUESTS = 5
+
+# Retries of a failed connection by the HTTP adapter, inside each attempt at a
+# request. The client's retry policy already retries the requests, with its own
+# backoff, so the adapter doesn't retry them too
+ADAPTER_MAX_RETRIES = 0
+
+ACCEPT_ENCODING = "gzip, deflate"
+
+SESSION_TTL = 60 * 20
+
+# Slowest rate, in requests per second, to which a rate limiter lowers itself
+MIN_RPS = 0.2
+
+# Seconds between two adjustments of a rate limiter's rate
+RATE_ADJUST_INTERVAL = 1.0
+
+# Factor of the server's lowest latency above which a rate limiter slows down
+LATENCY_SLOWDOWN = 2.0
+
+# Weight of the latest response in a rate limiter's moving average of latency
+LATENCY_SMOOTHING = 0.3
+
+# Size of response above which a rate limiter compares latencies per MiB
+LATENCY_UNIT_BYTES = 1024**2
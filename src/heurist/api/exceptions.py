@@ -31,15 +31,15 @@ class ReadTimeout(Exception):
         server took too long to receive.
     """
 
-    def __init__(self, url: str, timeout: int):
+    def __init__(self, url: str, timeout: int, attempts: int = MAX_RETRY):
         message = f"""ReadTimeout Error.
-\tOn all {MAX_RETRY} tries, Heurist's server took too long (> {timeout} seconds) to \
-send data from the following URL:
+\tOn all {attempts} tries, Heurist's server took too long (> {timeout} seconds on the \
+last try) to send data from the following URL:
 {url}
 Solutions:
 \t1. Try running the command again and hope the server / your internet is faster.
-\t2. Set the READTIMEOUT environment variable immediately before the command and run it\
- again, i.e. 'READTIMEOUT=20 heurist download'.
+\t2. Set the READTIMEOUT or MAX_RETRY environment variable immediately before the \
+command and run it again, i.e. 'READTIMEOUT=20 heurist download'.
 """
         self.message = message
         super().__init__(self.message)
@@ -0,0 +1,184 @@
+"""Incremental parser for the JSON records exported by the Heurist API."""
+
+import codecs
+import json
+import re
+from typing import Generator, Iterable, Iterator
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+DECODER = json.JSONDecoder()
+
+
+class ChunkBuffer:
+    """
+    Text buffer that decodes binary chunks of a JSON document only as they're \
+        needed, so that the parsed document never has to be held in memory whole.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.exhausted = False
+        self.text = ""
+        self.pos = 0
+
+    def fill(self) -> bool:
+        """Decode the next binary chunk and drop the text already consumed.
+
+        Returns:
+            bool: Whether more text was added to the buffer.
+        """
+
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self.text = self.text[self.pos :] + text
+                self.pos = 0
+                return True
+        self.exhausted = True
+        return False
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character without consuming it.
+
+        Raises:
+            json.JSONDecodeError: If the document ends.
+
+        Returns:
+            str: Next non-whitespace character.
+        """
+
+        while True:
+            self.pos = WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                raise json.JSONDecodeError("Unexpected end", self.text, self.pos)
+
+    def expect(self, char: str) -> None:
+        """Consume the next non-whitespace character, which must be `char`.
+
+        Raises:
+            json.JSONDecodeError: If the next character is not `char`.
+        """
+
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.text, self.pos)
+        self.pos += 1
+
+    def value(self) -> dict | list | str | int | float | bool | None:
+        """Decode the next JSON value, reading more chunks until it is complete.
+
+        Returns:
+            dict | list | str | int | float | bool | None: Decoded JSON value.
+        """
+
+        self.peek()
+        while True:
+            try:
+                obj, end = DECODER.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number at the end of the buffer might continue in the next chunk
+            if end == len(self.text) and not self.exhausted and self.fill():
+                continue
+            self.pos = end
+            return obj
+
+
+def iter_json_array(
+    chunks: Iterable[bytes], path: tuple[str] = ("heurist", "records")
+) -> Generator[dict, None, None]:
+    """
+    Walk down a JSON document's nested objects to an array and yield the array's \
+        items one at a time, while the document is still being read.
+
+    Examples:
+        >>> chunks = [b'{"heurist": {"rec', b'ords": [{"rec_ID": "1"}, {"re', \
+b'c_ID": "2"}]}}']
+        >>> list(iter_json_array(chunks))
+        [{'rec_ID': '1'}, {'rec_ID': '2'}]
+
+        >>> chunks = [b'{"heurist": {"database": {"id": 1}, "records": []}}']
+        >>> list(iter_json_array(chunks))
+        []
+
+    Args:
+        chunks (Iterable[bytes]): Binary chunks of the JSON document.
+        path (tuple[str]): Keys of the nested objects leading to the array. \
+            Defaults to ("heurist", "records").
+
+    Raises:
+        KeyError: If the document doesn't have the array.
+        json.JSONDecodeError: If the document is not valid JSON.
+
+    Yields:
+        Generator[dict, None, None]: Items of the array.
+    """
+
+    buffer = ChunkBuffer(chunks)
+
+    # Move through the nested objects until reaching the array's opening bracket
+    for key in path:
+        buffer.expect("{")
+        while True:
+            if buffer.peek() == "}":
+                raise KeyError(key)
+            name = buffer.value()
+            buffer.expect(":")
+            if name == key:
+                break
+            # Skip the values of other keys in the object
+            buffer.value()
+            if buffer.peek() == ",":
+                buffer.expect(",")
+    buffer.expect("[")
+
+    # Yield each item of the array
+    if buffer.peek() == "]":
+        return
+    while True:
+        yield buffer.value()
+        if buffer.peek() == ",":
+            buffer.expect(",")
+        else:
+            buffer.expect("]")
+            return
+
+
+def filter_record_stream(
+    records: Iterable[dict], record_type_id: int, users: tuple[int] = ()
+) -> Iterator[dict]:
+    """Lazily keep only the records of the targeted type and users.
+
+    Examples:
+        >>> records = [
+        ...     {"rec_ID": "1", "rec_RecTypeID": "103", "rec_AddedByUGrpID": "2"},
+        ...     {"rec_ID": "2", "rec_RecTypeID": "102", "rec_AddedByUGrpID": "2"},
+        ...     {"rec_ID": "3", "rec_RecTypeID": "103", "rec_AddedByUGrpID": "16"},
+        ... ]
+        >>> [r["rec_ID"] for r in filter_record_stream(records, 103)]
+        ['1', '3']
+        >>> [r["rec_ID"] for r in filter_record_stream(records, 103, users=(16,))]
+        ['3']
+
+    Args:
+        records (Iterable[dict]): Records from the Heurist JSON export.
+        record_type_id (int): Heurist ID of targeted record type.
+        users (tuple): Array of IDs of users who added the target records.
+
+    Yields:
+        Iterator[dict]: Targeted records.
+    """
+
+    record_type_id = str(record_type_id)
+    for record in records:
+        # Filter out linked records of a not the target type
+        if record["rec_RecTypeID"] != record_type_id:
+            continue
+        # Filter out records by non-targeted users
+        if users and int(record["rec_AddedByUGrpID"]) not in users:
+            continue
+        yield record
@@ -0,0 +1,209 @@
+"""Client-side limit on the rate of requests sent to the Heurist server."""
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Callable, Iterator
+
+from heurist.api.constants import (
+    LATENCY_SLOWDOWN,
+    LATENCY_SMOOTHING,
+    LATENCY_UNIT_BYTES,
+    MIN_RPS,
+    RATE_ADJUST_INTERVAL,
+)
+from heurist.api.utils import log_event
+
+
+class RateLimiter:
+    """
+    Token bucket that limits the requests sent to the Heurist server to \
+        `max_rps` per second, with bursts of at most `burst` requests, so that \
+        concurrent downloads don't overload the shared server.
+
+    One limiter can be shared by the threads of a synchronous client and the \
+        tasks of an asynchronous client. Each request takes a token, and waits \
+        if there is none left, outside of the limiter's lock. In the threads, \
+        the limiter also caps the number of requests waiting on the server, or \
+        whose response is being read, at the same time; the asynchronous \
+        client caps them with its own semaphore.
+
+    If `adaptive`, the limiter lowers its rate on its own when the server \
+        slows down: it halves the rate when the moving average of the server's \
+        latency rises above `slowdown` times its lowest value, or when the \
+        server answers that it's overloaded, and raises it back by a tenth of \
+        `max_rps` at a time when the latency recovers.
+
+    Examples:
+        >>> limiter = RateLimiter(max_rps=100, burst=2)
+        >>> start = time.perf_counter()
+        >>> for _ in range(6):
+        ...     with limiter.request():
+        ...         pass
+        >>> time.perf_counter() - start >= 0.03
+        True
+        >>> limiter.back_off()
+        >>> limiter.rate
+        50.0
+    """
+
+    def __init__(
+        self,
+        max_rps: float,
+        burst: int | None = None,
+        max_concurrent: int | None = None,
+        adaptive: bool = True,
+        min_rps: float = MIN_RPS,
+        slowdown: float = LATENCY_SLOWDOWN,
+        adjust_interval: float = RATE_ADJUST_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            max_rps (float): Highest number of requests per second.
+            burst (int | None): Number of requests that can be sent at once \
+                after a pause. Defaults to None, the number of requests per \
+                second, rounded up.
+            max_concurrent (int | None): Number of requests from threads that \
+                can wait on the server at the same time. Defaults to None, no \
+                limit.
+            adaptive (bool): Whether to lower the rate when the server slows \
+                down. Defaults to True.
+            min_rps (float): Lowest rate to which the limiter lowers itself. \
+                Defaults to 0.2.
+            slowdown (float): Factor of the lowest latency above which the \
+                limiter lowers its rate. Defaults to 2.
+            adjust_interval (float): Seconds between two adjustments of the \
+                rate. Defaults to 1.
+            clock (Callable[[], float]): Clock of the limiter, in seconds. \
+                Defaults to `time.monotonic`.
+
+        Raises:
+            ValueError: If the rate isn't positive.
+        """
+
+        if max_rps <= 0:
+            raise ValueError("The rate of requests must be positive.")
+        self.max_rps = float(max_rps)
+        self.rate = self.max_rps
+        self.burst = burst or max(1, math.ceil(max_rps))
+        self.adaptive = adaptive
+        self.min_rps = min(min_rps, self.max_rps)
+        self.slowdown = slowdown
+        self.adjust_interval = adjust_interval
+        self.latency = None
+        self.baseline = None
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._adjusted = self._updated
+        self._lock = threading.Lock()
+        self._slots = threading.Semaphore(max_concurrent) if max_concurrent else None
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(now - self._updated, 0.0)
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token, which may not be available yet.
+
+        Returns:
+            float: Seconds to wait before the token is available.
+        """
+
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    @contextmanager
+    def request(self) -> Iterator[None]:
+        """Wait for a free slot and a token before sending a request from a \
+            thread, and free the slot on exit, once the response has been read."""
+
+        if self._slots:
+            self._slots.acquire()
+        try:
+            wait = self.reserve()
+            if wait:
+                time.sleep(wait)
+            yield
+        finally:
+            if self._slots:
+                self._slots.release()
+
+    @asynccontextmanager
+    async def request_async(self) -> AsyncIterator[None]:
+        """Wait for a token before sending a request from an asyncio task."""
+
+        wait = self.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+        yield
+
+    def _set_rate(self, rate: float, now: float, reason: str) -> None:
+        rate = min(max(rate, self.min_rps), self.max_rps)
+        self._adjusted = now
+        if rate == self.rate:
+            return
+        # Count the tokens earned at the previous rate before changing it
+        self._refill(now)
+        self.rate = rate
+        log_event("rate", logging.INFO, rps=round(rate, 3), reason=reason)
+
+    def observe(self, seconds: float, size: int | None = None) -> None:
+        """Record the latency of a response, and adjust the rate to it.
+
+        Examples:
+            >>> now = [0.0]
+            >>> limiter = RateLimiter(max_rps=10, clock=lambda: now[0])
+            >>> for seconds in [0.1, 0.1, 0.5, 0.5]:
+            ...     now[0] += 1
+            ...     limiter.observe(seconds)
+            >>> limiter.rate
+            2.5
+            >>> for _ in range(6):
+            ...     now[0] += 1
+            ...     limiter.observe(0.1)
+            >>> limiter.rate
+            4.25
+
+        Args:
+            seconds (float): Seconds the server took to answer.
+            size (int | None): Size of the response, in bytes. Defaults to \
+                None, if it's unknown.
+        """
+
+        if not self.adaptive:
+            return
+        # The server takes longer to prepare a larger export, so the latency of
+        # a large response is measured per MiB
+        latency = seconds / max(1.0, (size or 0) / LATENCY_UNIT_BYTES)
+        with self._lock:
+            if self.latency is None:
+                self.latency = latency
+            else:
+                self.latency += LATENCY_SMOOTHING * (latency - self.latency)
+            self.baseline = min(self.baseline or self.latency, self.latency)
+            now = self._clock()
+            if now - self._adjusted < self.adjust_interval:
+                return
+            if self.latency > self.slowdown * self.baseline:
+                self._set_rate(self.rate / 2, now, reason="latency")
+            elif self.latency <= (1 + self.slowdown) / 2 * self.baseline:
+                self._set_rate(self.rate + self.max_rps / 10, now, reason="recovery")
+
+    def back_off(self) -> None:
+        """Halve the rate, i.e. because the server answered that it's \
+            overloaded, or didn't answer in time."""
+
+        if not self.adaptive:
+            return
+        with self._lock:
+            self._set_rate(self.rate / 2, self._clock(), reason="overloaded")
@@ -0,0 +1,323 @@
+"""Retries of failed requests to the Heurist server, and read timeouts adapted \
+to the size of the server's responses."""
+
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from functools import partial
+
+from heurist.api.constants import (
+    BACKOFF_BASE,
+    BACKOFF_MAX,
+    MAX_READTIMEOUT,
+    MAX_RETRY,
+    READTIMEOUT,
+    RETRY_AFTER_MAX,
+    RETRY_STATUS_CODES,
+    TIMEOUT_GROWTH,
+    TIMEOUT_MARGIN,
+    TIMEOUT_SAMPLE_BYTES,
+)
+from heurist.api.exceptions import APIException, ReadTimeout
+from heurist.api.utils import log_event
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    RetryError,
+    Retrying,
+    retry_if_exception_type,
+    stop_after_attempt,
+)
+
+
+class RetryableStatus(Exception):
+    """The Heurist server answered with a status code after which the request \
+        is retried, i.e. 503 when the server is overloaded."""
+
+    def __init__(self, status_code: int, retry_after: float | None = None):
+        self.status_code = status_code
+        self.retry_after = retry_after
+        super().__init__(f"Status {status_code}")
+
+
+def parse_retry_after(value: str | None, now: float | None = None) -> float | None:
+    """
+    Parse a response's Retry-After header, which is either a number of seconds \
+        or an HTTP date.
+
+    Examples:
+        >>> parse_retry_after("5")
+        5.0
+        >>> parse_retry_after("Thu, 01 Jan 1970 00:01:00 GMT", now=30)
+        30.0
+        >>> parse_retry_after("Thu, 01 Jan 1970 00:01:00 GMT", now=90)
+        0.0
+        >>> parse_retry_after("soon") is None
+        True
+
+    Args:
+        value (str | None): Value of the header.
+        now (float | None): Current time, as a timestamp. Defaults to None, the \
+            current time.
+
+    Returns:
+        float | None: Seconds to wait, or None if the header is missing or \
+            invalid.
+    """
+
+    if not value:
+        return
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return
+    if now is None:
+        now = time.time()
+    return max(date.timestamp() - now, 0.0)
+
+
+class RetryPolicy:
+    """
+    Policy of the retries of a request to the Heurist server, which is retried \
+        after a connection error, a timeout, or a status code with which the \
+        server answers when it's overloaded or restarting.
+
+    Before each retry, the client waits a random time, between 0 and a backoff \
+        that doubles with each retry, so that the clients which failed at the \
+        same time don't retry at the same time. If the server's response has a \
+        Retry-After header, the client waits as long as the server asked.
+
+    Examples:
+        >>> policy = RetryPolicy(backoff_base=1, backoff_max=4, seed=0)
+        >>> [0 <= policy.backoff(n) <= min(4, 2 ** (n - 1)) for n in range(1, 6)]
+        [True, True, True, True, True]
+        >>> policy.is_retryable(503), policy.is_retryable(404)
+        (True, False)
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = MAX_RETRY,
+        status_codes: tuple[int, ...] = RETRY_STATUS_CODES,
+        backoff_base: float = BACKOFF_BASE,
+        backoff_max: float = BACKOFF_MAX,
+        retry_after_max: float = RETRY_AFTER_MAX,
+        seed: int | None = None,
+    ) -> None:
+        """
+        Args:
+            max_attempts (int): Number of attempts at a request before giving \
+                up. Defaults to 3, or the MAX_RETRY environment variable.
+            status_codes (tuple[int, ...]): Status codes after which a request \
+                is retried. Defaults to 429, 502, 503, and 504.
+            backoff_base (float): Seconds of the backoff before the first retry. \
+                Defaults to 0.5.
+            backoff_max (float): Longest backoff, in seconds. Defaults to 30.
+            retry_after_max (float): Longest wait asked by a Retry-After header \
+                that is honoured, in seconds. Defaults to 120.
+            seed (int | None): Seed of the random backoffs. Defaults to None.
+        """
+
+        self.max_attempts = max(max_attempts, 1)
+        self.status_codes = tuple(status_codes)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_after_max = retry_after_max
+        self._random = random.Random(seed)
+
+    def is_retryable(self, status_code: int) -> bool:
+        return status_code in self.status_codes
+
+    def check_status(self, response) -> None:
+        """Raise a `RetryableStatus` if a response's status code is retried.
+
+        Args:
+            response (requests.Response | httpx.Response): Response from the \
+                Heurist server.
+
+        Raises:
+            RetryableStatus: If the request should be retried.
+        """
+
+        if self.is_retryable(response.status_code):
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            raise RetryableStatus(response.status_code, retry_after)
+
+    def backoff(self, attempt: int) -> float:
+        """Random seconds to wait after a failed attempt, with "full jitter".
+
+        Args:
+            attempt (int): Number of the failed attempt, starting at 1.
+
+        Returns:
+            float: Seconds to wait.
+        """
+
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return self._random.uniform(0, ceiling)
+
+    def wait(self, retry_state: RetryCallState) -> float:
+        error = retry_state.outcome.exception()
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            return min(retry_after, self.retry_after_max)
+        return self.backoff(retry_state.attempt_number)
+
+    def retrying(
+        self,
+        errors: tuple[type[Exception], ...],
+        url: str,
+        asynchronous: bool = False,
+    ) -> Retrying | AsyncRetrying:
+        """Create the tenacity controller of the attempts at a request.
+
+        Args:
+            errors (tuple[type[Exception], ...]): The HTTP library's exceptions \
+                after which a request is retried, i.e. its timeouts and \
+                connection errors.
+            url (str): URL of the request, for the logs.
+            asynchronous (bool): Whether the request is sent by an asynchronous \
+                client. Defaults to False.
+
+        Returns:
+            Retrying | AsyncRetrying: Iterator of the attempts.
+        """
+
+        controller = AsyncRetrying if asynchronous else Retrying
+        return controller(
+            retry=retry_if_exception_type((*errors, RetryableStatus)),
+            stop=stop_after_attempt(self.max_attempts),
+            wait=self.wait,
+            before_sleep=partial(self._log_retry, url=url),
+        )
+
+    def _log_retry(self, retry_state: RetryCallState, url: str) -> None:
+        error = retry_state.outcome.exception()
+        log_event(
+            "retry",
+            logging.WARNING,
+            url=url,
+            attempt=retry_state.attempt_number,
+            max_attempts=self.max_attempts,
+            error=str(error) or type(error).__name__,
+            wait=round(retry_state.next_action.sleep, 3),
+        )
+
+    def give_up(
+        self,
+        error: RetryError,
+        url: str,
+        timeout: float | None,
+        timeout_errors: tuple[type[Exception], ...],
+    ) -> Exception:
+        """Describe why the attempts at a request all failed.
+
+        Args:
+            error (RetryError): Error raised by tenacity after the last attempt.
+            url (str): URL of the request.
+            timeout (float | None): Read timeout of the last attempt.
+            timeout_errors (tuple[type[Exception], ...]): The HTTP library's \
+                timeouts.
+
+        Returns:
+            Exception: The exception to show the user.
+        """
+
+        last = error.last_attempt.exception()
+        if isinstance(last, RetryableStatus):
+            return APIException(f"Status {last.status_code}")
+        elif isinstance(last, timeout_errors):
+            return ReadTimeout(url=url, timeout=timeout, attempts=self.max_attempts)
+        return APIException(f"Could not connect to the Heurist server: {last}")
+
+
+class AdaptiveTimeout:
+    """
+    Read timeout of the requests to the Heurist server, adapted to the size of \
+        the responses that the server has sent so far.
+
+    The Heurist server prepares a whole export before sending it, so the time \
+        it takes to answer grows with the size of the export. The timeout is at \
+        least `base` seconds. Once a large response has been received, the \
+        timeout allows `margin` times the time that the server would take to \
+        send the largest response seen so far, at the slowest rate seen so far. \
+        It also grows by `growth` with each retry of a request, and is at most \
+        `maximum` seconds.
+
+    Examples:
+        >>> timeout = AdaptiveTimeout(base=10, maximum=300, growth=2, margin=3)
+        >>> timeout.get(), timeout.get(attempt=2)
+        (10, 20)
+        >>> timeout.observe(seconds=8, size=4 * 1024**2)
+        >>> timeout.get()
+        24.0
+        >>> timeout.get(attempt=5)
+        300
+    """
+
+    def __init__(
+        self,
+        base: float | None = READTIMEOUT,
+        maximum: float = MAX_READTIMEOUT,
+        growth: float = TIMEOUT_GROWTH,
+        margin: float = TIMEOUT_MARGIN,
+        sample_bytes: int = TIMEOUT_SAMPLE_BYTES,
+    ) -> None:
+        """
+        Args:
+            base (float | None): Shortest timeout, in seconds. If None, the \
+                requests have no timeout. Defaults to 10, or the READTIMEOUT \
+                environment variable.
+            maximum (float): Longest timeout, in seconds, unless `base` is \
+                longer. Defaults to 300.
+            growth (float): Factor by which the timeout grows with each retry. \
+                Defaults to 1.5.
+            margin (float): Factor of the expected time that the timeout \
+                allows. Defaults to 3.
+            sample_bytes (int): Smallest response whose duration is used to \
+                estimate the server's rate. Defaults to 1 MiB.
+        """
+
+        self.base = base
+        self.maximum = max(maximum, base or 0)
+        self.growth = growth
+        self.margin = margin
+        self.sample_bytes = sample_bytes
+        self.largest = 0
+        self.seconds_per_byte = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, size: int) -> None:
+        """Record the duration and size of a response.
+
+        Args:
+            seconds (float): Seconds the server took to send the response.
+            size (int): Size of the response, in bytes.
+        """
+
+        with self._lock:
+            self.largest = max(self.largest, size)
+            if size >= self.sample_bytes:
+                self.seconds_per_byte = max(self.seconds_per_byte, seconds / size)
+
+    def get(self, attempt: int = 1) -> float | None:
+        """The read timeout of an attempt at a request.
+
+        Args:
+            attempt (int): Number of the attempt, starting at 1. Defaults to 1.
+
+        Returns:
+            float | None: Seconds, or None if the requests have no timeout.
+        """
+
+        if self.base is None:
+            return
+        with self._lock:
+            expected = self.margin * self.seconds_per_byte * self.largest
+        timeout = max(self.base, expected) * self.growth ** (attempt - 1)
+        return min(timeout, self.maximum)
@@ -0,0 +1,228 @@
+"""Tuned HTTP sessions and persisted login cookies for the Heurist server."""
+
+import hashlib
+import json
+import os
+import socket
+import tempfile
+import time
+from http.cookiejar import CookieJar
+from pathlib import Path
+
+import requests
+from heurist.api.constants import (
+    ACCEPT_ENCODING,
+    ADAPTER_MAX_RETRIES,
+    HUMA_NUM_SERVER,
+    MAX_CONCURRENT_REQUESTS,
+    SESSION_TTL,
+)
+from requests.adapters import HTTPAdapter
+from requests.cookies import create_cookie
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+
+
+def keep_alive_socket_options(idle_seconds: int = 60) -> list[tuple]:
+    """
+    Socket options that turn on TCP keep-alive, so that idle pooled connections \
+        to the server are probed rather than silently dropped by a firewall.
+
+    Examples:
+        >>> import socket
+        >>> (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in keep_alive_socket_options()
+        True
+
+    Args:
+        idle_seconds (int): Seconds of inactivity before the first probe, on \
+            platforms that support it. Defaults to 60.
+
+    Returns:
+        list[tuple]: Options given to the connections' sockets.
+    """
+
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle_seconds))
+    return options
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    HTTP adapter with a pool of connections sized for concurrent downloads, \
+        optional TCP keep-alive, and optional retries of failed connections.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = MAX_CONCURRENT_REQUESTS,
+        max_retries: int = ADAPTER_MAX_RETRIES,
+        keep_alive: bool = True,
+    ) -> None:
+        self.keep_alive = keep_alive
+        # Only retry the connection, because read timeouts and overloaded servers
+        # are retried by the client, with a longer backoff, and a request the
+        # server received might not be idempotent.
+        retries = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=False,
+            status=False,
+            respect_retry_after_header=False,
+            backoff_factor=0.5,
+        )
+        super().__init__(
+            pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries
+        )
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        if self.keep_alive:
+            kwargs["socket_options"] = keep_alive_socket_options()
+        super().init_poolmanager(*args, **kwargs)
+
+
+def build_session(
+    pool_size: int = MAX_CONCURRENT_REQUESTS,
+    max_retries: int = ADAPTER_MAX_RETRIES,
+    keep_alive: bool = True,
+) -> requests.Session:
+    """
+    Create a session whose connections to the server are pooled and reused.
+
+    Examples:
+        >>> session = build_session(pool_size=8)
+        >>> session.get_adapter("https://heurist.huma-num.fr")._pool_maxsize
+        8
+        >>> session.headers["Accept-Encoding"]
+        'gzip, deflate'
+
+    Args:
+        pool_size (int): Number of connections kept open to the server, which \
+            should be at least the number of concurrent requests. Defaults to 5.
+        max_retries (int): Number of times the adapter retries a failed \
+            connection, inside each attempt at a request. Defaults to 0, \
+            because the client's `RetryPolicy` retries the requests.
+        keep_alive (bool): Whether to turn on TCP keep-alive for the pooled \
+            connections. Defaults to True.
+
+    Returns:
+        requests.Session: HTTP session.
+    """
+
+    session = requests.Session()
+    adapter = PooledHTTPAdapter(
+        pool_size=pool_size, max_retries=max_retries, keep_alive=keep_alive
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    return session
+
+
+class SessionStore:
+    """
+    On-disk store of the cookies of authenticated sessions, so that a later run \
+        for the same database and user can skip the login.
+
+    The cookies are stored in a JSON file, which only the current user can read, \
+        and are reused for `ttl_seconds` after the login. The password is never \
+        stored.
+
+    Examples:
+        >>> import tempfile, requests
+        >>> store = SessionStore(directory=tempfile.mkdtemp())
+        >>> session = requests.Session()
+        >>> _ = session.cookies.set("PHPSESSID", "abc", domain="heurist.huma-num.fr")
+        >>> store.save("mock_db", "user", session.cookies)
+        >>> new_session = requests.Session()
+        >>> store.load("mock_db", "user", new_session.cookies)
+        True
+        >>> new_session.cookies.get("PHPSESSID")
+        'abc'
+        >>> store.load("mock_db", "other_user", new_session.cookies)
+        False
+    """
+
+    def __init__(self, directory: Path | str, ttl_seconds: int = SESSION_TTL) -> None:
+        """
+        Args:
+            directory (Path | str): Directory in which the cookies are stored.
+            ttl_seconds (int, optional): Seconds during which the cookies of a \
+                login are reused. Defaults to 20 minutes.
+        """
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl_seconds
+
+    def path(self, db: str, login: str, server: str = HUMA_NUM_SERVER) -> Path:
+        key = f"{server}\n{db}\n{login}"
+        key = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory.joinpath(key).with_suffix(".json")
+
+    def load(
+        self, db: str, login: str, jar: CookieJar, server: str = HUMA_NUM_SERVER
+    ) -> bool:
+        """Add the stored cookies of a user's session to a cookie jar, if they \
+            have not expired.
+
+        Args:
+            db (str): Heurist database name.
+            login (str): Username.
+            jar (CookieJar): Cookie jar of a `requests` or `httpx` session.
+            server (str): Base URL of the Heurist server. Defaults to Huma-Num's \
+                Heurist server.
+
+        Returns:
+            bool: Whether the cookies of a valid session were loaded.
+        """
+
+        path = self.path(db, login, server)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+        if time.time() > data.get("expires", 0) or not data.get("cookies"):
+            path.unlink(missing_ok=True)
+            return False
+        for cookie in data["cookies"]:
+            jar.set_cookie(create_cookie(**cookie))
+        return True
+
+    def save(
+        self, db: str, login: str, jar: CookieJar, server: str = HUMA_NUM_SERVER
+    ) -> None:
+        """Store the cookies of a user's authenticated session.
+
+        Args:
+            db (str): Heurist database name.
+            login (str): Username.
+            jar (CookieJar): Cookie jar of a `requests` or `httpx` session.
+            server (str): Base URL of the Heurist server. Defaults to Huma-Num's \
+                Heurist server.
+        """
+
+        cookies = [
+            {
+                "name": c.name,
+                "value": c.value,
+                "domain": c.domain,
+                "path": c.path,
+                "secure": c.secure,
+            }
+            for c in jar
+        ]
+        data = {"expires": time.time() + self.ttl, "cookies": cookies}
+        # Write the file atomically, readable only by the current user
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.chmod(tmp, 0o600)
+        os.replace(tmp, self.path(db, login, server))
+
+    def discard(self, db: str, login: str, server: str = HUMA_NUM_SERVER) -> None:
+        """Delete the stored cookies of a user's session."""
+
+        self.path(db, login, server).unlink(missing_ok=True)
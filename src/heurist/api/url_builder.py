@@ -1,12 +1,14 @@
 """Class to compose URIs for calling the Heurist API."""
 
 from typing import Literal
+from urllib.parse import quote
 
 from heurist.api.constants import (
     HUMA_NUM_SERVER,
     RECORD_JSON_EXPORT_PATH,
     RECORD_XML_EXPORT_PATH,
     STRUCTURE_EXPORT_PATH,
+    USER_INFO_PATH,
 )
 
 COMMA = "%2C"
@@ -32,6 +34,10 @@ class URLBuilder:
     def json_record_api(self) -> str:
         return f"{self.server}{RECORD_JSON_EXPORT_PATH}"
 
+    @property
+    def user_info_api(self) -> str:
+        return f"{self.server}{USER_INFO_PATH}"
+
     @classmethod
     def _join_queries(cls, *args) -> str:
         """Join 1 or more queries together with an ampersand.
@@ -86,14 +92,39 @@ class URLBuilder:
         db = f"?db={self.database_name}"
         return f"{self.db_api}{db}"
 
+    def check_session(self) -> str:
+        """
+        URL of the request that describes the session's user. The server also \
+            answers a guest, whose user ID is 0, so the response's user tells \
+            whether the session is still logged in.
+
+        Examples:
+            >>> builder = URLBuilder("mock_db")
+            >>> builder.check_session()
+            'https://heurist.huma-num.fr/heurist/hserv/controller/usr_info.php?a=verify_credentials&db=mock_db'
+
+        Returns:
+            str: URL with which to check a session.
+        """
+
+        path = self._join_queries("?a=verify_credentials", f"db={self.database_name}")
+        return f"{self.user_info_api}{path}"
+
     def get_records(
         self,
         record_type_id: int,
         form: Literal["xml", "json"] = "xml",
         users: tuple = (),
+        modified_since: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
     ) -> str:
         """Build a URL to retrieve records of a certain type.
 
+        If a `limit` is given, the URL only retrieves a page of the records, which \
+            are then sorted by their IDs, so that consecutive pages neither skip \
+            nor repeat records.
+
         Examples:
             >>> db = "mock_db"
             >>> builder = URLBuilder(db)
@@ -110,10 +141,25 @@ class URLBuilder:
             >>> builder.get_records(102, users=(2,16,))
             'https://heurist.huma-num.fr/heurist/export/xml/flathml.php?q=[{"t"%3A"102"}%2C{"sortby"%3A"t"}%2C{"addedby"%3A"2%2C16"}]&a=1&db=mock_db&depth=all&linkmode=direct_links'
 
+            >>> db = "mock_db"
+            >>> builder = URLBuilder(db)
+            >>> builder.get_records(102, modified_since="2024-08-28 14:43:43")
+            'https://heurist.huma-num.fr/heurist/export/xml/flathml.php?q=[{"t"%3A"102"}%2C{"sortby"%3A"t"}%2C{"modified"%3A"%3E2024-08-28%2014%3A43%3A43"}]&a=1&db=mock_db&depth=all&linkmode=direct_links'
+
+            >>> db = "mock_db"
+            >>> builder = URLBuilder(db)
+            >>> builder.get_records(102, form="json", limit=1000, offset=2000)
+            'https://heurist.huma-num.fr/heurist/hserv/controller/record_output.php?q=[{"t"%3A"102"}%2C{"sortby"%3A"id"}]&a=1&db=mock_db&depth=all&linkmode=direct_links&format=json&defs=0&extended=2&limit=1000&offset=2000'
 
         Args:
             record_type_id (int): Heurist ID of the record type.
             form (Literal["xml", "json"]): The format of the exported data.
+            users (tuple): IDs of the users who added the records.
+            modified_since (str | None): Only retrieve the records modified after \
+                this date, i.e. "2024-08-28 14:43:43".
+            limit (int | None): Maximum number of records to retrieve. Defaults \
+                to None, which retrieves all the records.
+            offset (int): With a limit, number of records to skip. Defaults to 0.
 
         Returns:
             str: URL to retrieve records of a certain type.
@@ -133,16 +179,31 @@ class URLBuilder:
 
         # Make the query based on parameters
         record_type_filter = self._make_filter_obj(filter="t", value=record_type_id)
-        sortby_filter = self._make_filter_obj(filter="sortby", value="t")
+        # Pages of records are sorted by ID, which is unique, unlike the title
+        sortby = "t" if limit is None else "id"
+        sortby_filter = self._make_filter_obj(filter="sortby", value=sortby)
         if len(users) > 0:
             user_string = self._join_comma_separated_values(*users)
             users_filter = self._make_filter_obj(filter="addedby", value=user_string)
         else:
             users_filter = None
+        if modified_since:
+            modified_filter = self._make_filter_obj(
+                filter="modified", value=quote(f">{modified_since}")
+            )
+        else:
+            modified_filter = None
         query_path = self._join_list_items(
-            record_type_filter, sortby_filter, users_filter
+            record_type_filter, sortby_filter, users_filter, modified_filter
         )
         query = f"?q={query_path}"
 
-        path = self._join_queries(query, a, db, depth, link_mode, format_args)
+        if limit is not None:
+            page_args = f"limit={int(limit)}&offset={int(offset)}"
+        else:
+            page_args = None
+
+        path = self._join_queries(
+            query, a, db, depth, link_mode, format_args, page_args
+        )
         return f"{api}{path}"
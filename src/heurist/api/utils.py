@@ -1,24 +1,71 @@
-from datetime import datetime
+import json
+import logging
+from pathlib import Path
 
-from .constants import MAX_RETRY
+# Logger of the requests sent to the Heurist server
+logger = logging.getLogger("heurist.api")
+# Keep the requests' logs out of the validation log, which the root logger writes
+logger.propagate = False
+_console = logging.StreamHandler()
+_console.setLevel(logging.WARNING)
+_console.setFormatter(
+    logging.Formatter("[{asctime}] {message}", datefmt="%H:%M:%S", style="{")
+)
+logger.addHandler(_console)
 
 
-def log_attempt_number(retry_state) -> None:
-    """Simple logger for tenacity retry.
+def log_event(event: str, level: int = logging.DEBUG, **fields) -> None:
+    """Log an event of a request, i.e. an attempt or a retry, with its fields \
+        both in the message, as `key=value` pairs, and on the log record, for \
+        structured handlers.
+
+    Examples:
+        >>> import logging
+        >>> class Collector(logging.Handler):
+        ...     def emit(self, record):
+        ...         print(record.getMessage())
+        ...         print(record.fields)
+        >>> handler = Collector()
+        >>> logger.addHandler(handler)
+        >>> log_event("retry", logging.WARNING, attempt=1, wait=0.25)
+        event=retry attempt=1 wait=0.25
+        {'event': 'retry', 'attempt': 1, 'wait': 0.25}
+        >>> logger.removeHandler(handler)
 
     Args:
-        retry_state (tenacity.RetryCallState): Retry result from tenacity.
+        event (str): Name of the event.
+        level (int): Level of the log. Defaults to DEBUG.
+        **fields: Fields of the event, i.e. the URL and the seconds it took.
     """
 
-    # Get the attempt number from the RetryCallState
-    attempt_number = retry_state.attempt_number
+    fields = {"event": event, **fields}
+    message = " ".join(f"{k}={v}" for k, v in fields.items())
+    logger.log(level, message, extra={"fields": fields})
+
+
+class JSONLineFormatter(logging.Formatter):
+    """Format a log record as a line of JSON, with the fields of its event."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {"time": self.formatTime(record), "level": record.levelname}
+        data.update(getattr(record, "fields", {"message": record.getMessage()}))
+        return json.dumps(data, default=str)
+
 
-    # Compose the console message
-    time = datetime.now().strftime("%H:%M:%S")
-    message = (
-        f"[{time}] ReadTimeout error when receiving data from the Heurist API. "
-        f"Retrying {attempt_number} / {MAX_RETRY} times..."
-    )
+def log_requests(path: Path | str) -> logging.Handler:
+    """Write every attempt at a request to the Heurist server, with its status, \
+        duration, size, and timeout, and every retry, to a file of JSON lines.
+
+    Args:
+        path (Path | str): Path to the log file.
+
+    Returns:
+        logging.Handler: The file's handler, which can be removed from the \
+            logger.
+    """
 
-    # Print the error message
-    print(message)
+    handler = logging.FileHandler(filename=path, encoding="utf-8")
+    handler.setFormatter(JSONLineFormatter())
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    return handler
@@ -6,12 +6,26 @@ import importlib.metadata
 
 import click
 from heurist import PACKAGE_NAME
+from heurist.api.cache import ResponseCache
+from heurist.api.constants import (
+    CACHE_MAX_SIZE,
+    CACHE_TTL,
+    HUMA_NUM_SERVER,
+    SESSION_TTL,
+)
 from heurist.api.credentials import CredentialHandler
 from heurist.api.exceptions import MissingParameterException
+from heurist.api.session import SessionStore
+from heurist.api.utils import log_requests
 from heurist.cli.load import load_command
 from heurist.cli.records import rty_command
 from heurist.cli.schema import schema_command
 from heurist.utils.constants import DEFAULT_RECORD_GROUPS
+from heurist.workflows.export import (
+    EXPORT_FORMATS,
+    PARQUET_COMPRESSIONS,
+    ROW_GROUP_SIZE,
+)
 from rich.console import Console
 
 # This name must match the package name ('name' kwarg) in the TOML file.
@@ -41,6 +55,15 @@ __identifier__ = importlib.metadata.version(PACKAGE_NAME)
     type=click.STRING,
     help="Password for the database user",
 )
+@click.option(
+    "--server",
+    type=click.STRING,
+    envvar="HEURIST_SERVER",
+    default=HUMA_NUM_SERVER,
+    show_default=True,
+    help="Base URL of the Heurist server, which can also be declared with \
+        the environment variable HEURIST_SERVER.",
+)
 @click.option(
     "--debugging",
     required=False,
@@ -48,10 +71,87 @@ __identifier__ = importlib.metadata.version(PACKAGE_NAME)
     is_flag=True,
     help="Whether to run in debug mode, default false.",
 )
+@click.option(
+    "--cache-dir",
+    required=False,
+    type=click.Path(file_okay=False, dir_okay=True),
+    help="Directory in which to cache the Heurist server's responses. \
+        If not declared, responses are not cached.",
+)
+@click.option(
+    "--cache-ttl",
+    required=False,
+    type=click.IntRange(min=0),
+    default=CACHE_TTL,
+    show_default=True,
+    help="Seconds during which a cached response is reused.",
+)
+@click.option(
+    "--cache-max-size",
+    required=False,
+    type=click.IntRange(min=1),
+    default=CACHE_MAX_SIZE // 1024**2,
+    show_default=True,
+    help="Maximum size (in MB) of the cached responses. When it's exceeded, \
+        the least recently used responses are deleted.",
+)
+@click.option(
+    "--session-dir",
+    required=False,
+    type=click.Path(file_okay=False, dir_okay=True),
+    help="Directory in which to save the cookies of the login session, \
+        so that the following commands skip the login. \
+        If not declared, every command logs in.",
+)
+@click.option(
+    "--session-ttl",
+    required=False,
+    type=click.IntRange(min=0),
+    default=SESSION_TTL,
+    show_default=True,
+    help="Seconds during which a saved login session is reused.",
+)
+@click.option(
+    "--request-log",
+    required=False,
+    type=click.Path(file_okay=True, dir_okay=False),
+    help="File in which to log every request to the Heurist server, with its \
+        status, duration, size, and retries, as lines of JSON.",
+)
 @click.pass_context
-def cli(ctx, database, login, password, debugging):
+def cli(
+    ctx,
+    database,
+    login,
+    password,
+    server,
+    debugging,
+    cache_dir,
+    cache_ttl,
+    cache_max_size,
+    session_dir,
+    session_ttl,
+    request_log,
+):
     ctx.ensure_object(dict)
     ctx.obj["DEBUGGING"] = debugging
+    ctx.obj["SERVER"] = server
+    if cache_dir:
+        ctx.obj["CACHE"] = ResponseCache(
+            directory=cache_dir,
+            ttl_seconds=cache_ttl,
+            max_size_bytes=cache_max_size * 1024**2,
+        )
+    else:
+        ctx.obj["CACHE"] = None
+    if session_dir:
+        ctx.obj["SESSION_STORE"] = SessionStore(
+            directory=session_dir, ttl_seconds=session_ttl
+        )
+    else:
+        ctx.obj["SESSION_STORE"] = None
+    if request_log:
+        log_requests(request_log)
     try:
         ctx.obj["CREDENTIALS"] = CredentialHandler(
             database_name=database,
@@ -98,7 +198,14 @@ def cli(ctx, database, login, password, debugging):
 @click.pass_obj
 def records(ctx, record_type, outfile):
     credentials = ctx["CREDENTIALS"]
-    rty_command(credentials, record_type, outfile)
+    rty_command(
+        credentials,
+        record_type,
+        outfile,
+        cache=ctx["CACHE"],
+        session_store=ctx["SESSION_STORE"],
+        server=ctx["SERVER"],
+    )
 
 
 # =========================== #
@@ -149,6 +256,9 @@ def doc(ctx, record_group, outdir, output_type):
         outdir=outdir,
         output_type=output_type,
         debugging=debugging,
+        cache=ctx["CACHE"],
+        session_store=ctx["SESSION_STORE"],
+        server=ctx["SERVER"],
     )
 
 
@@ -196,31 +306,166 @@ def doc(ctx, record_group, outdir, output_type):
         file_okay=False,
         dir_okay=True,
     ),
-    help="Directory in which CSV files of the dumped tabular data \
+    help="Directory in which files of the dumped tabular data \
         will be written.",
 )
+@click.option(
+    "--format",
+    "output_format",
+    required=False,
+    type=click.Choice(EXPORT_FORMATS),
+    default="csv",
+    show_default=True,
+    help="Format of the files written in the output directory.",
+)
+@click.option(
+    "--compression",
+    required=False,
+    type=click.Choice(PARQUET_COMPRESSIONS),
+    default="snappy",
+    show_default=True,
+    help="Compression codec of the Parquet files.",
+)
+@click.option(
+    "--row-group-size",
+    required=False,
+    type=click.IntRange(min=1),
+    default=ROW_GROUP_SIZE,
+    show_default=True,
+    help="Number of rows in each row group of the Parquet files.",
+)
+@click.option(
+    "--partition-by",
+    required=False,
+    type=click.STRING,
+    multiple=True,
+    help="Column or columns, i.e. 'type_id', by which to partition each \
+        exported table into a Hive-style directory of files.",
+)
+@click.option(
+    "--sort/--no-sort",
+    required=False,
+    default=True,
+    show_default=True,
+    help="Whether to sort the exported tables' rows by their records' IDs.",
+)
+@click.option(
+    "-w",
+    "--workers",
+    required=False,
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of record types to download from the Heurist server, \
+        and of tables to export, at the same time.",
+)
+@click.option(
+    "-p",
+    "--processes",
+    required=False,
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of worker processes in which to validate each record type's \
+        records, which speeds up very large record types.",
+)
+@click.option(
+    "--stream",
+    required=False,
+    default=False,
+    is_flag=True,
+    help="Parse each record type's export while it's being downloaded, \
+        which lowers memory use for very large record types.",
+)
+@click.option(
+    "--incremental",
+    required=False,
+    default=False,
+    is_flag=True,
+    help="Only download the records modified since the last download into \
+        the DuckDB database file, and update its tables with them.",
+)
+@click.option(
+    "--page-size",
+    required=False,
+    type=click.IntRange(min=1),
+    default=None,
+    help="Download each record type's records in pages of this many records, \
+        several at a time, so that a timeout only concerns one page. \
+        Default: all of a record type's records at once.",
+)
+@click.option(
+    "--max-rps",
+    required=False,
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    help="Highest number of requests per second sent to the Heurist server, \
+        which is lowered automatically when the server slows down. \
+        Default: no limit.",
+)
+@click.option(
+    "--profile",
+    required=False,
+    default=False,
+    is_flag=True,
+    help="Show the slowest stages of the download, whose timings are saved \
+        in the DuckDB database file's _etl_metrics table, in the summary.",
+)
 @click.pass_obj
-def load(ctx, filepath, record_group, user, outdir):
+def load(
+    ctx,
+    filepath,
+    record_group,
+    user,
+    outdir,
+    output_format,
+    compression,
+    row_group_size,
+    partition_by,
+    sort,
+    workers,
+    processes,
+    stream,
+    incremental,
+    page_size,
+    max_rps,
+    profile,
+):
     # Get context variable
     credentials = ctx["CREDENTIALS"]
     testing = ctx["DEBUGGING"]
 
+    kwargs = dict(
+        credentials=credentials,
+        duckdb_database_connection_path=filepath,
+        record_group=record_group,
+        user=user,
+        outdir=outdir,
+        workers=workers,
+        processes=processes,
+        stream=stream,
+        cache=ctx["CACHE"],
+        session_store=ctx["SESSION_STORE"],
+        incremental=incremental,
+        output_format=output_format,
+        compression=compression,
+        row_group_size=row_group_size,
+        partition_by=partition_by,
+        sort=sort,
+        profile=profile,
+        page_size=page_size,
+        max_rps=max_rps,
+    )
+
     # Run the dump command
     if not testing:
-        load_command(
-            credentials=credentials,
-            duckdb_database_connection_path=filepath,
-            record_group=record_group,
-            user=user,
-            outdir=outdir,
-        )
+        load_command(server=ctx["SERVER"], **kwargs)
     else:
-        print(
-            "\nCannot run 'dump' command in debugging mode.\
-            \nClient must connect to a remote Heurist database.\n"
-        )
-        print("Exiting.")
-        exit()
+        # Download the mock data from a local stand-in for the Heurist server
+        from mock_data.server import MockHeuristServer
+
+        with MockHeuristServer(db=credentials.get_database()) as server:
+            load_command(server=server.url, **kwargs)
 
 
 if __name__ == "__main__":
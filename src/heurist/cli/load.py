@@ -5,16 +5,26 @@ CLI command for downloading all requested record types' data.
 from pathlib import Path
 
 import duckdb
+from heurist.api.cache import ResponseCache
 from heurist.api.connection import HeuristAPIConnection
+from heurist.api.constants import HUMA_NUM_SERVER, MAX_CONCURRENT_REQUESTS
 from heurist.api.credentials import CredentialHandler
+from heurist.api.rate_limit import RateLimiter
+from heurist.api.session import SessionStore
 from heurist.log import log_summary
 from heurist.log.constants import VALIDATION_LOG
 from heurist.utils.constants import DEFAULT_RECORD_GROUPS
+from heurist.utils.metrics import ETLMetrics
 from heurist.workflows import extract_transform_load
+from heurist.workflows.export import ROW_GROUP_SIZE, export_tables
 from rich.columns import Columns
 from rich.console import Console, Group
 from rich.padding import Padding
 from rich.panel import Panel
+from rich.table import Table
+
+# Number of the slowest stages shown by the profile
+PROFILE_TOP = 10
 
 
 def load_command(
@@ -23,16 +33,45 @@ def load_command(
     record_group: tuple = DEFAULT_RECORD_GROUPS,
     user: tuple = (),
     outdir: Path | None = None,
+    workers: int = 1,
+    processes: int = 1,
+    stream: bool = False,
+    cache: ResponseCache | None = None,
+    session_store: SessionStore | None = None,
+    server: str = HUMA_NUM_SERVER,
+    incremental: bool = False,
+    output_format: str = "csv",
+    compression: str = "snappy",
+    row_group_size: int = ROW_GROUP_SIZE,
+    partition_by: tuple = (),
+    sort: bool = True,
+    profile: bool = False,
+    page_size: int | None = None,
+    max_rps: float | None = None,
 ):
     # Run the ETL process
     if isinstance(duckdb_database_connection_path, Path):
         duckdb_database_connection_path = str(duckdb_database_connection_path)
+    metrics = ETLMetrics()
+    # Keep a connection open for each of the concurrent downloads
+    pool_size = max(workers, MAX_CONCURRENT_REQUESTS)
+    if page_size:
+        # Each of the concurrent downloads requests several pages at a time
+        pool_size = max(workers, 1) * MAX_CONCURRENT_REQUESTS
+    # All the concurrent downloads share the limit on the rate of requests
+    rate_limiter = RateLimiter(max_rps=max_rps) if max_rps else None
     with (
         duckdb.connect(duckdb_database_connection_path) as conn,
         HeuristAPIConnection(
             db=credentials.get_database(),
             login=credentials.get_login(),
             password=credentials.get_password(),
+            cache=cache,
+            pool_size=pool_size,
+            session_store=session_store,
+            server=server,
+            page_size=page_size,
+            rate_limiter=rate_limiter,
         ) as client,
     ):
         extract_transform_load(
@@ -40,31 +79,56 @@ def load_command(
             duckdb_connection=conn,
             record_group_names=record_group,
             user=user,
+            workers=workers,
+            processes=processes,
+            stream=stream,
+            incremental=incremental,
+            metrics=metrics,
         )
 
     # Show the results of the created DuckDB database
     with duckdb.connect(duckdb_database_connection_path, read_only=True) as new_conn:
-        tables = [t[0] for t in new_conn.sql("show tables;").fetchall()]
+        # List the tables, except the internal metadata tables
+        tables = [
+            t[0]
+            for t in new_conn.sql("show tables;").fetchall()
+            if not t[0].startswith("_")
+        ]
         if VALIDATION_LOG.is_file():
             with open(VALIDATION_LOG) as f:
                 log = f.readlines()
         else:
             log = []
-        show_summary_in_console(tables=tables, log_lines=log)
+        show_summary_in_console(
+            tables=tables,
+            log_lines=log,
+            metrics=metrics if profile else None,
+        )
 
-        # If writing to CSV files, write only tables of record types
+        # If exporting the tables to files, export only tables of record types
         if outdir:
             outdir = Path(outdir)
             outdir.mkdir(exist_ok=True)
-            for table in tables:
-                # Skip the schema tables
-                if table in ["rtg", "rst", "rty", "dty", "trm"]:
-                    continue
-                fp = outdir.joinpath(f"{table}.csv")
-                new_conn.table(table).sort("H-ID").write_csv(str(fp))
+            # Skip the schema tables
+            record_tables = [
+                t for t in tables if t not in ["rtg", "rst", "rty", "dty", "trm"]
+            ]
+            export_tables(
+                conn=new_conn,
+                tables=record_tables,
+                outdir=outdir,
+                workers=workers,
+                output_format=output_format,
+                compression=compression,
+                row_group_size=row_group_size,
+                partition_by=partition_by,
+                sort=sort,
+            )
 
 
-def show_summary_in_console(tables: list[str], log_lines: list):
+def show_summary_in_console(
+    tables: list[str], log_lines: list, metrics: ETLMetrics | None = None
+):
     console = Console()
     t0 = Panel(
         Columns(tables, equal=True, expand=True),
@@ -72,5 +136,52 @@ def show_summary_in_console(tables: list[str], log_lines: list):
         subtitle="Saved in DuckDB database file.",
     )
     t1, t2 = log_summary(lines=log_lines)
-    panel_group = Group(Padding(t0, 1), t1, Padding(t2, 1))
+    renderables = [Padding(t0, 1), t1, Padding(t2, 1)]
+    if metrics:
+        renderables.append(profile_summary(metrics=metrics))
+    panel_group = Group(*renderables)
     console.print(panel_group)
+
+
+def profile_summary(metrics: ETLMetrics, n: int = PROFILE_TOP) -> Table:
+    """
+    Show the slowest stages of the download, with the records and bytes they \
+        handled, and the process's peak memory use.
+
+    Examples:
+        >>> metrics = ETLMetrics()
+        >>> metrics.add("fetch", 2.0, table_name="Story", payload_bytes=2**20)
+        >>> metrics.add("validate", 1.0, table_name="Story", records=175)
+        >>> [row["stage"] for row in metrics.top()]
+        ['fetch', 'validate']
+        >>> profile_summary(metrics).row_count
+        2
+
+    Args:
+        metrics (ETLMetrics): Metrics of the download's stages.
+        n (int): Number of stages to show. Defaults to 10.
+
+    Returns:
+        Table: Table of the slowest stages.
+    """
+
+    rss = [row["peak_rss_bytes"] for row in metrics.rows if row["peak_rss_bytes"]]
+    caption = "Saved in the DuckDB database's _etl_metrics table."
+    if rss:
+        caption = f"Peak memory use: {max(rss) / 2**20:.0f} MiB. " + caption
+    table = Table(title="Slowest stages", caption=caption)
+    table.add_column("Table", style="red")
+    table.add_column("Stage")
+    table.add_column("Seconds", justify="right")
+    table.add_column("Records", justify="right")
+    table.add_column("MiB", justify="right")
+    for row in metrics.top(n):
+        records, size = row["records"], row["payload_bytes"]
+        table.add_row(
+            row["table_name"] or "",
+            row["stage"],
+            f"{row['seconds']:.3f}",
+            "" if records is None else str(records),
+            "" if size is None else f"{size / 2**20:.2f}",
+        )
+    return table
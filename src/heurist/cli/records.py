@@ -5,8 +5,11 @@ CLI command for downloading one requested record type's data.
 import json
 from pathlib import Path
 
+from heurist.api.cache import ResponseCache
 from heurist.api.connection import HeuristAPIConnection
+from heurist.api.constants import HUMA_NUM_SERVER
 from heurist.api.credentials import CredentialHandler
+from heurist.api.session import SessionStore
 from rich.progress import (
     Progress,
     SpinnerColumn,
@@ -19,6 +22,9 @@ def rty_command(
     credentials: CredentialHandler,
     rty: int,
     outfile: Path | str | None,
+    cache: ResponseCache | None = None,
+    session_store: SessionStore | None = None,
+    server: str = HUMA_NUM_SERVER,
 ):
     with (
         Progress(
@@ -30,6 +36,9 @@ def rty_command(
             db=credentials.get_database(),
             login=credentials.get_login(),
             password=credentials.get_password(),
+            cache=cache,
+            session_store=session_store,
+            server=server,
         ) as client,
     ):
         _ = p.add_task(f"Get Records of type {rty}", total=1)
@@ -2,7 +2,10 @@
 CLI command for downloading details about a Heurist database schema.
 """
 
+from heurist.api.cache import ResponseCache
+from heurist.api.constants import HUMA_NUM_SERVER
 from heurist.api.credentials import CredentialHandler
+from heurist.api.session import SessionStore
 from heurist.schema import export_schema
 
 
@@ -12,6 +15,9 @@ def schema_command(
     outdir: str,
     output_type: str,
     debugging: bool = False,
+    cache: ResponseCache | None = None,
+    session_store: SessionStore | None = None,
+    server: str = HUMA_NUM_SERVER,
 ):
     export_schema(
         db_name=credentials.get_database(),
@@ -20,5 +26,8 @@ def schema_command(
         outdir=outdir,
         debugging=debugging,
         output_type=output_type,
-        record_group=record_group
+        record_group=record_group,
+        cache=cache,
+        session_store=session_store,
+        server=server,
     )
@@ -1,8 +1,19 @@
+import hashlib
+from functools import cached_property
+from itertools import groupby
+
 import duckdb
 import polars as pl
+import pyarrow as pa
 from duckdb import DuckDBPyConnection, DuckDBPyRelation
 from heurist.models.structural.hml_structure import HMLStructure
-from heurist.sql import RECORD_TYPE_SCHEMA
+from heurist.models.structural.loader import load_structure_tables
+from heurist.sql import RECORD_TYPE_SCHEMA, RECORD_TYPES_SCHEMA
+from heurist.utils.constants import (
+    RECORD_TYPE_METADATA_TABLE,
+    STRUCTURE_SNAPSHOT_TABLE,
+    STRUCTURE_SNAPSHOT_VERSION,
+)
 from pydantic_xml import BaseXmlModel
 
 
@@ -27,6 +38,20 @@ class HeuristDatabase:
         Create a DuckDB database connection and populate the DuckDB database with the
         5 base tables that comprise the Heurist database structure.
 
+        The base tables are saved with a snapshot of the XML's hash. If the DuckDB \
+            database already has the base tables of an identical XML, i.e. from a \
+            previous download of an unchanged database structure, they are reused \
+            rather than parsed again.
+
+        Examples:
+            >>> from mock_data import DB_STRUCTURE_XML
+            >>> import duckdb
+            >>> conn = duckdb.connect()
+            >>> HeuristDatabase(DB_STRUCTURE_XML, conn=conn).from_snapshot
+            False
+            >>> HeuristDatabase(DB_STRUCTURE_XML, conn=conn).from_snapshot
+            True
+
         Args:
             hml_xml (bytes): Heurist database structure exported in XML format.
             conn (DuckDBPyConnection | None, optional): A DuckDB database connection. \
@@ -34,18 +59,99 @@ class HeuristDatabase:
             db (str, optional): Path to the DuckDB database. Defaults to ":memory:".
         """
 
-        hml_xml = self.trim_xml_bytes(xml=hml_xml)
+        self._hml_xml = hml_xml
         if not conn:
             conn = duckdb.connect(db)
         self.conn = conn
-        # Load the Heurist database structure XML into a nested Pydantic data model
-        self.hml = HMLStructure.from_xml(hml_xml)
+        self.structure_hash = self.hash_xml(xml=hml_xml)
+        self.create_snapshot_tables()
+        self.from_snapshot = self.has_snapshot()
+        if self.from_snapshot:
+            return
+
+        # Stream the Heurist database structure XML into the generic tables' columns
+        tables = load_structure_tables(xml=hml_xml)
+        for name, _ in self.BASE_TABLES:
+            self.create_from_arrow(name, tables[name])
+        self.save_snapshot()
 
-        # Create generic tables
-        for t in self.BASE_TABLES:
-            name = t[0]
-            pydantic_model = getattr(getattr(self.hml, t[1]), t[0])
-            self.create(name, pydantic_model)
+    @cached_property
+    def hml(self) -> HMLStructure:
+        """The Heurist database structure XML, loaded into a nested Pydantic data \
+            model when it's first used."""
+
+        return HMLStructure.from_xml(self.trim_xml_bytes(xml=self._hml_xml))
+
+    @classmethod
+    def hash_xml(cls, xml: bytes) -> str:
+        """
+        Hash the Heurist database structure XML, which identifies the version of \
+            the structure, including the modification dates of its tables' rows.
+
+        Args:
+            xml (bytes): Heurist database structure exported in XML format.
+
+        Returns:
+            str: Hexadecimal SHA-256 digest of the XML.
+        """
+
+        return hashlib.sha256(xml.strip()).hexdigest()
+
+    def create_snapshot_tables(self) -> None:
+        """Create, if they don't exist, the tables that store the snapshot of \
+            the database structure and the record types' metadata."""
+
+        self.conn.execute(
+            f"""
+CREATE TABLE IF NOT EXISTS {STRUCTURE_SNAPSHOT_TABLE} (
+    xml_hash VARCHAR,
+    version INTEGER,
+    created_at TIMESTAMP
+)
+"""
+        )
+        self.conn.execute(
+            f"""
+CREATE TABLE IF NOT EXISTS {RECORD_TYPE_METADATA_TABLE} (
+    rty_ID INTEGER PRIMARY KEY,
+    detail_metadata JSON
+)
+"""
+        )
+
+    def has_snapshot(self) -> bool:
+        """Check whether the DuckDB database has the base tables of the same \
+            database structure, saved by the same version of the snapshot format.
+
+        Returns:
+            bool: Whether the base tables can be reused.
+        """
+
+        row = self.conn.execute(
+            f"SELECT count(*) FROM {STRUCTURE_SNAPSHOT_TABLE} "
+            "WHERE xml_hash = ? AND version = ?",
+            [self.structure_hash, STRUCTURE_SNAPSHOT_VERSION],
+        ).fetchone()
+        if not row[0]:
+            return False
+        names = [name for name, _ in self.BASE_TABLES]
+        (n,) = self.conn.execute(
+            "SELECT count(*) FROM duckdb_tables() WHERE list_contains(?, table_name)",
+            [names],
+        ).fetchone()
+        return n == len(names)
+
+    def save_snapshot(self) -> None:
+        """Replace the snapshot with the current database structure's hash, and \
+            forget the record types' metadata of the previous structure."""
+
+        self.conn.execute(f"DELETE FROM {STRUCTURE_SNAPSHOT_TABLE}")
+        self.conn.execute(f"DELETE FROM {RECORD_TYPE_METADATA_TABLE}")
+        self.conn.execute(
+            f"INSERT INTO {STRUCTURE_SNAPSHOT_TABLE} "
+            "VALUES (?, ?, current_localtimestamp())",
+            [self.structure_hash, STRUCTURE_SNAPSHOT_VERSION],
+        )
 
     @classmethod
     def trim_xml_bytes(cls, xml: bytes) -> bytes:
@@ -109,6 +215,17 @@ WHERE table_name like '{table_name}'
         sql = "CREATE TABLE {} AS FROM df".format(name)
         self.conn.sql(sql)
 
+    def create_from_arrow(self, name: str, arrow_table: pa.Table) -> None:
+        """Create a table in the DuckDB database connection from an Arrow table.
+
+        Args:
+            name (str): Name of the table.
+            arrow_table (pa.Table): Arrow table.
+        """
+
+        self.delete_existing_table(name)
+        self.conn.sql("CREATE TABLE {} AS FROM arrow_table".format(name))
+
     def describe_record_schema(self, rty_ID: int) -> DuckDBPyRelation:
         """Join the tables 'dty' (detail), 'rst' (record structure), 'rty' (record type)
         to get all the relevant information for a specific record type, plus add the
@@ -123,3 +240,43 @@ WHERE table_name like '{table_name}'
         """
 
         return self.conn.from_query(query=RECORD_TYPE_SCHEMA, params=[rty_ID])
+
+    def describe_record_schemas(
+        self, rty_IDs: list[int]
+    ) -> dict[int, DuckDBPyRelation]:
+        """Describe several record types' schemas, like `describe_record_schema`, \
+            with one query whose results are then split by record type.
+
+        Examples:
+            >>> from mock_data import DB_STRUCTURE_XML
+            >>> db = HeuristDatabase(DB_STRUCTURE_XML)
+            >>> descriptions = db.describe_record_schemas([101, 103])
+            >>> list(descriptions)
+            [101, 103]
+            >>> descriptions[103].select("rty_Name").limit(1).fetchone()
+            ('story',)
+
+        Args:
+            rty_IDs (list[int]): IDs of the targeted record types.
+
+        Returns:
+            dict[int, DuckDBPyRelation]: A DuckDB Python relation for each record \
+                type, indexed by the record type's ID.
+        """
+
+        rel = self.conn.sql(query=RECORD_TYPES_SCHEMA, params=[rty_IDs])
+        # Depending on DuckDB's version, the relation is fetched as a table or as a
+        # stream of record batches
+        arrow_table = pa.table(rel.arrow())
+        # The rows are sorted by record type, so each record type's rows are a slice
+        slices = {}
+        offset = 0
+        for rty_ID, rows in groupby(arrow_table["rty_ID"].to_pylist()):
+            length = len(list(rows))
+            slices[rty_ID] = arrow_table.slice(offset, length)
+            offset += length
+        return {
+            rty_ID: self.conn.from_arrow(slices[rty_ID])
+            for rty_ID in rty_IDs
+            if rty_ID in slices
+        }
@@ -1,11 +1,42 @@
-import pandas as pd
-import warnings
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import chain
+from typing import Iterable, Iterator
+
+import duckdb
+import pyarrow as pa
 from duckdb import DuckDBPyConnection, DuckDBPyRelation
 from heurist.database.basedb import HeuristDatabase
 from heurist.models.dynamic import HeuristRecord
-from heurist.sql import RECORD_BY_GROUP_TYPE, RECORD_TYPE_METADATA
+from heurist.models.dynamic.arrow import (
+    dicts_to_arrow_table,
+    model_to_arrow_schema,
+)
+from heurist.sql import RECORD_BY_GROUP_TYPE, RECORD_TYPES_METADATA
+from heurist.utils.constants import (
+    DEFAULT_RECORD_GROUPS,
+    RECORD_TYPE_METADATA_TABLE,
+    SYNC_STATE_TABLE,
+)
+from heurist.utils.metrics import ETLMetrics
+from heurist.validators.parallel import (
+    CHUNK_SIZE,
+    needs_processes,
+    validate_in_processes,
+)
 from heurist.validators.record_validator import RecordValidator
-from heurist.utils.constants import DEFAULT_RECORD_GROUPS
+
+
+@dataclass
+class ValidatedRecords:
+    """A record type's validated records, ready to be loaded into its table."""
+
+    record_type_id: int
+    arrow_table: pa.Table
+    # Latest modification date among the records, i.e. the table's high-water mark
+    last_modified: str | None = None
 
 
 class TransformedDatabase(HeuristDatabase):
@@ -21,8 +52,7 @@ class TransformedDatabase(HeuristDatabase):
         record_type_groups: tuple = DEFAULT_RECORD_GROUPS,
     ) -> None:
         super().__init__(hml_xml, conn, db)
-
-        self.conn.execute("SET GLOBAL pandas_analyze_sample=100000")
+        self.create_sync_state_table()
 
         # Create an empty index of targeted record types' Pydantic models
         self.pydantic_models = {}
@@ -36,72 +66,402 @@ class TransformedDatabase(HeuristDatabase):
                 condition += " OR rtg.rtg_Name like '{}'".format(rtg)
         query = RECORD_BY_GROUP_TYPE + condition
 
+        # Select the ID and name of each targeted record type, and the metadata of
+        # all their data fields (details) at once
+        record_types = self.conn.sql(query).fetchall()
+        rty_IDs = [rty_ID for rty_ID, _ in record_types]
+        detail_metadata = self.get_detail_metadata(rty_IDs=rty_IDs)
+
         # Iterate through each targeted record type's ID and name
-        for rty_ID, rty_Name in self.conn.sql(query).fetchall():
-            # Using the ID, select the metadata of a record type's data fields (details)
-            rel = self.conn.sql(query=RECORD_TYPE_METADATA, params=[rty_ID])
-            # Using this metadata, create a dynamic Pydantic model for the record type
-            data_field_metadata = rel.pl().to_dicts()
+        for rty_ID, rty_Name in record_types:
+            # Using the metadata of its details, create a dynamic Pydantic model for
+            # the record type
             model = HeuristRecord(
                 rty_ID=rty_ID,
                 rty_Name=rty_Name,
-                detail_metadata=data_field_metadata,
+                detail_metadata=detail_metadata[rty_ID],
             )
             # Add the dynamic Pydantic model to the index of models
             self.pydantic_models.update({rty_ID: model})
 
+    def get_detail_metadata(self, rty_IDs: list[int]) -> dict[int, list[dict]]:
+        """
+        Get the metadata of several record types' details from the structure's \
+            snapshot. The metadata of the record types that aren't in the snapshot \
+            is selected from the base tables in one query, grouped by record type, \
+            and added to the snapshot.
+
+        Examples:
+            >>> from mock_data import DB_STRUCTURE_XML
+            >>> db = TransformedDatabase(DB_STRUCTURE_XML)
+            >>> db.get_detail_metadata([103])[103][0]
+            {'dty_ID': 1244, 'rst_DisplayName': 'preferred_name', \
+'dty_Type': 'freetext', 'rst_MaxValues': 1}
+
+        Args:
+            rty_IDs (list[int]): IDs of the record types.
+
+        Returns:
+            dict[int, list[dict]]: Metadata of each of the record types' details, \
+                indexed by the record type's ID.
+        """
+
+        rows = self.conn.execute(
+            f"SELECT rty_ID, detail_metadata FROM {RECORD_TYPE_METADATA_TABLE} "
+            "WHERE list_contains(?, rty_ID)",
+            [rty_IDs],
+        ).fetchall()
+        metadata = {rty_ID: json.loads(details) for rty_ID, details in rows}
+        missing = [rty_ID for rty_ID in rty_IDs if rty_ID not in metadata]
+        if not missing:
+            return metadata
+
+        selected = {rty_ID: [] for rty_ID in missing}
+        rel = self.conn.execute(RECORD_TYPES_METADATA, [missing])
+        columns = [d[0] for d in rel.description][1:]
+        for rty_ID, *values in rel.fetchall():
+            selected[rty_ID].append(dict(zip(columns, values)))
+        self.conn.executemany(
+            f"INSERT INTO {RECORD_TYPE_METADATA_TABLE} VALUES (?, ?)",
+            [[rty_ID, json.dumps(details)] for rty_ID, details in selected.items()],
+        )
+        return metadata | selected
+
+    def create_sync_state_table(self) -> None:
+        """Create, if it doesn't exist, the table that records when each record \
+            type's table was last synchronised with the Heurist server."""
+
+        self.conn.execute(
+            f"""
+CREATE TABLE IF NOT EXISTS {SYNC_STATE_TABLE} (
+    rty_ID INTEGER PRIMARY KEY,
+    table_name VARCHAR,
+    users VARCHAR,
+    last_modified VARCHAR,
+    synced_at TIMESTAMP
+)
+"""
+        )
+
+    @classmethod
+    def _users_key(cls, users: tuple) -> str:
+        return ",".join(str(u) for u in sorted(users))
+
+    def get_last_modified(self, record_type_id: int, users: tuple = ()) -> str | None:
+        """
+        Get the high-water mark of a record type's table, meaning the latest \
+            modification date of the records that were loaded into it.
+
+        The high-water mark is only returned if the table can be updated in place: \
+            it must still exist, it must have been loaded for the same users, and \
+            its columns must match the record type's current data model.
+
+        Examples:
+            >>> from mock_data import DB_STRUCTURE_XML, RECORD_JSON
+            >>> db = TransformedDatabase(DB_STRUCTURE_XML)
+            >>> records = RECORD_JSON["heurist"]["records"]
+            >>> db.get_last_modified(103) is None
+            True
+            >>> _ = db.insert_records(record_type_id=103, records=records)
+            >>> db.get_last_modified(103) == max(r["rec_Modified"] for r in records)
+            True
+            >>> db.get_last_modified(103, users=(2,)) is None
+            True
+
+        Args:
+            record_type_id (int): Heurist ID of the record type.
+            users (tuple): IDs of the users whose records were loaded.
+
+        Returns:
+            str | None: Latest modification date of the loaded records.
+        """
+
+        row = self.conn.execute(
+            f"SELECT table_name, last_modified FROM {SYNC_STATE_TABLE} "
+            "WHERE rty_ID = ? AND users = ?",
+            [record_type_id, self._users_key(users)],
+        ).fetchone()
+        if not row:
+            return
+        table_name, last_modified = row
+
+        record_type = self.pydantic_models[record_type_id]
+        if table_name != record_type.table_name:
+            return
+        try:
+            columns = self.conn.table(table_name).columns
+        except duckdb.CatalogException:
+            return
+        expected_columns = [
+            f.serialization_alias for f in record_type.model.model_fields.values()
+        ]
+        if columns != expected_columns:
+            return
+        return last_modified
+
+    def set_last_modified(
+        self, record_type_id: int, last_modified: str, users: tuple = ()
+    ) -> None:
+        """Record the high-water mark of a record type's table.
+
+        Args:
+            record_type_id (int): Heurist ID of the record type.
+            last_modified (str): Latest modification date of the loaded records.
+            users (tuple): IDs of the users whose records were loaded.
+        """
+
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO {SYNC_STATE_TABLE} "
+            "VALUES (?, ?, ?, ?, current_localtimestamp())",
+            [
+                record_type_id,
+                self.pydantic_models[record_type_id].table_name,
+                self._users_key(users),
+                last_modified,
+            ],
+        )
+
     def insert_records(
-        self, record_type_id: int, records: list[dict]
+        self,
+        record_type_id: int,
+        records: Iterable[dict],
+        users: tuple = (),
+        upsert: bool = False,
+        processes: int = 1,
+        chunk_size: int = CHUNK_SIZE,
+        metrics: ETLMetrics | None = None,
     ) -> DuckDBPyRelation | None:
+        """Validate a record type's records and load them into a new table.
+
+        In upsert mode, the records are instead merged into the record type's \
+            existing table: any existing row with the same H-ID is replaced.
+
+        Either way, the latest modification date of the loaded records is \
+            recorded as the table's high-water mark.
+
+        Args:
+            record_type_id (int): Heurist ID of the record type.
+            records (Iterable[dict]): The record type's records, either in a list \
+                or streamed by a generator.
+            users (tuple): IDs of the users whose records were requested.
+            upsert (bool): Whether to merge the records into the existing table. \
+                Defaults to False.
+            processes (int): Number of worker processes in which to validate the \
+                records. Defaults to 1, meaning the records are validated in the \
+                calling process.
+            chunk_size (int): Number of records sent to a worker process at \
+                once. Defaults to 5000.
+            metrics (ETLMetrics | None): If given, collects the time spent in \
+                each stage of the record type's loading. Defaults to None.
+
+        Returns:
+            DuckDBPyRelation | None: The record type's table, if it has records.
+        """
+
+        validated = self.validate_records(
+            record_type_id=record_type_id,
+            records=records,
+            processes=processes,
+            chunk_size=chunk_size,
+            metrics=metrics,
+        )
+        return self.load_records(
+            validated=validated, users=users, upsert=upsert, metrics=metrics
+        )
+
+    def validate_records(
+        self,
+        record_type_id: int,
+        records: Iterable[dict],
+        processes: int = 1,
+        chunk_size: int = CHUNK_SIZE,
+        pool: ProcessPoolExecutor | None = None,
+        metrics: ETLMetrics | None = None,
+        fetch_counts: dict | None = None,
+    ) -> ValidatedRecords:
+        """Validate a record type's records into an Arrow table.
+
+        The DuckDB database isn't used, so the records can be validated in \
+            another thread than the one loading them with `load_records`.
+
+        If the record type has fewer records than would fill a chunk for each \
+            worker process, they are validated in the calling process, because \
+            it's faster than sending them to the workers.
+
+        Args:
+            record_type_id (int): Heurist ID of the record type.
+            records (Iterable[dict]): The record type's records, either in a list \
+                or streamed by a generator.
+            processes (int): Number of worker processes in which to validate the \
+                records. Defaults to 1, meaning the records are validated in the \
+                calling process.
+            chunk_size (int): Number of records sent to a worker process at \
+                once. Defaults to 5000.
+            pool (ProcessPoolExecutor | None): Pool of worker processes shared \
+                by the record types, from `create_process_pool`. Defaults to \
+                None, a pool started for this record type if it needs one.
+            metrics (ETLMetrics | None): If given, collects the time spent in \
+                each stage of the validation. Defaults to None.
+            fetch_counts (dict | None): Timings that the records' source fills \
+                in while the records are read, i.e. the "json decode" seconds \
+                and "payload_bytes" of records streamed by the API client. \
+                Defaults to None.
+
+        Returns:
+            ValidatedRecords: The validated records.
+        """
+
         # From the index of Pydantic models, get this record type's
         # dynamically-created Pydantic model.
         dynamic_model = self.pydantic_models[record_type_id].model
         table_name = self.pydantic_models[record_type_id].table_name
+        if metrics is None:
+            metrics = ETLMetrics()
+        labels = dict(rty_ID=record_type_id, table_name=table_name)
+        # Seconds spent in the stages that run while the Arrow table is being built
+        timings = {}
 
-        # Prepare a list in which to store dictionaries of the validated record data.
-        model_dict_sequence = []
+        # Keep track of the latest modification date among the records.
+        modified_dates = []
 
-        # Using the dynamically-created Pyandtic model, validate the metadata of
-        # all the records of this type.
-        validator = RecordValidator(
-            pydantic_model=dynamic_model,
-            records=records,
-            rty_ID=record_type_id,
+        def track_modified_dates(records: Iterable[dict]) -> Iterator[dict]:
+            for record in records:
+                if record.get("rec_Modified"):
+                    modified_dates.append(record["rec_Modified"])
+                yield record
+
+        # Time the wait for each record, which is the download's and the
+        # decoding's time if the records are streamed from the server.
+        records = metrics.timed_iter(records, "fetch", counts=fetch_counts, **labels)
+
+        def waited() -> float:
+            return metrics.seconds("fetch", rty_ID=record_type_id) + metrics.seconds(
+                "json decode", rty_ID=record_type_id
+            )
+
+        fetched = waited()
+        start = time.perf_counter()
+        parallel = False
+        if processes > 1:
+            parallel, records = needs_processes(
+                records, processes=processes, chunk_size=chunk_size
+            )
+        if parallel:
+            # Validate chunks of the records in a pool of worker processes.
+            arrow_table = validate_in_processes(
+                record_type=self.pydantic_models[record_type_id],
+                records=track_modified_dates(records),
+                processes=processes,
+                chunk_size=chunk_size,
+                pool=pool,
+            )
+        else:
+            # Using the dynamically-created Pyandtic model, validate the metadata of
+            # all the records of this type, in batches, and dump each validated
+            # record to a dictionary.
+            validator = RecordValidator(
+                pydantic_model=dynamic_model,
+                records=track_modified_dates(records),
+                rty_ID=record_type_id,
+            )
+            model_dicts = chain.from_iterable(validator.iter_batches(timings=timings))
+
+            # Transpose the dictionaries into an Arrow table, whose columns' types
+            # are derived from the Pydantic model rather than inferred from the data.
+            schema = model_to_arrow_schema(dynamic_model)
+            arrow_table = dicts_to_arrow_table(rows=model_dicts, schema=schema)
+
+        # Leave out the wait for the records, which is the fetch's time
+        elapsed = time.perf_counter() - start
+        elapsed -= waited() - fetched
+        if parallel:
+            # The worker processes flatten, validate, and convert the records
+            # together, so their time is only measured as a whole.
+            timings["validate"] = elapsed
+        else:
+            # The records are flattened and validated while the Arrow table is
+            # built, so the building's own time is what remains of the total.
+            timings["dataframe build"] = (
+                elapsed - timings["flatten"] - timings["validate"]
+            )
+        for stage, seconds in timings.items():
+            metrics.add(stage, seconds, records=arrow_table.num_rows, **labels)
+
+        return ValidatedRecords(
+            record_type_id=record_type_id,
+            arrow_table=arrow_table,
+            last_modified=max(modified_dates) if modified_dates else None,
         )
-        for model in validator:
-            # Dump the validated record's data model to a dictionary.
-            model_dict = model.model_dump(by_alias=True)
-            # Add the dictionary representation of the validated data to the sequence.
-            model_dict_sequence.append(model_dict)
-
-        # If no records of this type have been created yet, skip it.
-        if len(model_dict_sequence) == 0:
+
+    def load_records(
+        self,
+        validated: ValidatedRecords,
+        users: tuple = (),
+        upsert: bool = False,
+        metrics: ETLMetrics | None = None,
+    ) -> DuckDBPyRelation | None:
+        """Load a record type's validated records into a new table, or in upsert \
+            mode merge them into the existing table, and record the table's new \
+            high-water mark.
+
+        Args:
+            validated (ValidatedRecords): The validated records.
+            users (tuple): IDs of the users whose records were requested.
+            upsert (bool): Whether to merge the records into the existing table. \
+                Defaults to False.
+            metrics (ETLMetrics | None): If given, collects the time spent in \
+                creating the table. Defaults to None.
+
+        Returns:
+            DuckDBPyRelation | None: The record type's table, if it has records.
+        """
+
+        record_type_id = validated.record_type_id
+        record_type = self.pydantic_models[record_type_id]
+        table_name = record_type.table_name
+        arrow_table = validated.arrow_table
+        if metrics is None:
+            metrics = ETLMetrics()
+        labels = dict(rty_ID=record_type_id, table_name=table_name)
+
+        # If no records of this type have been created (or modified) yet, skip it.
+        if arrow_table.num_rows == 0 and upsert:
+            return self.conn.table(table_name=table_name)
+        elif arrow_table.num_rows == 0:
             return
 
-        # Transform the sequence of dictionaries into a Pandas dataframe
-        try:
-            df = pd.DataFrame(model_dict_sequence)
-            with warnings.catch_warnings():
-                warnings.filterwarnings(
-                    "ignore",
-                    message="invalid value encountered in cast",
-                    category=RuntimeWarning,
-                )
-                df = df.convert_dtypes(dtype_backend="numpy_nullable")
-            assert df.shape[1] > 0
-        except Exception as e:
-            from pprint import pprint
-
-            pprint(model_dict_sequence)
-            print(df)
-            print(records)
-            print(table_name)
-            raise e
-
-        # Delete any existing table for this record type.
-        self.delete_existing_table(table_name=table_name)
-
-        # From the dataframe, build a new table for the record type.
-        sql = f"""CREATE TABLE {table_name} AS FROM df"""
-        self.conn.sql(sql)
+        with metrics.stage("table create", **labels) as counts:
+            counts["records"] = arrow_table.num_rows
+            if upsert:
+                # Replace the existing rows of the modified records in one
+                # transaction, so that the old rows are kept if the insert fails.
+                self.conn.begin()
+                try:
+                    self.conn.sql(
+                        f"""DELETE FROM {table_name}
+                        WHERE "H-ID" IN (SELECT "H-ID" FROM arrow_table)"""
+                    )
+                    self.conn.sql(
+                        f"""INSERT INTO {table_name} BY NAME FROM arrow_table"""
+                    )
+                except BaseException:
+                    self.conn.rollback()
+                    raise
+                self.conn.commit()
+            else:
+                # Delete any existing table for this record type.
+                self.delete_existing_table(table_name=table_name)
+
+                # Create the record type's table with the data types of its model,
+                # then bulk-insert the Arrow table into that fixed schema.
+                self.conn.execute(record_type.create_table_statement)
+                self.conn.sql(f"""INSERT INTO {table_name} BY NAME FROM arrow_table""")
+
+        # Record the table's new high-water mark, once its records are committed.
+        if validated.last_modified:
+            self.set_last_modified(
+                record_type_id=record_type_id,
+                last_modified=validated.last_modified,
+                users=users,
+            )
         return self.conn.table(table_name=table_name)
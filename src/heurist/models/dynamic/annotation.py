@@ -88,6 +88,29 @@ class PydanticField:
             pydantic_type=pydantic_type,
         )
 
+    def build_sql_columns(self) -> list[tuple[str, str]]:
+        """
+        Build the SQL column definitions of the detail, in the same order as the \
+            Pydantic fields. A repeatable detail's columns are SQL lists.
+
+        Examples:
+            >>> field = PydanticField(1, "Status", "enum", 0)
+            >>> field.build_sql_columns()
+            [('Status', 'VARCHAR[]'), ('Status TRM-ID', 'INTEGER[]')]
+
+        Returns:
+            list[tuple[str, str]]: Name and SQL data type of each column.
+        """
+
+        columns = [
+            (self.serlialization_alias, FieldType.to_sql(datatype=self.dty_Type))
+        ]
+        if self.dty_Type == FieldType.dropdown:
+            columns.append((self.serlialization_alias + " TRM-ID", "INTEGER"))
+        if self._is_type_repeatable():
+            columns = [(name, f"{sql_type}[]") for name, sql_type in columns]
+        return columns
+
     def _is_type_repeatable(self) -> bool:
         """
         Heurist uses the code 0 to indicate that a record's detail (field) \
@@ -0,0 +1,179 @@
+"""Functions to convert a dynamic Pydantic model's fields into an Arrow schema."""
+
+import types
+from datetime import datetime
+from typing import Annotated, Any, Iterable, Union, get_args, get_origin
+
+import pyarrow as pa
+from heurist.models.dynamic.date import TemporalObject
+from pydantic import BaseModel
+
+# The Arrow types match the SQL types of FieldType.to_sql, so that DuckDB can
+# insert the Arrow table into the record type's table without casting it.
+PYTHON_TO_ARROW = {
+    str: pa.string(),
+    int: pa.int32(),
+    float: pa.float64(),
+    bool: pa.bool_(),
+    datetime: pa.timestamp("us"),
+}
+
+# The SQL types of the nested models' fields are derived from their Arrow types
+ARROW_TO_SQL = {
+    pa.string(): "VARCHAR",
+    pa.int32(): "INTEGER",
+    pa.float64(): "DOUBLE",
+    pa.bool_(): "BOOLEAN",
+    pa.timestamp("us"): "TIMESTAMP",
+}
+
+
+def model_to_arrow_struct(model: type[BaseModel]) -> pa.StructType:
+    """
+    Convert a (nested) Pydantic model into an Arrow struct whose fields are named \
+        after the model's serialization aliases.
+
+    Examples:
+        >>> from heurist.models.dynamic import HistoricalDate
+        >>> model_to_arrow_struct(HistoricalDate)
+        StructType(struct<year: int32, month: int32, day: int32, iso: string>)
+
+    Args:
+        model (type[BaseModel]): Pydantic model.
+
+    Returns:
+        pa.StructType: Arrow struct type.
+    """
+
+    fields = []
+    for name, field in model.model_fields.items():
+        alias = field.serialization_alias or field.alias or name
+        fields.append(pa.field(alias, annotation_to_arrow(field.annotation)))
+    for name, field in model.model_computed_fields.items():
+        fields.append(pa.field(name, annotation_to_arrow(field.return_type)))
+    return pa.struct(fields)
+
+
+def annotation_to_arrow(annotation: Any) -> pa.DataType:
+    """Convert a Python type annotation into an Arrow data type.
+
+    In the dynamic Pydantic models, a field annotated as a `dict` holds the dumped \
+        `TemporalObject` of a Heurist date.
+
+    Examples:
+        >>> from typing import Optional
+        >>> annotation_to_arrow(Optional[int])
+        DataType(int32)
+        >>> annotation_to_arrow(list[Optional[str]])
+        ListType(list<item: string>)
+        >>> annotation_to_arrow(dict).field("start").type.field("earliest").type
+        StructType(struct<year: int32, month: int32, day: int32, iso: string>)
+
+    Args:
+        annotation (Any): Type annotation of a Pydantic field.
+
+    Returns:
+        pa.DataType: Arrow data type.
+    """
+
+    origin = get_origin(annotation)
+    # Unwrap an annotated type, i.e. Annotated[HistoricalDate, BeforeValidator(...)]
+    if origin is Annotated:
+        return annotation_to_arrow(get_args(annotation)[0])
+    # Unwrap an optional type, i.e. Optional[str]
+    elif origin is Union or origin is types.UnionType:
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        return annotation_to_arrow(args[0])
+    elif origin is list:
+        (item,) = get_args(annotation)
+        return pa.list_(annotation_to_arrow(item))
+    elif annotation is dict:
+        return model_to_arrow_struct(TemporalObject)
+    elif isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return model_to_arrow_struct(annotation)
+    else:
+        return PYTHON_TO_ARROW.get(annotation, pa.string())
+
+
+def arrow_to_sql(data_type: pa.DataType) -> str:
+    """Convert an Arrow data type into a DuckDB SQL data type.
+
+    Examples:
+        >>> arrow_to_sql(pa.list_(pa.int32()))
+        'INTEGER[]'
+        >>> arrow_to_sql(pa.struct([("iso", pa.string()), ("circa", pa.bool_())]))
+        'STRUCT("iso" VARCHAR, "circa" BOOLEAN)'
+
+    Args:
+        data_type (pa.DataType): Arrow data type.
+
+    Returns:
+        str: SQL data type.
+    """
+
+    if pa.types.is_struct(data_type):
+        members = [f'"{field.name}" {arrow_to_sql(field.type)}' for field in data_type]
+        return "STRUCT({})".format(", ".join(members))
+    elif pa.types.is_list(data_type):
+        return "{}[]".format(arrow_to_sql(data_type.value_type))
+    else:
+        return ARROW_TO_SQL.get(data_type, "VARCHAR")
+
+
+def model_to_arrow_schema(model: type[BaseModel]) -> pa.Schema:
+    """
+    Build the Arrow schema of a record type's table from the fields of its dynamic \
+        Pydantic model.
+
+    Examples:
+        >>> from heurist.models.dynamic import HeuristRecord
+        >>> d1 = {'dty_ID': 1,
+        ... 'rst_DisplayName': 'status',
+        ... 'dty_Type': 'enum',
+        ... 'rst_MaxValues': 0}
+        >>> hr = HeuristRecord(rty_Name="test", rty_ID=1, detail_metadata=[d1])
+        >>> model_to_arrow_schema(hr.model)
+        H-ID: int32
+        type_id: int32
+        status: list<item: string>
+          child 0, item: string
+        status TRM-ID: list<item: int32>
+          child 0, item: int32
+
+    Args:
+        model (type[BaseModel]): Dynamic Pydantic model of a record type.
+
+    Returns:
+        pa.Schema: Arrow schema of the record type's table.
+    """
+
+    return pa.schema(model_to_arrow_struct(model))
+
+
+def dicts_to_arrow_table(rows: Iterable[dict], schema: pa.Schema) -> pa.Table:
+    """
+    Transpose a sequence of dumped records into one list per column and convert \
+        each column into an Arrow array of the schema's type.
+
+    Examples:
+        >>> schema = pa.schema([("H-ID", pa.int32()), ("name", pa.string())])
+        >>> rows = ({"H-ID": i, "name": f"n{i}"} for i in range(3))
+        >>> dicts_to_arrow_table(rows, schema).to_pydict()
+        {'H-ID': [0, 1, 2], 'name': ['n0', 'n1', 'n2']}
+
+    Args:
+        rows (Iterable[dict]): Records dumped by their serialization aliases.
+        schema (pa.Schema): Arrow schema of the table.
+
+    Returns:
+        pa.Table: Arrow table.
+    """
+
+    columns = {name: [] for name in schema.names}
+    for row in rows:
+        for name, column in columns.items():
+            column.append(row.get(name))
+    arrays = []
+    for field in schema:
+        arrays.append(pa.array(columns.pop(field.name), type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
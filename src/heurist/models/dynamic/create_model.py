@@ -7,13 +7,48 @@ from pydantic import create_model as pydantic_create_model
 class HeuristRecord:
     def __init__(self, rty_Name: str, rty_ID: int, detail_metadata: list[dict]):
         self.rty_ID = rty_ID
+        self.rty_Name = rty_Name
         # Create an SQL-safe name to give the model when it's serialized to a table
         self.table_name = SafeSQLName().safe_table_name(record_name=rty_Name)
+        self.detail_metadata = detail_metadata
         # Create the Pydantic model
         self.model = create_record_type_model(
             model_name=self.table_name, detail_metadata=detail_metadata
         )
 
+    @property
+    def create_table_statement(self) -> str:
+        """
+        Build the SQL statement that creates the record type's table, with an \
+            explicit data type for each of the Pydantic model's fields.
+
+        Examples:
+            >>> d1 = {'dty_ID': 1,
+            ... 'rst_DisplayName': 'status',
+            ... 'dty_Type': 'enum',
+            ... 'rst_MaxValues': 0}
+            >>> hr = HeuristRecord(rty_Name="test", rty_ID=1, detail_metadata=[d1])
+            >>> print(hr.create_table_statement)
+            CREATE TABLE Test (
+                "H-ID" INTEGER,
+                "type_id" INTEGER,
+                "status" VARCHAR[],
+                "status TRM-ID" INTEGER[]
+            )
+
+        Returns:
+            str: SQL statement.
+        """
+
+        columns = [("H-ID", "INTEGER"), ("type_id", "INTEGER")]
+        for detail in self.detail_metadata:
+            columns.extend(PydanticField(**detail).build_sql_columns())
+        definitions = ",\n".join(
+            '    "{}" {}'.format(name.replace('"', '""'), sql_type)
+            for name, sql_type in columns
+        )
+        return f"CREATE TABLE {self.table_name} (\n{definitions}\n)"
+
 
 def create_record_type_model(model_name: str, detail_metadata: list[dict]) -> BaseModel:
     """
@@ -1,8 +1,8 @@
 from typing import Annotated, Optional
 
+from heurist.models.dynamic import HistoricalDate
 from heurist.validators import parse_heurist_date
 from pydantic import BaseModel, BeforeValidator, Field
-from heurist.models.dynamic import HistoricalDate
 
 PROFILE_MAP = {"0": "flat", "1": "central", "2": "slowStart", "3": "slowFinish"}
 DETERMINATION_MAP = {
@@ -58,4 +58,102 @@ class TemporalObject(BaseModel):
     )
     timestamp: Optional[Timestamp] = Field(default_factory=Timestamp)
     estMinDate: Optional[HeuristDate] = Field(default=None)
-    estMaxDate: Optional[HeuristDate] = Field(default=None)
\ No newline at end of file
+    estMaxDate: Optional[HeuristDate] = Field(default=None)
+
+
+class _RequiresModel(Exception):
+    """The raw temporal object must be validated by the Pydantic model."""
+
+
+def _dump_date(value) -> dict | None:
+    if value is None:
+        return None
+    date = parse_heurist_date(value)
+    return {"year": date.year, "month": date.month, "day": date.day, "iso": date.iso}
+
+
+def _dump_code(value, mapping: dict) -> str | None:
+    if value is None:
+        return None
+    label = mapping.get(value)
+    if not label:
+        raise _RequiresModel()
+    return label
+
+
+def _dump_string(value) -> str | None:
+    if value is not None and not isinstance(value, str):
+        raise _RequiresModel()
+    return value
+
+
+def _dump_date_limit(raw) -> dict | None:
+    if raw is None:
+        return None
+    if not isinstance(raw, dict):
+        raise _RequiresModel()
+    return {
+        "earliest": _dump_date(raw.get("earliest")),
+        "latest": _dump_date(raw.get("latest")),
+        "estProfile": _dump_code(raw.get("profile"), PROFILE_MAP),
+        "estDetermination": _dump_code(raw.get("determination"), DETERMINATION_MAP),
+    }
+
+
+def _dump_timestamp(raw) -> dict | None:
+    if raw is None:
+        return None
+    if not isinstance(raw, dict):
+        raise _RequiresModel()
+    circa = raw.get("circa", False)
+    if circa is not None and not isinstance(circa, bool):
+        raise _RequiresModel()
+    return {
+        "in": _dump_date(raw.get("in")),
+        "type": _dump_string(raw.get("type")),
+        "circa": circa,
+    }
+
+
+def dump_temporal_object(raw: dict) -> dict:
+    """
+    Convert a Heurist temporal object to the same dictionary as \
+        `TemporalObject.model_validate(raw).model_dump(by_alias=True)`, without \
+        building the nested Pydantic models.
+
+    Values that the plain conversion doesn't handle, such as an unknown profile \
+        code or a comment that isn't a string, are passed to the Pydantic model, \
+        which converts them or raises its validation error.
+
+    Examples:
+        >>> raw = {"start": {"earliest": "1180", "profile": "1"}, "estMinDate": 1180}
+        >>> d = dump_temporal_object(raw)
+        >>> d == TemporalObject.model_validate(raw).model_dump(by_alias=True)
+        True
+        >>> d["start"]
+        {'earliest': {'year': 1180, 'month': None, 'day': None, 'iso': '1180-01-01'}, \
+'latest': None, 'estProfile': 'central', 'estDetermination': None}
+
+    Args:
+        raw (dict): Heurist temporal object.
+
+    Returns:
+        dict: Structured metadata for a Heurist date object.
+    """
+
+    try:
+        if not isinstance(raw, dict):
+            raise _RequiresModel()
+        return {
+            "comment": _dump_string(raw.get("comment")),
+            "value": _dump_date(raw.get("value")),
+            "start": _dump_date_limit(raw.get("start", {})),
+            "end": _dump_date_limit(raw.get("end", {})),
+            "estDetermination": _dump_code(raw.get("determination"), DETERMINATION_MAP),
+            "estProfile": _dump_code(raw.get("profile"), PROFILE_MAP),
+            "timestamp": _dump_timestamp(raw.get("timestamp", {})),
+            "estMinDate": _dump_date(raw.get("estMinDate")),
+            "estMaxDate": _dump_date(raw.get("estMaxDate")),
+        }
+    except (_RequiresModel, ValueError, TypeError):
+        return TemporalObject.model_validate(raw).model_dump(by_alias=True)
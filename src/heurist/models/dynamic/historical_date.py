@@ -1,13 +1,18 @@
-from pydantic import BaseModel, computed_field
+from functools import cached_property
+
+from pydantic import BaseModel, ConfigDict, computed_field
 
 
 class HistoricalDate(BaseModel):
+    # Parsed dates are cached and shared between records, so they can't be changed.
+    model_config = ConfigDict(frozen=True)
+
     year: int
     month: int | None = None
     day: int | None = None
 
     @computed_field
-    @property
+    @cached_property
     def iso(self) -> str:
         month = self.month or 1
         day = self.day or 1
@@ -20,4 +25,4 @@ class HistoricalDate(BaseModel):
         return f"{year_str}-{month:02d}-{day:02d}"
 
     def __str__(self) -> str:
-        return self.iso
\ No newline at end of file
+        return self.iso
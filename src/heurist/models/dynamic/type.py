@@ -3,6 +3,8 @@
 from dataclasses import dataclass
 from typing import Any, Optional
 
+from pydantic import BaseModel
+
 
 @dataclass
 class FieldType:
@@ -23,6 +25,12 @@ class FieldType:
         """
         Convert a Heurist data type label (i.e. "enum") to an SQL equivalent.
 
+        Examples:
+            >>> FieldType.to_sql("resource")
+            'INTEGER'
+            >>> FieldType.to_sql("date")[:57]
+            'STRUCT("comment" VARCHAR, "value" STRUCT("year" INTEGER, '
+
         Args:
             datatype (str): Heurist data type.
 
@@ -31,9 +39,11 @@ class FieldType:
         """
 
         if datatype == cls.numeric:
-            return "FLOAT"
+            return "DOUBLE"
         elif datatype == cls.date_time:
-            return "DATE[2]"
+            from heurist.models.dynamic.date import TemporalObject
+
+            return cls.to_sql_struct(TemporalObject)
         elif datatype == cls.record_pointer or datatype == cls.relationship_marker:
             return "INTEGER"
         elif datatype == cls.dropdown:
@@ -41,6 +51,33 @@ class FieldType:
         else:
             return "TEXT"
 
+    @classmethod
+    def to_sql_struct(cls, model: type[BaseModel]) -> str:
+        """
+        Convert a (nested) Pydantic model, such as the `TemporalObject` of a date, \
+            to an SQL STRUCT whose fields are named after the model's serialization \
+            aliases. The STRUCT is derived from the model's Arrow struct, so that \
+            it matches the Arrow table inserted into it.
+
+        Examples:
+            >>> from heurist.models.dynamic import HistoricalDate
+            >>> FieldType.to_sql_struct(HistoricalDate)
+            'STRUCT("year" INTEGER, "month" INTEGER, "day" INTEGER, "iso" VARCHAR)'
+
+        Args:
+            model (type[BaseModel]): Pydantic model.
+
+        Returns:
+            str: SQL data type.
+        """
+
+        from heurist.models.dynamic.arrow import (
+            arrow_to_sql,
+            model_to_arrow_struct,
+        )
+
+        return arrow_to_sql(model_to_arrow_struct(model))
+
     @classmethod
     def from_detail(cls, detail: dict) -> str:
         """Extract the field type from a record's detail.
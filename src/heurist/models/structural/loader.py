@@ -0,0 +1,150 @@
+"""Streaming loader of the Heurist database structure's tables."""
+
+import io
+import types
+from datetime import datetime
+from typing import Any, Callable, Literal, Union, get_args, get_origin
+
+import pyarrow as pa
+from heurist.models.structural.dty import DTY
+from heurist.models.structural.rst import RST
+from heurist.models.structural.rtg import RTG
+from heurist.models.structural.rty import RTY
+from heurist.models.structural.trm import TRM
+from heurist.models.structural.utils import split_ids
+from lxml import etree
+from pydantic_xml import BaseXmlModel
+
+# Models of the rows of the 5 base tables, indexed by the rows' XML tag
+STRUCTURAL_MODELS = {"rtg": RTG, "rst": RST, "rty": RTY, "dty": DTY, "trm": TRM}
+
+# The string values that Pydantic accepts for a boolean
+BOOLEANS = {
+    "0": False,
+    "off": False,
+    "f": False,
+    "false": False,
+    "n": False,
+    "no": False,
+    "1": True,
+    "on": True,
+    "t": True,
+    "true": True,
+    "y": True,
+    "yes": True,
+}
+
+
+def to_bool(text: str) -> bool:
+    return BOOLEANS[text.strip().lower()]
+
+
+def to_ids(text: str) -> list[int]:
+    return split_ids(input=text)
+
+
+def unwrap_optional(annotation: Any) -> Any:
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+class Column:
+    """
+    Coerce the text of one of a structural model's XML elements like the model \
+        would, and collect the values in a column.
+    """
+
+    def __init__(self, name: str, model: type[BaseXmlModel]) -> None:
+        field = model.model_fields[name]
+        self.name = name
+        self.required = field.is_required()
+        self.default = None if self.required else field.get_default()
+        annotation = unwrap_optional(field.annotation)
+        self.choices = None
+        self.convert: Callable[[str], Any]
+        if get_origin(annotation) is Literal:
+            self.choices = set(get_args(annotation))
+            self.convert, self.type = str, pa.string()
+        elif get_origin(annotation) is list:
+            # The lists of IDs have a field validator that splits the text
+            self.convert, self.type = to_ids, pa.list_(pa.int64())
+        elif annotation is int:
+            self.convert, self.type = int, pa.int64()
+        elif annotation is bool:
+            self.convert, self.type = to_bool, pa.bool_()
+        elif annotation is datetime:
+            self.convert, self.type = datetime.fromisoformat, pa.timestamp("us")
+        elif annotation is str:
+            self.convert, self.type = str, pa.string()
+        else:
+            raise TypeError(f"Unsupported type of {model.__name__}.{name}")
+        self.values = []
+
+    def append(self, text: str | None) -> None:
+        # Like pydantic-xml, treat an empty element as a missing value
+        if not text:
+            if self.required:
+                raise ValueError(f"Field required: {self.name}")
+            self.values.append(self.default)
+            return
+        value = self.convert(text)
+        if self.choices is not None and value not in self.choices:
+            raise ValueError(f"Invalid value of {self.name}: {value}")
+        self.values.append(value)
+
+    def to_arrow(self) -> pa.Array:
+        return pa.array(self.values, type=self.type)
+
+
+class Table:
+    """Columns of one of the Heurist database structure's base tables."""
+
+    def __init__(self, model: type[BaseXmlModel]) -> None:
+        self.columns = {name: Column(name, model) for name in model.model_fields}
+
+    def append(self, element: etree._Element) -> None:
+        texts = {child.tag: child.text for child in element}
+        for name, column in self.columns.items():
+            column.append(texts.get(name))
+
+    def to_arrow(self) -> pa.Table:
+        return pa.table({name: c.to_arrow() for name, c in self.columns.items()})
+
+
+def load_structure_tables(xml: bytes) -> dict[str, pa.Table]:
+    """
+    Parse the Heurist database structure's XML into one Arrow table for each of \
+        the base tables: rtg, rst, rty, dty, and trm.
+
+    Rather than building the whole `HMLStructure` model, the XML is parsed \
+        incrementally. Each row's elements are coerced like the structural model \
+        would coerce them, appended to the table's columns, and then cleared \
+        from memory.
+
+    Examples:
+        >>> from mock_data import DB_STRUCTURE_XML
+        >>> tables = load_structure_tables(DB_STRUCTURE_XML)
+        >>> list(tables)
+        ['rtg', 'rst', 'rty', 'dty', 'trm']
+        >>> tables["rtg"].schema.field("rtg_Modified").type
+        TimestampType(timestamp[us])
+
+    Args:
+        xml (bytes): Heurist database structure exported in XML format.
+
+    Returns:
+        dict[str, pa.Table]: Arrow table of each base table.
+    """
+
+    tables = {tag: Table(model) for tag, model in STRUCTURAL_MODELS.items()}
+    source = io.BytesIO(xml.strip())
+    for _, element in etree.iterparse(source, events=("end",), tag=list(tables)):
+        tables[element.tag].append(element)
+        # Free the parsed row and the rows before it
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+    return {tag: table.to_arrow() for tag, table in tables.items()}
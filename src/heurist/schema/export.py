@@ -1,21 +1,23 @@
-from pathlib import Path
 import json
 from datetime import date
-import duckdb
+from pathlib import Path
 
+import duckdb
+from heurist.api.cache import ResponseCache
 from heurist.api.connection import HeuristAPIConnection
+from heurist.api.constants import HUMA_NUM_SERVER
+from heurist.api.session import SessionStore
 from heurist.database import TransformedDatabase
 from heurist.schema.rel_to_dict import convert_rty_description
 from heurist.sql.sql_safety import SafeSQLName
 from rich.progress import (
-    BarColumn,
-    MofNCompleteColumn,
     Progress,
     SpinnerColumn,
     TextColumn,
     TimeElapsedColumn,
 )
 
+
 def output_csv(dp: Path, descriptions: list[duckdb.DuckDBPyRelation]) -> None:
     for rel in descriptions:
         name = rel.select("rty_Name").limit(1).fetchone()[0]
@@ -38,10 +40,13 @@ def output_json(descriptions: list[duckdb.DuckDBPyRelation], fp: Path) -> None:
 
 def get_database_schema(
     record_groups: tuple,
-    db_name:str,
+    db_name: str,
     login: str,
     password: str,
     debugging: bool,
+    cache: ResponseCache | None = None,
+    session_store: SessionStore | None = None,
+    server: str = HUMA_NUM_SERVER,
 ) -> TransformedDatabase:
     # If testing, load the mock database XML schema
     if debugging:
@@ -62,6 +67,9 @@ def get_database_schema(
                 db=db_name,
                 login=login,
                 password=password,
+                cache=cache,
+                session_store=session_store,
+                server=server,
             ) as client,
         ):
             _ = p.add_task("Downloading schemas")
@@ -74,13 +82,16 @@ def get_database_schema(
 
 
 def export_schema(
-    db_name:str,
+    db_name: str,
     login: str,
     password: str,
     record_group: tuple,
     outdir: str,
     output_type: str,
     debugging: bool = False,
+    cache: ResponseCache | None = None,
+    session_store: SessionStore | None = None,
+    server: str = HUMA_NUM_SERVER,
 ):
     # Set up the output directory
     if not outdir:
@@ -95,19 +106,19 @@ def export_schema(
         login=login,
         password=password,
         debugging=debugging,
+        cache=cache,
+        session_store=session_store,
+        server=server,
     )
 
-    # Describe each targeted record type
+    # Describe all the targeted record types at once
     record_type_ids = list(db.pydantic_models.keys())
     with Progress(
-        TextColumn("{task.description}"), BarColumn(), MofNCompleteColumn()
+        TextColumn("{task.description}"), SpinnerColumn(), TimeElapsedColumn()
     ) as p:
-        descriptions = []
-        t = p.add_task("Describing record types", total=len(record_type_ids))
-        for id in record_type_ids:
-            rel = db.describe_record_schema(rty_ID=id)
-            descriptions.append(rel)
-            p.advance(t)
+        _ = p.add_task("Describing record types")
+        by_record_type = db.describe_record_schemas(rty_IDs=record_type_ids)
+        descriptions = list(by_record_type.values())
 
     # Output the descriptions according to the desired data format
     if output_type == "csv":
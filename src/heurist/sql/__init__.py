@@ -9,6 +9,12 @@ file_path_record_type_metadata_by_group_type = Path(__file__).parent.joinpath(
 file_path_fully_joined_record_type_metadata = Path(__file__).parent.joinpath(
     "joinRecordTypeMetadata.sql"
 )
+file_path_record_types_schema = Path(__file__).parent.joinpath(
+    "selectRecordTypesSchema.sql"
+)
+file_path_record_types_metadata = Path(__file__).parent.joinpath(
+    "joinRecordTypesMetadata.sql"
+)
 
 
 with open(file_path_record_type_schema) as f:
@@ -19,3 +25,9 @@ with open(file_path_record_type_metadata_by_group_type) as f:
 
 with open(file_path_fully_joined_record_type_metadata) as f:
     RECORD_TYPE_METADATA = f.read()
+
+with open(file_path_record_types_schema) as f:
+    RECORD_TYPES_SCHEMA = f.read()
+
+with open(file_path_record_types_metadata) as f:
+    RECORD_TYPES_METADATA = f.read()
@@ -0,0 +1,18 @@
+/* Join the tables Record Structure (rst), Detail Type (dty),
+and Record Type (rty) to get all the relevant information
+about the data fields of several record types at once.
+
+This query requires a parameter: the list of record type IDs. */
+SELECT
+    rty.rty_ID,
+    dty_ID,
+    rst_DisplayName,
+    dty_Type,
+    rst_MaxValues
+FROM rst
+INNER JOIN rty ON rst.rst_RecTypeID = rty.rty_ID
+INNER JOIN dty ON rst.rst_DetailTypeID = dty.dty_ID
+WHERE list_contains(?, rty.rty_ID)
+AND dty.dty_Type NOT LIKE 'separator'
+AND dty.dty_Type NOT LIKE 'relmarker'
+ORDER BY rty.rty_ID, rst.rst_DisplayOrder
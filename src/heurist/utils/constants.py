@@ -1 +1,12 @@
 DEFAULT_RECORD_GROUPS = ("My record types",)
+
+SYNC_STATE_TABLE = "_sync_state"
+
+STRUCTURE_SNAPSHOT_TABLE = "_structure_snapshot"
+RECORD_TYPE_METADATA_TABLE = "_record_type_metadata"
+
+# Version of the snapshot's format, which invalidates snapshots saved by a version
+# of the package that stored the structure differently
+STRUCTURE_SNAPSHOT_VERSION = 1
+
+ETL_METRICS_TABLE = "_etl_metrics"
@@ -0,0 +1,254 @@
+"""Timings, sizes, and memory use of the stages of the ETL workflow."""
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterable, Iterator
+
+from duckdb import DuckDBPyConnection
+from heurist.utils.constants import ETL_METRICS_TABLE
+
+try:
+    import resource
+except ImportError:
+    # The module is only available on Unix
+    resource = None
+
+
+def peak_rss() -> int | None:
+    """
+    Get the peak resident set size of the current process.
+
+    Examples:
+        >>> import sys
+        >>> sys.platform == "win32" or peak_rss() > 0
+        True
+
+    Returns:
+        int | None: Peak memory use, in bytes, or None if the platform can't \
+            measure it.
+    """
+
+    if resource is None:
+        return
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+class ETLMetrics:
+    """
+    Collect, for each record type, the seconds spent in each stage of the ETL \
+        workflow, with the number of records and bytes that the stage handled \
+        and the peak memory use of the process at the end of the stage.
+
+    The metrics of a stage that runs several times for a record type, i.e. the \
+        validation of each batch of records, are added together. The metrics can \
+        be collected from several threads.
+
+    Examples:
+        >>> metrics = ETLMetrics()
+        >>> with metrics.stage("validate", rty_ID=103, table_name="Story"):
+        ...     pass
+        >>> metrics.add("validate", 0.5, rty_ID=103, table_name="Story", records=10)
+        >>> [(m["stage"], m["records"]) for m in metrics.rows]
+        [('validate', 10)]
+    """
+
+    COLUMNS = [
+        ("run_at", "TIMESTAMP"),
+        ("rty_ID", "INTEGER"),
+        ("table_name", "VARCHAR"),
+        ("stage", "VARCHAR"),
+        ("seconds", "DOUBLE"),
+        ("records", "BIGINT"),
+        ("payload_bytes", "BIGINT"),
+        ("peak_rss_bytes", "BIGINT"),
+    ]
+
+    def __init__(self) -> None:
+        self.run_at = datetime.now()
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        stage: str,
+        seconds: float,
+        rty_ID: int | None = None,
+        table_name: str | None = None,
+        records: int | None = None,
+        payload_bytes: int | None = None,
+    ) -> None:
+        """Add the seconds, records, and bytes of a run of a stage.
+
+        Args:
+            stage (str): Name of the stage, i.e. "validate".
+            seconds (float): Duration of the stage.
+            rty_ID (int | None): ID of the record type. Defaults to None, for \
+                the stages that don't concern a record type.
+            table_name (str | None): Name of the record type's table. \
+                Defaults to None.
+            records (int | None): Number of records handled. Defaults to None.
+            payload_bytes (int | None): Number of bytes handled. Defaults to None.
+        """
+
+        key = (rty_ID, stage)
+        rss = peak_rss()
+        with self._lock:
+            row = self._metrics.setdefault(
+                key,
+                {
+                    "run_at": self.run_at,
+                    "rty_ID": rty_ID,
+                    "table_name": table_name,
+                    "stage": stage,
+                    "seconds": 0.0,
+                    "records": None,
+                    "payload_bytes": None,
+                    "peak_rss_bytes": None,
+                },
+            )
+            row["seconds"] += seconds
+            if records is not None:
+                row["records"] = (row["records"] or 0) + records
+            if payload_bytes is not None:
+                row["payload_bytes"] = (row["payload_bytes"] or 0) + payload_bytes
+            if rss is not None:
+                row["peak_rss_bytes"] = max(row["peak_rss_bytes"] or 0, rss)
+
+    @contextmanager
+    def stage(self, stage: str, **kwargs) -> Iterator[dict]:
+        """Time the block of code of a stage. The block can set the number of \
+            `records` and `payload_bytes` in the yielded dictionary.
+
+        Args:
+            stage (str): Name of the stage.
+            **kwargs: The `rty_ID` and `table_name` of the record type.
+
+        Yields:
+            Iterator[dict]: Counts of the stage, to fill in.
+        """
+
+        counts = {}
+        start = time.perf_counter()
+        try:
+            yield counts
+        finally:
+            seconds = time.perf_counter() - start
+            self.add(stage, seconds, **kwargs, **counts)
+
+    def timed_iter(
+        self,
+        iterable: Iterable,
+        stage: str,
+        counts: dict | None = None,
+        **kwargs,
+    ) -> Iterator:
+        """Iterate over the items of an iterable, i.e. records streamed from the \
+            server, while timing how long it takes to get each item.
+
+        The iterable can fill in `counts` while it's read: its "payload_bytes" \
+            are added to the stage, and the seconds of any other key, i.e. the \
+            "json decode" of streamed records, are recorded as a stage of their \
+            own and left out of this stage's seconds.
+
+        Examples:
+            >>> metrics = ETLMetrics()
+            >>> list(metrics.timed_iter([1, 2], "fetch", rty_ID=103))
+            [1, 2]
+            >>> metrics.rows[0]["records"]
+            2
+            >>> counts = {"json decode": 0.0, "payload_bytes": 10}
+            >>> list(metrics.timed_iter([3], "fetch", counts=counts, rty_ID=104))
+            [3]
+            >>> [(m["stage"], m["payload_bytes"]) for m in metrics.rows[1:]]
+            [('json decode', None), ('fetch', 10)]
+
+        Args:
+            iterable (Iterable): The items.
+            stage (str): Name of the stage.
+            counts (dict | None): Counts and seconds that the iterable adds \
+                while it's read. Defaults to None.
+            **kwargs: The `rty_ID` and `table_name` of the record type.
+
+        Yields:
+            Iterator: The items.
+        """
+
+        iterator = iter(iterable)
+        seconds = 0.0
+        count = 0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    seconds += time.perf_counter() - start
+                count += 1
+                yield item
+        finally:
+            counts = dict(counts or {})
+            payload_bytes = counts.pop("payload_bytes", None)
+            for other_stage, other_seconds in counts.items():
+                self.add(other_stage, other_seconds, records=count, **kwargs)
+                seconds -= other_seconds
+            self.add(
+                stage, seconds, records=count, payload_bytes=payload_bytes, **kwargs
+            )
+
+    def seconds(self, stage: str, rty_ID: int | None = None) -> float:
+        """The seconds spent so far in a stage of a record type."""
+
+        with self._lock:
+            row = self._metrics.get((rty_ID, stage))
+            return row["seconds"] if row else 0.0
+
+    @property
+    def rows(self) -> list[dict]:
+        with self._lock:
+            return [dict(row) for row in self._metrics.values()]
+
+    def top(self, n: int = 10) -> list[dict]:
+        """The `n` slowest stages of any record type, slowest first."""
+
+        return sorted(self.rows, key=lambda row: row["seconds"], reverse=True)[:n]
+
+    def save(self, conn: DuckDBPyConnection) -> None:
+        """Append the metrics of this run to the DuckDB database's metrics table, \
+            which keeps the metrics of every run.
+
+        Examples:
+            >>> import duckdb
+            >>> conn = duckdb.connect()
+            >>> metrics = ETLMetrics()
+            >>> metrics.add("fetch", 1.5, rty_ID=103, payload_bytes=2048)
+            >>> metrics.save(conn)
+            >>> conn.sql("SELECT stage, seconds, payload_bytes FROM _etl_metrics")
+            ┌─────────┬─────────┬───────────────┐
+            │  stage  │ seconds │ payload_bytes │
+            │ varchar │ double  │     int64     │
+            ├─────────┼─────────┼───────────────┤
+            │ fetch   │     1.5 │          2048 │
+            └─────────┴─────────┴───────────────┘
+            <BLANKLINE>
+
+        Args:
+            conn (DuckDBPyConnection): Connection to the DuckDB database.
+        """
+
+        columns = ", ".join(f"{name} {sql_type}" for name, sql_type in self.COLUMNS)
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {ETL_METRICS_TABLE} ({columns})")
+        rows = self.rows
+        if not rows:
+            return
+        placeholders = ", ".join("?" for _ in self.COLUMNS)
+        conn.executemany(
+            f"INSERT INTO {ETL_METRICS_TABLE} VALUES ({placeholders})",
+            [[row[name] for name, _ in self.COLUMNS] for row in rows],
+        )
@@ -1,6 +1,9 @@
 """Class for converting a record's detail before the Pydantic model validation."""
 
-from heurist.models.dynamic.date import TemporalObject
+from functools import lru_cache
+from typing import Any, Callable
+
+from heurist.models.dynamic.date import dump_temporal_object
 from heurist.models.dynamic.type import FieldType
 
 
@@ -113,8 +116,7 @@ class DetailValidator:
         else:
             raw_temporal_object = detail
 
-        model = TemporalObject.model_validate(raw_temporal_object)
-        return model.model_dump(by_alias=True)
+        return dump_temporal_object(raw_temporal_object)
 
     @classmethod
     def validate_resource(cls, detail: dict) -> int:
@@ -131,33 +133,75 @@ class DetailValidator:
         return int(detail["value"]["id"])
 
     @classmethod
-    def convert(cls, detail: dict) -> str | int | list | dict | None:
+    def validate_direct(cls, detail: dict) -> str | int | float | None:
         """
-        Based on the data type, convert the record's nested detail to a flat value.
+        Extract the value of a field whose value is stored directly in the detail.
 
         Args:
-            detail (dict): One of the record's details (data fields).
+            detail (dict): Record's detail.
 
         Returns:
-            str | int | list | dict | None: Flattened value of the data field.
+            str | int | float | None: Value of record's detail.
         """
 
-        fieldtype = FieldType.from_detail(detail)
+        return detail["value"]
+
+    @classmethod
+    def validate_unknown(cls, detail: dict) -> None:
+        """Return nothing for a data type that can't be converted."""
+
+        return None
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def converter(cls, fieldtype: str) -> Callable[[dict], Any]:
+        """
+        Get the method that converts the details of a certain data type. The \
+            method is looked up once per data type.
+
+        Examples:
+            >>> DetailValidator.converter("enum") == DetailValidator.validate_enum
+            True
+
+        Args:
+            fieldtype (str): Heurist data type of the detail.
+
+        Returns:
+            Callable[[dict], Any]: Method that converts a detail to a flat value.
+        """
 
         if any(ft in fieldtype for ft in cls.direct_values):
-            return detail["value"]
+            return cls.validate_direct
 
         elif fieldtype == "date":
-            return cls.validate_date(detail)
+            return cls.validate_date
 
         elif fieldtype == "enum":
-            return cls.validate_enum(detail)
+            return cls.validate_enum
 
         elif fieldtype == "file":
-            return cls.validate_file(detail)
+            return cls.validate_file
 
         elif fieldtype == "geo":
-            return cls.validate_geo(detail)
+            return cls.validate_geo
 
         elif fieldtype == "resource":
-            return cls.validate_resource(detail)
+            return cls.validate_resource
+
+        else:
+            return cls.validate_unknown
+
+    @classmethod
+    def convert(cls, detail: dict) -> str | int | list | dict | None:
+        """
+        Based on the data type, convert the record's nested detail to a flat value.
+
+        Args:
+            detail (dict): One of the record's details (data fields).
+
+        Returns:
+            str | int | list | dict | None: Flattened value of the data field.
+        """
+
+        fieldtype = FieldType.from_detail(detail)
+        return cls.converter(fieldtype)(detail)
@@ -0,0 +1,225 @@
+"""Validate a record type's records in a pool of worker processes."""
+
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import chain, islice
+from typing import Iterable, Iterator
+
+import pyarrow as pa
+from heurist.models.dynamic import HeuristRecord
+from heurist.models.dynamic.arrow import (
+    dicts_to_arrow_table,
+    model_to_arrow_schema,
+)
+from heurist.validators.record_validator import RecordValidator
+
+CHUNK_SIZE = 5000
+
+
+class LogRecordCollector(logging.Handler):
+    """
+    In a worker process, keep the log records emitted while validating a chunk, \
+        so that they can be sent back to the main process.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.records = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Like logging.handlers.QueueHandler, format the message now, because the
+        # message's arguments, i.e. an exception, might not be picklable.
+        d = dict(record.__dict__)
+        d["msg"] = record.getMessage()
+        d["args"] = None
+        d["exc_info"] = None
+        self.records.append(d)
+
+    def pop(self) -> list[dict]:
+        records, self.records = self.records, []
+        return records
+
+
+_collector = LogRecordCollector()
+
+
+def _init_worker() -> None:
+    # Send the worker's logs to the collector instead of the validation log file,
+    # which is only written by the main process.
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(_collector)
+    root.setLevel(logging.WARNING)
+
+
+def validate_chunk(
+    rty_ID: int, rty_Name: str, detail_metadata: list[dict], records: list[dict]
+) -> tuple[pa.Table, list[dict]]:
+    """
+    In a worker process, rebuild the record type's dynamic Pydantic model and \
+        validate a chunk of its records.
+
+    Args:
+        rty_ID (int): Heurist ID of the record type.
+        rty_Name (str): Name of the record type.
+        detail_metadata (list[dict]): Metadata of the record type's details.
+        records (list[dict]): Chunk of the record type's records.
+
+    Returns:
+        tuple[pa.Table, list[dict]]: The validated records, and the attributes of \
+            the log records emitted during their validation.
+    """
+
+    record_type = HeuristRecord(
+        rty_Name=rty_Name, rty_ID=rty_ID, detail_metadata=detail_metadata
+    )
+    validator = RecordValidator(
+        pydantic_model=record_type.model, records=records, rty_ID=rty_ID
+    )
+    table = dicts_to_arrow_table(
+        rows=chain.from_iterable(validator.iter_batches()),
+        schema=model_to_arrow_schema(record_type.model),
+    )
+    return table, _collector.pop()
+
+
+def chunk_records(records: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    """Split a sequence of records into lists of at most `size` records.
+
+    Examples:
+        >>> [len(chunk) for chunk in chunk_records(range(5), size=2)]
+        [2, 2, 1]
+
+    Args:
+        records (Iterable[dict]): Sequence of records.
+        size (int): Maximum number of records in a chunk.
+
+    Yields:
+        Iterator[list[dict]]: Chunk of records.
+    """
+
+    iterator = iter(records)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def create_process_pool(processes: int) -> ProcessPoolExecutor:
+    """
+    Create a pool of worker processes in which to validate records. The pool \
+        only starts its processes when it's given its first chunk, and can be \
+        shared by the validation of several record types, so that the processes \
+        are started once per run.
+
+    Args:
+        processes (int): Number of worker processes.
+
+    Returns:
+        ProcessPoolExecutor: The pool.
+    """
+
+    # The worker processes are spawned, rather than forked, because the main
+    # process can be running other threads, i.e. concurrent downloads.
+    return ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+    )
+
+
+def needs_processes(
+    records: Iterable[dict], processes: int, chunk_size: int = CHUNK_SIZE
+) -> tuple[bool, Iterator[dict]]:
+    """
+    Read ahead a record type's first records to find out if there are enough \
+        of them to keep every worker process busy with a chunk. Validating fewer \
+        records in the calling process is faster than sending them to workers.
+
+    Examples:
+        >>> parallel, records = needs_processes(range(5), processes=2, chunk_size=3)
+        >>> parallel, list(records)
+        (False, [0, 1, 2, 3, 4])
+        >>> parallel, records = needs_processes(range(6), processes=2, chunk_size=3)
+        >>> parallel, list(records)
+        (True, [0, 1, 2, 3, 4, 5])
+
+    Args:
+        records (Iterable[dict]): The record type's records.
+        processes (int): Number of worker processes.
+        chunk_size (int): Number of records sent to a worker at once. \
+            Defaults to 5000.
+
+    Returns:
+        tuple[bool, Iterator[dict]]: Whether to validate the records in worker \
+            processes, and all the records, including those read ahead.
+    """
+
+    iterator = iter(records)
+    head = list(islice(iterator, processes * chunk_size))
+    return len(head) == processes * chunk_size, chain(head, iterator)
+
+
+def validate_in_processes(
+    record_type: HeuristRecord,
+    records: Iterable[dict],
+    processes: int,
+    chunk_size: int = CHUNK_SIZE,
+    pool: ProcessPoolExecutor | None = None,
+) -> pa.Table:
+    """
+    Validate a record type's records in a pool of worker processes.
+
+    The records are split into chunks, which are validated in parallel. The \
+        validated chunks are returned in the order of the records, so that the \
+        output is the same as when the records are validated one after the other \
+        by a `RecordValidator`. Likewise, the warnings logged by the workers, such \
+        as `RepeatedValueInSingularDetailType`, are logged again by the main \
+        process in the order of the records.
+
+    At most two chunks per process are waiting to be validated at any time, so \
+        that records streamed from the server are not all held in memory at once.
+
+    Args:
+        record_type (HeuristRecord): The record type's dynamic model.
+        records (Iterable[dict]): The record type's records.
+        processes (int): Number of worker processes.
+        chunk_size (int): Number of records sent to a worker at once. \
+            Defaults to 5000.
+        pool (ProcessPoolExecutor | None): Pool of worker processes, from \
+            `create_process_pool`, which is left open. Defaults to None, a new \
+            pool that is shut down once the records are validated.
+
+    Returns:
+        pa.Table: The validated records.
+    """
+
+    schema = model_to_arrow_schema(record_type.model)
+    tables = [schema.empty_table()]
+    with nullcontext(pool) if pool else create_process_pool(processes) as executor:
+        pending: deque[Future] = deque()
+
+        def collect(future: Future) -> None:
+            table, log_records = future.result()
+            for d in log_records:
+                logging.getLogger().handle(logging.makeLogRecord(d))
+            tables.append(table)
+
+        for chunk in chunk_records(records, size=chunk_size):
+            pending.append(
+                executor.submit(
+                    validate_chunk,
+                    record_type.rty_ID,
+                    record_type.rty_Name,
+                    record_type.detail_metadata,
+                    chunk,
+                )
+            )
+            if len(pending) >= processes * 2:
+                collect(pending.popleft())
+        while pending:
+            collect(pending.popleft())
+
+    return pa.concat_tables(tables)
@@ -1,13 +1,23 @@
 import re
+from functools import lru_cache
+
 from heurist.models.dynamic import HistoricalDate
 
 FLOAT_RE = re.compile(r"^(-?\d+)\.(\d{2}|\d{4})$")
 ISO_RE = re.compile(r"^(-?\d+)(?:-(\d{1,2})(?:-(\d{1,2}))?)?$")
 
+# Maximum number of distinct raw dates whose parsed value is kept in memory
+DATE_CACHE_SIZE = 2**14
+
+
 def parse_heurist_date(h_date: str | int | float | None) -> HistoricalDate | None:
     """
     Convert Heurist's partial date representations to an ISO-compatible format.
 
+    The same raw dates, such as years, recur across many records. Therefore, the \
+        parsed dates are kept in a bounded cache, keyed on the raw value and its \
+        type. The cached `HistoricalDate` is immutable, so it can be shared.
+
     Examples:
         >>> # Test a string representation of a date
         >>> v = "2024-03-19"
@@ -34,7 +44,14 @@ def parse_heurist_date(h_date: str | int | float | None) -> HistoricalDate | Non
 
     if h_date is None:
         return None
+    try:
+        return _parse_heurist_date_cached(h_date)
+    except TypeError:
+        # The raw value can't be a key of the cache
+        return _parse_heurist_date(h_date)
 
+
+def _parse_heurist_date(h_date: str | int | float) -> HistoricalDate:
     # Affirm Heurist's representation of the date is a Python string
     h_date = str(h_date).strip()
 
@@ -61,8 +78,12 @@ def parse_heurist_date(h_date: str | int | float | None) -> HistoricalDate | Non
         month = int(m.group(2)) if m.group(2) is not None else None
         day = int(m.group(3)) if m.group(3) is not None else None
 
-    return HistoricalDate(
-        year=year,
-        month=month,
-        day=day
-    )
+    date = HistoricalDate(year=year, month=month, day=day)
+    # Compute the ISO string now, so that it's not recomputed on every dump
+    date.iso
+    return date
+
+
+_parse_heurist_date_cached = lru_cache(maxsize=DATE_CACHE_SIZE, typed=True)(
+    _parse_heurist_date
+)
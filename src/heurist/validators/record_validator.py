@@ -1,24 +1,37 @@
 import logging
+import multiprocessing
 import os
+import time
+from itertools import islice
+from typing import Iterable, Iterator
 
 from heurist.log.constants import VALIDATION_LOG
 from heurist.models.dynamic.annotation import PydanticField
 from heurist.models.dynamic.type import FieldType
 from heurist.validators.detail_validator import DetailValidator
 from heurist.validators.exceptions import RepeatedValueInSingularDetailType
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
-handlers = [logging.FileHandler(filename=VALIDATION_LOG, mode="w")]
-if os.getenv("HEURIST_STREAM_LOG") == "True":
-    handlers.append(logging.StreamHandler())
+BATCH_SIZE = 100
 
-logging.basicConfig(
-    encoding="utf-8",
-    format="{asctime} - {levelname} - {message}",
-    style="{",
-    datefmt="%Y-%m-%d %H:%M",
-    handlers=handlers,
-)
+# Attribute of a dynamic Pydantic model's class that holds its list adapter
+LIST_ADAPTER_ATTRIBUTE = "__heurist_list_adapter__"
+
+# Only the main process writes the validation log. A worker process that
+# validates records in parallel must not truncate the file when it imports this
+# module; its warnings are sent back to the main process.
+if multiprocessing.parent_process() is None:
+    handlers = [logging.FileHandler(filename=VALIDATION_LOG, mode="w")]
+    if os.getenv("HEURIST_STREAM_LOG") == "True":
+        handlers.append(logging.StreamHandler())
+
+    logging.basicConfig(
+        encoding="utf-8",
+        format="{asctime} - {levelname} - {message}",
+        style="{",
+        datefmt="%Y-%m-%d %H:%M",
+        handlers=handlers,
+    )
 
 
 def list_plural_fields(pydantic_model: BaseModel) -> list:
@@ -29,37 +42,177 @@ def list_plural_fields(pydantic_model: BaseModel) -> list:
     ]
 
 
+class DetailPlan:
+    """
+    Instructions, compiled once per record type, for flattening the details of \
+        one detail type into the fields of the record type's Pydantic model.
+    """
+
+    __slots__ = ("alias", "trm_alias", "repeats", "converter")
+
+    def __init__(self, alias: str, trm_alias: str | None, repeats: bool) -> None:
+        # Validation alias of the model's field
+        self.alias = alias
+        # Validation alias of the field for the vocabulary term's foreign key
+        self.trm_alias = trm_alias
+        # Whether the detail type is allowed to have multiple values
+        self.repeats = repeats
+        # Function that converts a detail to a flat value, which is set when the
+        # first detail of this type is converted.
+        self.converter = None
+
+
+def compile_detail_plan(pydantic_model: BaseModel) -> dict[int, DetailPlan]:
+    """
+    Index, by detail type ID, how each of the model's details is flattened.
+
+    Examples:
+        >>> from heurist.models.dynamic import HeuristRecord
+        >>> d1 = {'dty_ID': 1,
+        ... 'rst_DisplayName': 'status',
+        ... 'dty_Type': 'enum',
+        ... 'rst_MaxValues': 0}
+        >>> hr = HeuristRecord(rty_Name="test", rty_ID=1, detail_metadata=[d1])
+        >>> plan = compile_detail_plan(hr.model)
+        >>> plan[1].alias, plan[1].trm_alias, plan[1].repeats
+        ('DTY1', 'DTY1_TRM', True)
+
+    Args:
+        pydantic_model (BaseModel): A record type's dynamic Pydantic model.
+
+    Returns:
+        dict[int, DetailPlan]: Plan of each detail type.
+    """
+
+    plural_fields = list_plural_fields(pydantic_model=pydantic_model)
+    fields = pydantic_model.model_fields
+    plan = {}
+    for dty_ID in {f.description for f in fields.values() if f.description}:
+        alias = PydanticField._get_validation_alias(dty_ID=dty_ID)
+        trm_alias = alias + PydanticField.trm_validation_alias_suffix
+        plan[dty_ID] = DetailPlan(
+            alias=alias,
+            trm_alias=trm_alias if trm_alias in fields else None,
+            repeats=dty_ID in plural_fields,
+        )
+    return plan
+
+
+def list_adapter(pydantic_model: BaseModel) -> TypeAdapter:
+    """Build, once per dynamic Pydantic model, the adapter that validates and \
+        dumps a list of its records in a single call.
+
+    The adapter is kept on the model's class, rather than in a cache keyed by \
+        the class, so that it's garbage-collected along with the model.
+
+    Examples:
+        >>> from pydantic import create_model
+        >>> Model = create_model("Model", name=(str, ...))
+        >>> list_adapter(Model) is list_adapter(Model)
+        True
+        >>> Child = create_model("Child", __base__=Model)
+        >>> list_adapter(Child) is list_adapter(Model)
+        False
+
+    Args:
+        pydantic_model (BaseModel): A record type's dynamic Pydantic model.
+
+    Returns:
+        TypeAdapter: Adapter for a list of the model's instances.
+    """
+
+    # Only look in the class's own namespace, not in the classes it inherits from
+    adapter = pydantic_model.__dict__.get(LIST_ADAPTER_ATTRIBUTE)
+    if adapter is None:
+        adapter = TypeAdapter(list[pydantic_model])
+        setattr(pydantic_model, LIST_ADAPTER_ATTRIBUTE, adapter)
+    return adapter
+
+
 class RecordValidator:
     def __init__(
-        self, pydantic_model: BaseModel, records: list[dict], rty_ID: int
+        self, pydantic_model: BaseModel, records: Iterable[dict], rty_ID: int
     ) -> None:
         self.pydantic_model = pydantic_model
         self._rty_ID = rty_ID
-        self._records = records
-        self._index = 0
-        self._plural_fields = list_plural_fields(pydantic_model=self.pydantic_model)
+        # The records can be a list or a generator streaming them from the server
+        self._records = iter(records)
+        self._plan = compile_detail_plan(pydantic_model=self.pydantic_model)
 
     def is_plural(self, dty_ID: int) -> bool:
-        if dty_ID in self._plural_fields:
+        plan = self._plan.get(dty_ID)
+        if plan and plan.repeats:
             return True
 
     def __iter__(self):
         return self
 
     def __next__(self) -> BaseModel:
-        if self._index < len(self._records):
-            record = self._records[self._index]
-            self._index += 1
-            # If the record isn't of the record type for this model, skip it.
-            if record["rec_RecTypeID"] != self._rty_ID:
-                pass
-            # Otherwise, process the record's details into key-value pairs that
-            # will be loaded into the Pydantic model.
-            kwargs = self.flatten_details_to_dynamic_pydantic_fields(record)
-            # Return a validated Pydantic model.
-            return self.pydantic_model.model_validate(kwargs)
-        else:
-            raise StopIteration
+        # When there are no more records, the iterator raises StopIteration.
+        record = next(self._records)
+        # If the record isn't of the record type for this model, skip it.
+        if record["rec_RecTypeID"] != self._rty_ID:
+            pass
+        # Otherwise, process the record's details into key-value pairs that
+        # will be loaded into the Pydantic model.
+        kwargs = self.flatten_details_to_dynamic_pydantic_fields(record)
+        # Return a validated Pydantic model.
+        return self.pydantic_model.model_validate(kwargs)
+
+    def iter_batches(
+        self, batch_size: int = BATCH_SIZE, timings: dict | None = None
+    ) -> Iterator[list[dict]]:
+        """
+        Validate the records in batches and dump each batch of validated records \
+            to dictionaries keyed by the fields' serialization aliases.
+
+        The whole batch is validated and dumped by two calls to a `TypeAdapter`, \
+            which loops over the records in pydantic-core rather than in Python.
+
+        Examples:
+            >>> from heurist.models.dynamic import HeuristRecord
+            >>> d1 = {'dty_ID': 1,
+            ... 'rst_DisplayName': 'name',
+            ... 'dty_Type': 'freetext',
+            ... 'rst_MaxValues': 1}
+            >>> hr = HeuristRecord(rty_Name="test", rty_ID=1, detail_metadata=[d1])
+            >>> detail = {'dty_ID': 1, 'value': 'A', 'fieldType': 'freetext'}
+            >>> records = [
+            ...     {'rec_ID': i, 'rec_RecTypeID': 1, 'details': [detail]}
+            ...     for i in range(3)
+            ... ]
+            >>> validator = RecordValidator(hr.model, records, rty_ID=1)
+            >>> [len(batch) for batch in validator.iter_batches(batch_size=2)]
+            [2, 1]
+
+        Args:
+            batch_size (int): Maximum number of records in a batch. \
+                Defaults to 100.
+            timings (dict | None): If given, the seconds spent flattening and \
+                validating the records are added to its "flatten" and \
+                "validate" keys. Defaults to None.
+
+        Yields:
+            Iterator[list[dict]]: Batch of validated records.
+        """
+
+        adapter = list_adapter(self.pydantic_model)
+        if timings is not None:
+            timings.setdefault("flatten", 0.0)
+            timings.setdefault("validate", 0.0)
+        while records := list(islice(self._records, batch_size)):
+            start = time.perf_counter()
+            kwargs = [
+                self.flatten_details_to_dynamic_pydantic_fields(record)
+                for record in records
+            ]
+            flattened = time.perf_counter()
+            models = adapter.validate_python(kwargs)
+            rows = adapter.dump_python(models, by_alias=True)
+            if timings is not None:
+                timings["flatten"] += flattened - start
+                timings["validate"] += time.perf_counter() - flattened
+            yield rows
 
     @classmethod
     def aggregate_details_by_type(cls, details: list[dict]) -> dict:
@@ -80,8 +233,9 @@ class RecordValidator:
             "rec_RecTypeID": record["rec_RecTypeID"],
         }
         for dty_ID, details in detail_type_index.items():
-            # Determine if this detail type is allowed to have multiple values.
-            repeats = self.is_plural(dty_ID=dty_ID)
+            # Look up how this detail type is flattened into the model's fields.
+            plan = self._plan.get(dty_ID)
+            repeats = plan is not None and plan.repeats
 
             # If this detail is not supposed to be repeateable but Heurist allowed more
             # than 1 value to be saved in the field, raise an error.
@@ -95,14 +249,17 @@ class RecordValidator:
                 logging.warning(warning)
                 continue
 
-            # Get the validation alias for this kwarg's key
-            key = PydanticField._get_validation_alias(dty_ID=dty_ID)
+            # If the detail type isn't one of the model's fields, the model would
+            # ignore its value, so don't convert it.
+            if plan is None:
+                continue
 
             # Convert the detail's metadata to a flat value.
-            values = []
-            for detail in details:
-                v = DetailValidator.convert(detail=detail)
-                values.append(v)
+            if plan.converter is None:
+                plan.converter = DetailValidator.converter(
+                    FieldType.from_detail(details[0])
+                )
+            values = [plan.converter(detail) for detail in details]
 
             # Check the number of validated metadata against what is permissible for
             # this detail type according to the Heurist schema.
@@ -115,27 +272,19 @@ class RecordValidator:
                 continue
 
             # Add this detail type's alias and validated value(s) to the set of kwargs.
-            kwargs.update({key: value})
-
-            # If the detail is a Term, add an additional field for the foreign key.
-            if FieldType.from_detail(details[0]) == "enum":
-                # To this detail type's validation alias, which is associated with the
-                # term's label, append a suffix to distinguish it as a supplemental
-                # field to hold the foreign key.
-                key += PydanticField.trm_validation_alias_suffix
-                # Into a list, extract each detail's foreign key, which is in "value."
-                values = []
-                for detail in details:
-                    values.append(detail["value"])
-
-                value = self.validate_for_repeatable_values(
-                    repeats=repeats, values=values
-                )
+            kwargs[plan.alias] = value
+
+            # If the detail is a Term, add an additional field for the foreign key,
+            # which is in each detail's "value."
+            if plan.trm_alias:
+                values = [detail["value"] for detail in details]
 
                 # The previous if-condition should have already confirmed that this
                 # group of deatils are valid. Therefore, they can be added directly
                 # to the kwargs.
-                kwargs.update({key: value})
+                kwargs[plan.trm_alias] = self.validate_for_repeatable_values(
+                    repeats=repeats, values=values
+                )
 
         # Return the flat key-value pairs for the Pydantic model's fields.
         return kwargs
@@ -1,7 +1,17 @@
+import time
+from contextlib import closing, nullcontext
+from datetime import datetime, timedelta
+
 import duckdb
+from heurist.api.client import filter_records
 from heurist.api.connection import HeuristAPIConnection
 from heurist.database import TransformedDatabase
+from heurist.database.database import ValidatedRecords
+from heurist.models.dynamic import HeuristRecord
 from heurist.utils.constants import DEFAULT_RECORD_GROUPS
+from heurist.utils.metrics import ETLMetrics
+from heurist.validators.parallel import create_process_pool
+from heurist.workflows.pipeline import QUEUE_SIZE, Pipeline, Stage
 from rich.progress import (
     BarColumn,
     MofNCompleteColumn,
@@ -12,23 +22,92 @@ from rich.progress import (
 )
 
 
+def overlap(last_modified: str | None, seconds: int = 1) -> str | None:
+    """
+    Move a high-water mark slightly back in time, so that records modified in \
+        the same second as the latest loaded record are requested again. Because \
+        the records are merged by their H-ID, loading a record twice is harmless.
+
+    Examples:
+        >>> overlap("2024-08-28 14:43:43")
+        '2024-08-28 14:43:42'
+        >>> overlap(None) is None
+        True
+
+    Args:
+        last_modified (str | None): Latest modification date of the loaded records.
+        seconds (int): Seconds by which to move the date back. Defaults to 1.
+
+    Returns:
+        str | None: Date from which to request modified records.
+    """
+
+    if not last_modified:
+        return
+    date = datetime.fromisoformat(last_modified) - timedelta(seconds=seconds)
+    return date.strftime("%Y-%m-%d %H:%M:%S")
+
+
 def extract_transform_load(
     client: HeuristAPIConnection,
     duckdb_connection: duckdb.DuckDBPyConnection,
     user: tuple = (),
     record_group_names: tuple = DEFAULT_RECORD_GROUPS,
+    workers: int = 1,
+    processes: int = 1,
+    stream: bool = False,
+    incremental: bool = False,
+    metrics: ETLMetrics | None = None,
+    queue_size: int = QUEUE_SIZE,
 ) -> None:
     """
     Workflow for (1) extracting, transforming, and loading the Heurist database \
         architecture into a DuckDB database and (2) extracting, transforming, \
         and loading record types' records into the created DuckDB database.
 
+    The record types go through a pipeline of three stages, so that the network \
+        and the processor are used at the same time: while a record type is being \
+        downloaded, the previous one is validated, and the one before it is \
+        loaded. The records of several record types can be downloaded at the same \
+        time by a pool of worker threads, which share the client's session. They \
+        are validated by another thread, unless the validation is spread across a \
+        pool of worker processes that is shared by the record types with enough \
+        records to fill it, and inserted into the DuckDB database on the \
+        calling thread, one record type at a time, because DuckDB allows only one \
+        writer on a connection.
+
+    The stages are connected by bounded queues: when `queue_size` record types \
+        are waiting for the next stage, the previous stage waits too, so that \
+        downloads don't pile up in memory while the validation is behind. If any \
+        stage fails, the pending record types are abandoned and the error is \
+        raised.
+
+    The time spent in each stage of each record type's loading, with the size \
+        of the downloads, the number of records, and the peak memory use, is \
+        appended to the DuckDB database's `_etl_metrics` table.
+
     Args:
         client (HeuristAPIConnection): Context of a Heurist API connection.
         duckdb_connection (duckdb.DuckDBPyConnection): Connection to a DuckDB database.
         user (tuple): IDs (integers) of targeted users.
         record_group_names (tuple): Names of the record group types. Must include at \
             least 1. Defaults to ("My record types").
+        workers (int): Number of record types to download at the same time. \
+            Defaults to 1.
+        processes (int): Number of worker processes in which to validate each \
+            record type's records. Defaults to 1.
+        stream (bool): Whether to parse each record type's JSON export while it's \
+            being received, instead of after the whole export has been read into \
+            memory. The export is still read entirely by the download's worker \
+            thread, before the records are validated. Defaults to False.
+        incremental (bool): Whether to only download the records modified since \
+            each record type's table was last loaded and merge them into the \
+            existing table. Record types without a loaded table, or whose data \
+            model changed, are downloaded entirely. Defaults to False.
+        metrics (ETLMetrics | None): Collector of the stages' metrics. \
+            Defaults to a new collector.
+        queue_size (int): Number of record types that can wait between two \
+            stages of the pipeline. Defaults to 2.
 
     Returns:
         duckdb.DuckDBPyConnection: Open connection to the created DuckDB database.
@@ -39,7 +118,11 @@ def extract_transform_load(
         TextColumn("{task.description}"), SpinnerColumn(), TimeElapsedColumn()
     ) as p:
         _ = p.add_task("Get DB Structure")
-        xml = client.get_structure()
+        if metrics is None:
+            metrics = ETLMetrics()
+        with metrics.stage("structure fetch") as counts:
+            xml = client.get_structure()
+            counts["payload_bytes"] = len(xml)
 
     # Export individual record sets and insert into the DuckDB database
     with (
@@ -49,18 +132,101 @@ def extract_transform_load(
             MofNCompleteColumn(),
             TimeElapsedColumn(),
         ) as p,
+        create_process_pool(processes) if processes > 1 else nullcontext() as pool,
     ):
-        database = TransformedDatabase(
-            conn=duckdb_connection,
-            hml_xml=xml,
-            record_type_groups=record_group_names,
-        )
+        with metrics.stage("structure parse"):
+            database = TransformedDatabase(
+                conn=duckdb_connection,
+                hml_xml=xml,
+                record_type_groups=record_group_names,
+            )
         t = p.add_task(
             "Get Records",
             total=len(database.pydantic_models.keys()),
         )
-        for record_type in database.pydantic_models.values():
+        # If updating the tables, get the latest modification date of the records
+        # already loaded in each record type's table.
+        last_modified = {}
+        if incremental:
+            for rty_ID in database.pydantic_models.keys():
+                last_modified[rty_ID] = database.get_last_modified(
+                    record_type_id=rty_ID, users=user
+                )
+
+        def download(record_type: HeuristRecord) -> tuple:
             rty_ID = record_type.rty_ID
-            records = client.get_records(rty_ID, users=user)
-            p.advance(t)
-            database.insert_records(record_type_id=rty_ID, records=records)
+            modified_since = overlap(last_modified.get(rty_ID))
+            labels = dict(rty_ID=rty_ID, table_name=record_type.table_name)
+            if stream or client.page_size:
+                # The records are decoded while they're downloaded, so the fetch's
+                # time is what remains once the decoding is left out. A stream is
+                # read entirely here, so that the downloads overlap with the
+                # validation and their connections are freed before being queued.
+                timings = {}
+                start = time.perf_counter()
+                records = client.get_records(
+                    rty_ID,
+                    users=user,
+                    stream=stream,
+                    modified_since=modified_since,
+                    timings=timings,
+                )
+                if stream:
+                    records = list(records)
+                seconds = time.perf_counter() - start
+                decoding = timings.get("json decode", 0.0)
+                metrics.add(
+                    "fetch",
+                    seconds - decoding,
+                    payload_bytes=timings.get("payload_bytes"),
+                    **labels,
+                )
+                metrics.add("json decode", decoding, records=len(records), **labels)
+                return record_type, records
+            with metrics.stage("fetch", **labels) as counts:
+                content = client.get_records_content(
+                    rty_ID, users=user, modified_since=modified_since
+                )
+                counts["payload_bytes"] = len(content)
+            with metrics.stage("json decode", **labels) as counts:
+                records = filter_records(
+                    content=content, record_type_id=rty_ID, users=user
+                )
+                counts["records"] = len(records)
+            return record_type, records
+
+        def validate(downloaded: tuple) -> ValidatedRecords:
+            record_type, records = downloaded
+            return database.validate_records(
+                record_type_id=record_type.rty_ID,
+                records=records,
+                processes=processes,
+                pool=pool,
+                metrics=metrics,
+            )
+
+        # Download, validate, and load the record types in a pipeline, so that a
+        # record type is downloaded while another one is validated and another one
+        # is loaded into the DuckDB database
+        pipeline = Pipeline(
+            stages=[
+                Stage("fetch", download, workers=workers),
+                Stage("validate", validate),
+            ],
+            queue_size=queue_size,
+        )
+        # As each record type is validated, load its records. If the loading
+        # fails, closing the pipeline stops its threads.
+        with closing(pipeline.run(database.pydantic_models.values())) as results:
+            for validated in results:
+                record_type = database.pydantic_models[validated.record_type_id]
+                p.update(t, description=f"Get Records ({record_type.table_name})")
+                p.advance(t)
+                database.load_records(
+                    validated=validated,
+                    users=user,
+                    upsert=last_modified.get(record_type.rty_ID) is not None,
+                    metrics=metrics,
+                )
+        p.update(t, description="Get Records")
+        metrics.save(duckdb_connection)
@@ -0,0 +1,197 @@
+"""Export the DuckDB database's record tables to files."""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from duckdb import DuckDBPyConnection
+from rich.progress import (
+    BarColumn,
+    MofNCompleteColumn,
+    Progress,
+    TextColumn,
+    TimeElapsedColumn,
+)
+
+EXPORT_FORMATS = ("csv", "parquet")
+PARQUET_COMPRESSIONS = ("snappy", "zstd", "gzip", "lz4", "uncompressed")
+# DuckDB's default number of rows in a Parquet file's row group
+ROW_GROUP_SIZE = 122_880
+
+
+def quote_identifier(name: str) -> str:
+    return '"{}"'.format(name.replace('"', '""'))
+
+
+def quote_literal(value: str) -> str:
+    return "'{}'".format(value.replace("'", "''"))
+
+
+def build_copy_statement(
+    table_name: str,
+    path: Path | str,
+    output_format: str = "csv",
+    compression: str = "snappy",
+    row_group_size: int = ROW_GROUP_SIZE,
+    partition_by: tuple = (),
+    sort: bool = True,
+) -> str:
+    """
+    Build the SQL statement that copies a record table, by default sorted by its \
+        records' IDs, to a file or, if partitioned, to a Hive-style directory of \
+        files.
+
+    Examples:
+        >>> print(build_copy_statement("Story", "out/Story.parquet", "parquet"))
+        COPY (SELECT * FROM "Story" ORDER BY "H-ID") TO 'out/Story.parquet' \
+(FORMAT parquet, COMPRESSION snappy, ROW_GROUP_SIZE 122880)
+        >>> print(build_copy_statement("Story", "out/Story", partition_by=("type_id",)))
+        COPY (SELECT * FROM "Story" ORDER BY "H-ID") TO 'out/Story' \
+(FORMAT csv, HEADER true, PARTITION_BY ("type_id"), OVERWRITE true)
+        >>> print(build_copy_statement("Story", "out/Story.csv", sort=False))
+        COPY (SELECT * FROM "Story") TO 'out/Story.csv' (FORMAT csv, HEADER true)
+
+    Args:
+        table_name (str): Name of the record table.
+        path (Path | str): Path to the file, or to the partitioned directory.
+        output_format (str): Either "csv" or "parquet". Defaults to "csv".
+        compression (str): Compression codec of Parquet files. \
+            Defaults to "snappy".
+        row_group_size (int): Number of rows in a Parquet file's row group. \
+            Defaults to 122880.
+        partition_by (tuple): Names of the columns by which to partition the \
+            table. Defaults to no partitioning.
+        sort (bool): Whether to sort the rows by their records' IDs. \
+            Defaults to True.
+
+    Returns:
+        str: SQL statement.
+    """
+
+    if output_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {output_format}")
+    options = [f"FORMAT {output_format}"]
+    if output_format == "parquet":
+        if compression not in PARQUET_COMPRESSIONS:
+            raise ValueError(f"Unsupported Parquet compression: {compression}")
+        options.append(f"COMPRESSION {compression}")
+        options.append(f"ROW_GROUP_SIZE {int(row_group_size)}")
+    else:
+        options.append("HEADER true")
+    if partition_by:
+        columns = ", ".join(quote_identifier(c) for c in partition_by)
+        options.append(f"PARTITION_BY ({columns})")
+        # Replace the files of a previous export in the table's directory
+        options.append("OVERWRITE true")
+    query = "SELECT * FROM {}".format(quote_identifier(table_name))
+    if sort:
+        query += ' ORDER BY "H-ID"'
+    return "COPY ({}) TO {} ({})".format(
+        query, quote_literal(str(path)), ", ".join(options)
+    )
+
+
+def export_table(
+    conn: DuckDBPyConnection,
+    table_name: str,
+    outdir: Path,
+    output_format: str = "csv",
+    compression: str = "snappy",
+    row_group_size: int = ROW_GROUP_SIZE,
+    partition_by: tuple = (),
+    sort: bool = True,
+) -> Path:
+    """
+    Export a record table to a CSV or Parquet file named after the table. If \
+        partitioned, the table is exported to a directory named after the table, \
+        in which each partition's files are in a subdirectory named \
+        `column=value`.
+
+    Args:
+        conn (DuckDBPyConnection): Connection to the DuckDB database.
+        table_name (str): Name of the record table.
+        outdir (Path): Directory in which to export the table.
+        output_format (str): Either "csv" or "parquet". Defaults to "csv".
+        compression (str): Compression codec of Parquet files. \
+            Defaults to "snappy".
+        row_group_size (int): Number of rows in a Parquet file's row group. \
+            Defaults to 122880.
+        partition_by (tuple): Names of the columns by which to partition the \
+            table. Defaults to no partitioning.
+        sort (bool): Whether to sort the rows by their records' IDs. \
+            Defaults to True.
+
+    Returns:
+        Path: Path to the exported file or directory.
+    """
+
+    if partition_by:
+        missing = set(partition_by).difference(conn.table(table_name).columns)
+        if missing:
+            raise ValueError(
+                "Table {} has no column {}".format(table_name, ", ".join(missing))
+            )
+        path = outdir.joinpath(table_name)
+    else:
+        path = outdir.joinpath(f"{table_name}.{output_format}")
+    conn.execute(
+        build_copy_statement(
+            table_name=table_name,
+            path=path,
+            output_format=output_format,
+            compression=compression,
+            row_group_size=row_group_size,
+            partition_by=partition_by,
+            sort=sort,
+        )
+    )
+    return path
+
+
+def export_tables(
+    conn: DuckDBPyConnection,
+    tables: list[str],
+    outdir: Path,
+    workers: int = 1,
+    **kwargs,
+) -> list[Path]:
+    """
+    Export several record tables, like `export_table`, in a pool of worker \
+        threads. Each table is exported through its own cursor of the DuckDB \
+        connection, which can be a read-only connection.
+
+    Args:
+        conn (DuckDBPyConnection): Connection to the DuckDB database.
+        tables (list[str]): Names of the record tables.
+        outdir (Path): Directory in which to export the tables.
+        workers (int): Number of tables to export at the same time. Defaults to 1.
+        **kwargs: Options of `export_table`, i.e. the format of the files.
+
+    Returns:
+        list[Path]: Paths to the exported files or directories, in the order of \
+            the tables.
+    """
+
+    def export(table_name: str) -> Path:
+        with conn.cursor() as cursor:
+            return export_table(
+                conn=cursor, table_name=table_name, outdir=outdir, **kwargs
+            )
+
+    with Progress(
+        TextColumn("{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TimeElapsedColumn(),
+    ) as p:
+        t = p.add_task("Export Tables", total=len(tables))
+        executor = ThreadPoolExecutor(max_workers=max(workers, 1))
+        try:
+            futures = {executor.submit(export, table): table for table in tables}
+            paths = {}
+            for future in as_completed(futures):
+                paths[futures[future]] = future.result()
+                p.advance(t)
+        finally:
+            # If an export failed, don't start the pending ones
+            executor.shutdown(wait=True, cancel_futures=True)
+    return [paths[table] for table in tables]
@@ -0,0 +1,179 @@
+"""Run items through stages of worker threads connected by bounded queues."""
+
+import queue
+import threading
+from typing import Any, Callable, Iterable
+
+# Number of items that can wait between two stages
+QUEUE_SIZE = 2
+# Seconds between checks of whether the pipeline was stopped, while waiting for a
+# queue
+POLL_INTERVAL = 0.1
+
+_DONE = object()
+
+
+class Stage:
+    """A step of a pipeline, which applies a function to each item in a number \
+        of worker threads."""
+
+    def __init__(self, name: str, func: Callable[[Any], Any], workers: int = 1):
+        """
+        Args:
+            name (str): Name of the stage, given to its threads.
+            func (Callable[[Any], Any]): Function applied to each item.
+            workers (int): Number of threads applying the function. Defaults to 1.
+        """
+
+        self.name = name
+        self.func = func
+        self.workers = max(workers, 1)
+
+
+class Pipeline:
+    """
+    Pass items through a sequence of stages, each run by its own worker threads, \
+        so that an item can be in a stage while the next item is in the previous \
+        stage. The output of the last stage is consumed by the calling thread.
+
+    The stages are connected by bounded queues. When a queue is full, the stage \
+        that fills it waits, which caps the number of items held in memory.
+
+    If a stage or the consumer raises an exception, the pipeline stops: the \
+        threads stop taking new items, and the exception is raised again in the \
+        calling thread once every thread is finished.
+
+    Examples:
+        >>> pipeline = Pipeline(
+        ...     stages=[Stage("double", lambda x: x * 2), Stage("inc", lambda x: x + 1)]
+        ... )
+        >>> sorted(pipeline.run(range(5)))
+        [1, 3, 5, 7, 9]
+        >>> def fail(x):
+        ...     raise ValueError(x)
+        >>> list(Pipeline(stages=[Stage("fail", fail)]).run(range(5)))
+        Traceback (most recent call last):
+        ...
+        ValueError: 0
+    """
+
+    def __init__(self, stages: list[Stage], queue_size: int = QUEUE_SIZE) -> None:
+        """
+        Args:
+            stages (list[Stage]): The stages, in order.
+            queue_size (int): Number of items that can wait between two stages. \
+                Defaults to 2.
+        """
+
+        self.stages = stages
+        self.queue_size = max(queue_size, 1)
+        self._stop = threading.Event()
+        self._errors = []
+        self._lock = threading.Lock()
+
+    def _put(self, q: queue.Queue, item: Any) -> bool:
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue) -> Any:
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _fail(self, error: BaseException) -> None:
+        with self._lock:
+            self._errors.append(error)
+        self._stop.set()
+
+    def _feed(self, items: Iterable, q: queue.Queue, consumers: int) -> None:
+        try:
+            for item in items:
+                if not self._put(q, item):
+                    return
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            for _ in range(consumers):
+                self._put(q, _DONE)
+
+    def _work(
+        self,
+        stage: Stage,
+        inbox: queue.Queue,
+        outbox: queue.Queue,
+        remaining: list[int],
+        consumers: int,
+    ) -> None:
+        try:
+            while (item := self._get(inbox)) is not _DONE:
+                if not self._put(outbox, stage.func(item)):
+                    return
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            # The stage's last worker to finish tells the next stage's workers
+            with self._lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                for _ in range(consumers):
+                    self._put(outbox, _DONE)
+
+    def run(self, items: Iterable) -> Iterable:
+        """
+        Pass the items through the stages, and yield the output of the last stage \
+            in the order in which the items finish.
+
+        Args:
+            items (Iterable): The items given to the first stage.
+
+        Yields:
+            Iterable: The output of the last stage.
+        """
+
+        self._stop.clear()
+        self._errors.clear()
+        queues = [
+            queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)
+        ]
+        threads = [
+            threading.Thread(
+                target=self._feed,
+                args=(items, queues[0], self.stages[0].workers),
+                name="pipeline-feed",
+                daemon=True,
+            )
+        ]
+        for i, stage in enumerate(self.stages):
+            consumers = self.stages[i + 1].workers if i + 1 < len(self.stages) else 1
+            remaining = [stage.workers]
+            for n in range(stage.workers):
+                threads.append(
+                    threading.Thread(
+                        target=self._work,
+                        args=(stage, queues[i], queues[i + 1], remaining, consumers),
+                        name=f"pipeline-{stage.name}-{n}",
+                        daemon=True,
+                    )
+                )
+        for thread in threads:
+            thread.start()
+        try:
+            while (item := self._get(queues[-1])) is not _DONE:
+                yield item
+        finally:
+            # Whether the consumer finished, failed, or stopped iterating, stop the
+            # threads and wait for them
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+        if self._errors:
+            raise self._errors[0]
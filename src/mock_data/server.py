@@ -0,0 +1,342 @@
+"""Local stand-in for the Heurist server, which serves the mock data."""
+
+import json
+import secrets
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterable
+from urllib.parse import parse_qs, urlsplit
+
+from heurist.api.constants import (
+    LOGIN_PATH,
+    RECORD_JSON_EXPORT_PATH,
+    STRUCTURE_EXPORT_PATH,
+    USER_INFO_PATH,
+)
+from mock_data import DB_STRUCTURE_XML, RECORD_JSON
+
+BASE_PATH = "/heurist"
+SESSION_COOKIE = "heurist-sessionid"
+
+# Heurist ID of the user whose sessions the server opens
+USER_ID = 2
+
+
+def filter_query(
+    records: Iterable[dict],
+    query: str,
+    limit: int | None = None,
+    offset: int = 0,
+) -> list[dict]:
+    """
+    Select the records that match the filters of a Heurist query, such as the \
+        ones built by `URLBuilder.get_records`.
+
+    Examples:
+        >>> records = [
+        ...     {"rec_ID": "1", "rec_RecTypeID": "103", "rec_AddedByUGrpID": "2",
+        ...      "rec_Modified": "2024-01-01 00:00:00"},
+        ...     {"rec_ID": "2", "rec_RecTypeID": "103", "rec_AddedByUGrpID": "16",
+        ...      "rec_Modified": "2024-06-01 00:00:00"},
+        ... ]
+        >>> q = '[{"t":"103"},{"sortby":"t"},{"addedby":"2,16"}]'
+        >>> [r["rec_ID"] for r in filter_query(records, q)]
+        ['1', '2']
+        >>> q = '[{"t":"103"},{"modified":">2024-03-01 00:00:00"}]'
+        >>> [r["rec_ID"] for r in filter_query(records, q)]
+        ['2']
+        >>> q = '[{"t":"103"},{"sortby":"id"}]'
+        >>> [r["rec_ID"] for r in filter_query(records, q, limit=1, offset=1)]
+        ['2']
+
+    Args:
+        records (Iterable[dict]): Records of the database.
+        query (str): JSON array of the query's filters.
+        limit (int | None): Maximum number of records to select. Defaults to \
+            None, which selects all the matching records.
+        offset (int): Number of matching records to skip. Defaults to 0.
+
+    Returns:
+        list[dict]: The matching records.
+    """
+
+    filters = {}
+    for item in json.loads(query):
+        filters.update(item)
+    selected = []
+    for record in records:
+        if "t" in filters and record["rec_RecTypeID"] != str(filters["t"]):
+            continue
+        if "addedby" in filters:
+            users = str(filters["addedby"]).split(",")
+            if record["rec_AddedByUGrpID"] not in users:
+                continue
+        if "modified" in filters:
+            since = filters["modified"].lstrip(">")
+            if record["rec_Modified"] <= since:
+                continue
+        selected.append(record)
+    if filters.get("sortby") == "id":
+        selected.sort(key=lambda r: int(r["rec_ID"]))
+    if limit is not None:
+        return selected[offset : offset + limit]
+    return selected
+
+
+class HeuristRequestHandler(BaseHTTPRequestHandler):
+    """Answer the requests sent to the stand-in Heurist server."""
+
+    protocol_version = "HTTP/1.1"
+    server: "_HTTPServer"
+
+    def log_message(self, format, *args) -> None:
+        # Don't print every request, as the default handler does
+        pass
+
+    def send_body(self, status: int, body: bytes, content_type: str, **headers):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client stopped waiting, i.e. because it timed out
+            pass
+
+    def send_json(self, status: int, data: dict, **headers):
+        body = json.dumps(data).encode("utf-8")
+        self.send_body(status, body, "application/json", **headers)
+
+    def has_session(self) -> bool:
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        morsel = cookie.get(SESSION_COOKIE)
+        return morsel is not None and morsel.value in self.server.mock.sessions
+
+    def do_POST(self):
+        mock = self.server.mock
+        mock.log_request(self)
+        url = urlsplit(self.path)
+        if url.path != BASE_PATH + LOGIN_PATH:
+            return self.send_json(404, {"message": "Not found"})
+        length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(length).decode("utf-8"))
+        fields = {k: v[0] for k, v in form.items()}
+        if not mock.check_login(fields):
+            return self.send_json(401, {"message": "Invalid credentials"})
+        token = mock.new_session()
+        cookie = f"{SESSION_COOKIE}={token}; Path=/"
+        self.send_json(200, {"status": "ok"}, **{"Set-Cookie": cookie})
+
+    def do_GET(self):
+        mock = self.server.mock
+        mock.log_request(self)
+        if not mock.before_response():
+            # Like a server that never answered, close the connection, which the
+            # client should have given up on by now
+            self.close_connection = True
+            return
+        status = mock.next_failure()
+        if status:
+            headers = {}
+            if mock.retry_after is not None:
+                headers["Retry-After"] = str(mock.retry_after)
+            return self.send_json(status, {"message": "Unavailable"}, **headers)
+        url = urlsplit(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        logged_in = self.has_session()
+        if url.path == BASE_PATH + USER_INFO_PATH:
+            # Like Heurist, describe a guest rather than refuse the request
+            user_id = USER_ID if logged_in else 0
+            data = {"currentUser": {"ugr_ID": user_id}}
+            return self.send_json(200, {"status": "ok", "data": data})
+        if params.get("db") != mock.db:
+            body = b"Cannot connect to database"
+            return self.send_body(200, body, "text/plain")
+        if url.path == BASE_PATH + RECORD_JSON_EXPORT_PATH:
+            # Like Heurist, only export the public records to a guest
+            records = mock.records
+            if not logged_in:
+                records = [
+                    r for r in records if r.get("rec_NonOwnerVisibility") == "public"
+                ]
+            limit = int(params["limit"]) if "limit" in params else None
+            records = filter_query(
+                records,
+                params.get("q", "[]"),
+                limit=limit,
+                offset=int(params.get("offset", 0)),
+            )
+            return self.send_json(200, {"heurist": {"records": records}})
+        if not logged_in:
+            return self.send_json(401, {"message": "Not logged in"})
+        if url.path == BASE_PATH + STRUCTURE_EXPORT_PATH:
+            return self.send_body(200, mock.structure, "text/xml")
+        else:
+            return self.send_json(404, {"message": "Not found"})
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    mock: "MockHeuristServer"
+
+
+class MockHeuristServer:
+    """
+    Local HTTP server that stands in for the Heurist server, so that the API \
+        client can be run end-to-end, and measured, without network access.
+
+    It answers the login, the description of the session's user \
+        (`usr_info.php`), the database structure's XML export, and the JSON \
+        export of records (`record_output.php`), like the Heurist server. As \
+        on the Heurist server, a guest is only sent the public records. It \
+        can also be slowed down by a latency on every request, by requests \
+        that stall until the client times out, and by requests that fail with \
+        a status code such as 503, like an overloaded server.
+
+    Examples:
+        >>> from heurist.api.connection import HeuristAPIConnection
+        >>> with MockHeuristServer() as server:
+        ...     with HeuristAPIConnection(
+        ...         db="mock_db", login="user", password="pass", server=server.url
+        ...     ) as client:
+        ...         records = client.get_records(103)
+        >>> len(records)
+        175
+    """
+
+    def __init__(
+        self,
+        records: list[dict] | None = None,
+        structure: bytes = DB_STRUCTURE_XML,
+        db: str = "mock_db",
+        login: str | None = None,
+        password: str | None = None,
+        latency: float = 0.0,
+        stalls: int = 0,
+        stall_seconds: float = 5.0,
+        failures: int = 0,
+        failure_status: int = 503,
+        retry_after: int | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """
+        Args:
+            records (list[dict] | None): Records of the database. Defaults to \
+                the mock records.
+            structure (bytes): The database structure's XML. Defaults to the \
+                mock structure.
+            db (str): Name of the database. Defaults to "mock_db".
+            login (str | None): Username accepted by the login. Defaults to \
+                None, which accepts any username.
+            password (str | None): Password accepted by the login. Defaults to \
+                None, which accepts any password.
+            latency (float): Seconds to wait before answering a data request. \
+                Defaults to 0.
+            stalls (int): Number of the first data requests that stall, without \
+                an answer, for `stall_seconds`. Defaults to 0.
+            stall_seconds (float): Seconds during which a request stalls, which \
+                should be longer than the client's read timeout. Defaults to 5.
+            failures (int): Number of the first data requests, after the stalled \
+                ones, that fail with `failure_status`. Defaults to 0.
+            failure_status (int): Status code of the failed requests. Defaults \
+                to 503.
+            retry_after (int | None): Seconds given in the failed requests' \
+                Retry-After header. Defaults to None, no header.
+            host (str): Host on which to listen. Defaults to "127.0.0.1".
+            port (int): Port on which to listen. Defaults to 0, a free port.
+        """
+
+        if records is None:
+            records = RECORD_JSON["heurist"]["records"]
+        self.records = records
+        self.structure = structure
+        self.db = db
+        self.login = login
+        self.password = password
+        self.latency = latency
+        self.stalls = stalls
+        self.stall_seconds = stall_seconds
+        self.failures = failures
+        self.failure_status = failure_status
+        self.retry_after = retry_after
+        self.sessions = set()
+        self.requests = []
+        self._lock = threading.Lock()
+        self._httpd = _HTTPServer((host, port), HeuristRequestHandler)
+        self._httpd.mock = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server, to give to the API connection."""
+
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{BASE_PATH}"
+
+    def log_request(self, handler: BaseHTTPRequestHandler) -> None:
+        with self._lock:
+            self.requests.append((handler.command, handler.path))
+
+    def check_login(self, fields: dict) -> bool:
+        return (
+            fields.get("db") == self.db
+            and self.login in (None, fields.get("login"))
+            and self.password in (None, fields.get("password"))
+        )
+
+    def new_session(self) -> str:
+        token = secrets.token_hex(16)
+        with self._lock:
+            self.sessions.add(token)
+        return token
+
+    def expire_sessions(self) -> None:
+        """Forget the sessions of the previous logins, like a restarted server."""
+
+        with self._lock:
+            self.sessions.clear()
+
+    def before_response(self) -> bool:
+        """Delay a data request. Returns False if the request stalled."""
+
+        with self._lock:
+            stall = self.stalls > 0
+            if stall:
+                self.stalls -= 1
+        if stall:
+            time.sleep(self.stall_seconds)
+            return False
+        if self.latency:
+            time.sleep(self.latency)
+        return True
+
+    def next_failure(self) -> int | None:
+        """The status code of a data request that fails, if any."""
+
+        with self._lock:
+            if self.failures > 0:
+                self.failures -= 1
+                return self.failure_status
+
+    def start(self) -> "MockHeuristServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "MockHeuristServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
@@ -0,0 +1,190 @@
+"""Generate synthetic record sets of any size from the mock details."""
+
+import copy
+import importlib
+import random
+from datetime import datetime, timedelta
+from functools import cache
+from typing import Iterator
+
+from mock_data import RECORD_JSON
+
+# First ID of the synthetic records, above the IDs of the mock records
+FIRST_ID = 1_000_000
+
+# First ID of the synthetic detail types
+FIRST_DTY_ID = 90_000
+
+# Modules of the mock details of each data type
+FIXTURE_MODULES = [
+    "blocktext.single",
+    "date.compound_repeated",
+    "date.compound_single",
+    "date.simple_single",
+    "date.timestamp_repeated",
+    "enum.repeated",
+    "enum.single",
+    "file.single",
+    "float.single",
+    "freetext.single",
+    "geo.single",
+    "resource.repeated",
+    "resource.single",
+]
+
+# Number of fields of each data type in the default synthetic record type
+DEFAULT_FIELD_MIX = {
+    "freetext": 2,
+    "blocktext": 1,
+    "float": 1,
+    "enum": 2,
+    "date": 2,
+    "resource": 2,
+    "geo": 1,
+    "file": 1,
+}
+
+
+@cache
+def detail_values() -> dict[str, list]:
+    """
+    Collect the values of the mock details, from the mock records and from the \
+        fixtures of each data type, indexed by the details' data type.
+
+    Examples:
+        >>> values = detail_values()
+        >>> sorted(values)
+        ['blocktext', 'date', 'enum', 'file', 'float', 'freetext', 'geo', 'resource']
+
+    Returns:
+        dict[str, list]: Samples of the details' values, without their IDs.
+    """
+
+    details = []
+    for record in RECORD_JSON["heurist"]["records"]:
+        details.extend(record["details"])
+    for name in FIXTURE_MODULES:
+        module = importlib.import_module(f"mock_data.{name}")
+        for attr, value in vars(module).items():
+            # The polygon's tens of thousands of coordinates would outweigh every
+            # other detail of the synthetic records
+            if attr.startswith("DETAIL") and attr != "DETAIL_POLYGON":
+                details.extend(value if isinstance(value, list) else [value])
+    values = {}
+    for detail in details:
+        sample = {
+            k: v
+            for k, v in detail.items()
+            if k not in ("dty_ID", "fieldName", "fieldType")
+        }
+        values.setdefault(detail["fieldType"], []).append(sample)
+    return values
+
+
+def synthesize_detail_metadata(
+    field_mix: dict[str, int] = DEFAULT_FIELD_MIX,
+) -> list[dict]:
+    """
+    Describe the fields of a synthetic record type, with a given number of \
+        fields of each data type. Every other field of a data type is repeatable.
+
+    Examples:
+        >>> metadata = synthesize_detail_metadata({"date": 2, "geo": 1})
+        >>> [(d["rst_DisplayName"], d["rst_MaxValues"]) for d in metadata]
+        [('date_1', 1), ('date_2', 0), ('geo_1', 1)]
+
+    Args:
+        field_mix (dict[str, int]): Number of fields of each data type.
+
+    Returns:
+        list[dict]: Metadata of the record type's details.
+    """
+
+    metadata = []
+    for dty_Type, count in field_mix.items():
+        for i in range(count):
+            metadata.append(
+                {
+                    "dty_ID": FIRST_DTY_ID + len(metadata),
+                    "rst_DisplayName": f"{dty_Type}_{i + 1}",
+                    "dty_Type": dty_Type,
+                    "rst_MaxValues": 1 if i % 2 == 0 else 0,
+                }
+            )
+    return metadata
+
+
+def generate_records(
+    n: int,
+    detail_metadata: list[dict] | None = None,
+    record_type_id: int = 103,
+    seed: int = 0,
+    fill_rate: float = 0.8,
+    max_repeats: int = 3,
+    first_id: int = FIRST_ID,
+) -> Iterator[dict]:
+    """
+    Generate the records of a record type, whose details' values are drawn \
+        from the mock details of the same data type, in a random but \
+        reproducible way.
+
+    Examples:
+        >>> metadata = synthesize_detail_metadata()
+        >>> records = list(generate_records(2, metadata, fill_rate=1))
+        >>> [r["rec_ID"] for r in records]
+        ['1000000', '1000001']
+        >>> records == list(generate_records(2, metadata, fill_rate=1))
+        True
+        >>> {d["fieldType"] for d in records[0]["details"]} == {
+        ...     d["dty_Type"] for d in metadata
+        ... }
+        True
+
+    Args:
+        n (int): Number of records.
+        detail_metadata (list[dict] | None): Metadata of the record type's \
+            details, i.e. from `TransformedDatabase.get_detail_metadata`. \
+            Defaults to None, the fields of `synthesize_detail_metadata()`.
+        record_type_id (int): ID of the record type. Defaults to 103.
+        seed (int): Seed of the random values. Defaults to 0.
+        fill_rate (float): Probability that a record has a value for a field. \
+            Defaults to 0.8.
+        max_repeats (int): Maximum number of values of a repeatable field. \
+            Defaults to 3.
+        first_id (int): ID of the first record. Defaults to 1000000.
+
+    Yields:
+        Iterator[dict]: Synthetic record.
+    """
+
+    if detail_metadata is None:
+        detail_metadata = synthesize_detail_metadata()
+    rng = random.Random(seed)
+    values = detail_values()
+    start = datetime(2020, 1, 1)
+    for i in range(n):
+        details = []
+        for field in detail_metadata:
+            # Skip the data types of which there is no mock detail, i.e. separators
+            samples = values.get(field["dty_Type"])
+            if not samples or rng.random() >= fill_rate:
+                continue
+            repeats = 1 if field["rst_MaxValues"] == 1 else rng.randint(1, max_repeats)
+            for sample in rng.choices(samples, k=repeats):
+                detail = {
+                    "dty_ID": field["dty_ID"],
+                    "fieldName": field["rst_DisplayName"],
+                    "fieldType": field["dty_Type"],
+                }
+                detail.update(copy.deepcopy(sample))
+                details.append(detail)
+        modified = start + timedelta(minutes=i)
+        yield {
+            "rec_ID": str(first_id + i),
+            "rec_RecTypeID": str(record_type_id),
+            "rec_Title": f"Synthetic record {i}",
+            "rec_Added": start.strftime("%Y-%m-%d %H:%M:%S"),
+            "rec_Modified": modified.strftime("%Y-%m-%d %H:%M:%S"),
+            "rec_AddedByUGrpID": "2",
+            "details": details,
+        }
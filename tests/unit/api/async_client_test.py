@@ -0,0 +1,88 @@
+import asyncio
+import json
+import unittest
+
+import httpx
+from heurist.api.async_client import AsyncHeuristAPIClient
+from heurist.api.retry import RetryPolicy
+
+RECORDS = {
+    "heurist": {
+        "records": [
+            {"rec_ID": "1", "rec_RecTypeID": "103", "rec_AddedByUGrpID": "2"},
+            {"rec_ID": "2", "rec_RecTypeID": "101", "rec_AddedByUGrpID": "2"},
+        ]
+    }
+}
+
+
+class MockServer:
+    """Transport handler that counts the requests it is answering at once."""
+
+    def __init__(self, timeouts: int = 0, failures: int = 0) -> None:
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+        self.timeouts = timeouts
+        self.failures = failures
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        if self.timeouts > 0:
+            self.timeouts -= 1
+            raise httpx.ReadTimeout("Too slow", request=request)
+        if self.failures > 0:
+            self.failures -= 1
+            return httpx.Response(503, headers={"Retry-After": "0"})
+        self.in_flight += 1
+        self.max_in_flight = max(self.in_flight, self.max_in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return httpx.Response(200, content=json.dumps(RECORDS).encode())
+
+
+class AsyncClientTest(unittest.IsolatedAsyncioTestCase):
+    async def test_bounded_concurrency(self):
+        server = MockServer()
+        async with httpx.AsyncClient(transport=httpx.MockTransport(server)) as s:
+            client = AsyncHeuristAPIClient(
+                "mock_db", session=s, max_concurrent_requests=3
+            )
+            results = await asyncio.gather(
+                *[client.get_records(103) for _ in range(10)]
+            )
+        self.assertEqual(server.calls, 10)
+        self.assertEqual(server.max_in_flight, 3)
+        self.assertListEqual([r["rec_ID"] for r in results[0]], ["1"])
+
+    async def test_retry_read_timeout(self):
+        server = MockServer(timeouts=2)
+        async with httpx.AsyncClient(transport=httpx.MockTransport(server)) as s:
+            client = AsyncHeuristAPIClient("mock_db", session=s)
+            records = await client.get_records(101)
+        self.assertEqual(server.calls, 3)
+        self.assertListEqual([r["rec_ID"] for r in records], ["2"])
+
+    async def test_retry_overloaded_server(self):
+        server = MockServer(failures=2)
+        async with httpx.AsyncClient(transport=httpx.MockTransport(server)) as s:
+            client = AsyncHeuristAPIClient("mock_db", session=s)
+            records = await client.get_records(103)
+        self.assertEqual(server.calls, 3)
+        self.assertListEqual([r["rec_ID"] for r in records], ["1"])
+
+    async def test_exhausted_retries(self):
+        server = MockServer(timeouts=3)
+        async with httpx.AsyncClient(transport=httpx.MockTransport(server)) as s:
+            client = AsyncHeuristAPIClient(
+                "mock_db",
+                session=s,
+                retry_policy=RetryPolicy(max_attempts=3, backoff_base=0.01),
+            )
+            with self.assertRaisesRegex(SystemExit, "ReadTimeout"):
+                await client.get_structure()
+        self.assertEqual(server.calls, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from heurist.api.cache import ResponseCache
+from heurist.api.client import HeuristAPIClient
+
+RECORDS = {
+    "heurist": {
+        "records": [
+            {"rec_ID": "1", "rec_RecTypeID": "103", "rec_AddedByUGrpID": "2"},
+        ]
+    }
+}
+
+
+class MockResponse:
+    status_code = 200
+
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+
+    def iter_content(self, chunk_size: int):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i : i + chunk_size]
+
+    def close(self):
+        pass
+
+
+class MockSession:
+    """Session that counts the requests sent to the server."""
+
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+        self.calls = 0
+
+    def get(self, url, timeout=None, stream=False):
+        self.calls += 1
+        return MockResponse(self.content)
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tempdir.name)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_expired_entry(self):
+        cache = ResponseCache(directory=self.dir, ttl_seconds=60)
+        cache.set("url", b"content")
+        # Pretend the response was downloaded 2 minutes ago
+        past = time.time() - 120
+        os.utime(cache.path("url"), times=(past, past))
+        self.assertIsNone(cache.get("url"))
+
+    def test_least_recently_used_eviction(self):
+        cache = ResponseCache(directory=self.dir, max_size_bytes=10**6)
+        for i in range(3):
+            cache.set(f"url{i}", os.urandom(1000))
+            past = time.time() - 100 + i
+            os.utime(cache.path(f"url{i}"), times=(past, past))
+        # Using the oldest entry makes it the most recently used
+        cache.get("url0")
+        cache.max_size = sum(p.stat().st_size for p in cache.entries()) - 1
+        cache.evict()
+        self.assertIsNotNone(cache.get("url0"))
+        self.assertIsNone(cache.get("url1"))
+        self.assertIsNotNone(cache.get("url2"))
+
+    def test_compressed(self):
+        cache = ResponseCache(directory=self.dir)
+        content = b"a" * 10000
+        cache.set("url", content)
+        self.assertLess(cache.path("url").stat().st_size, len(content))
+        self.assertEqual(cache.get("url"), content)
+
+    def test_client_hit(self):
+        session = MockSession(json.dumps(RECORDS).encode())
+        cache = ResponseCache(directory=self.dir)
+        client = HeuristAPIClient("mock_db", session=session, cache=cache)
+        first = client.get_records(103)
+        second = client.get_records(103)
+        self.assertEqual(session.calls, 1)
+        self.assertListEqual(first, second)
+
+    def test_client_streamed_hit(self):
+        session = MockSession(json.dumps(RECORDS).encode())
+        cache = ResponseCache(directory=self.dir)
+        client = HeuristAPIClient("mock_db", session=session, cache=cache)
+        first = list(client.get_records(103, stream=True))
+        second = list(client.get_records(103, stream=True))
+        self.assertEqual(session.calls, 1)
+        self.assertListEqual(first, second)
+
+    def test_incomplete_stream_not_cached(self):
+        session = MockSession(json.dumps(RECORDS).encode())
+        cache = ResponseCache(directory=self.dir)
+        client = HeuristAPIClient("mock_db", session=session, cache=cache)
+        records = client.get_records(103, stream=True)
+        # Stop reading the response after the first record
+        next(records)
+        records.close()
+        self.assertListEqual(cache.entries(), [])
+        self.assertListEqual(list(self.dir.iterdir()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import json
+import unittest
+
+from heurist.api.json_stream import filter_record_stream, iter_json_array
+from mock_data import RECORD_JSON
+
+
+def split(data: bytes, size: int) -> list[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+class StreamParserTest(unittest.TestCase):
+    def setUp(self):
+        self.expected = RECORD_JSON["heurist"]["records"]
+        self.data = json.dumps(RECORD_JSON, indent=2, ensure_ascii=False).encode()
+
+    def test_small_chunks(self):
+        # Chunks of 7 bytes cut through keys, numbers and multi-byte characters
+        actual = list(iter_json_array(split(self.data, 7)))
+        self.assertListEqual(actual, self.expected)
+
+    def test_one_chunk(self):
+        actual = list(iter_json_array([self.data]))
+        self.assertListEqual(actual, self.expected)
+
+    def test_numbers_across_chunks(self):
+        data = b'{"heurist": {"records": [12345, 678]}}'
+        for size in range(1, len(data)):
+            actual = list(iter_json_array(split(data, size)))
+            self.assertListEqual(actual, [12345, 678])
+
+    def test_missing_records(self):
+        with self.assertRaises(KeyError):
+            list(iter_json_array([b'{"heurist": {"database": {}}}']))
+
+    def test_not_json(self):
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_json_array([b"Cannot connect to database"]))
+
+    def test_filter(self):
+        records = iter_json_array(split(self.data, 1024))
+        actual = list(filter_record_stream(records, record_type_id=103, users=(2,)))
+        expected = [r for r in self.expected if r["rec_AddedByUGrpID"] == "2"]
+        self.assertListEqual(actual, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
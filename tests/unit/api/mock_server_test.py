@@ -0,0 +1,71 @@
+import asyncio
+import unittest
+
+from heurist.api.connection import HeuristAPIConnection
+from mock_data import DB_STRUCTURE_XML, RECORD_JSON
+from mock_data.server import MockHeuristServer
+from mock_data.synthetic import generate_records
+
+
+class MockServerTest(unittest.TestCase):
+    def connect(self, server: MockHeuristServer, **kwargs) -> HeuristAPIConnection:
+        return HeuristAPIConnection(
+            db="mock_db", login="user", password="pass", server=server.url, **kwargs
+        )
+
+    def test_structure_and_records(self):
+        with MockHeuristServer() as server, self.connect(server) as client:
+            structure = client.get_structure()
+            records = client.get_records(103)
+            streamed = list(client.get_records(103, stream=True))
+        self.assertEqual(structure, DB_STRUCTURE_XML)
+        self.assertEqual(len(records), len(RECORD_JSON["heurist"]["records"]))
+        self.assertEqual(records, streamed)
+
+    def test_filters(self):
+        with MockHeuristServer() as server, self.connect(server) as client:
+            records = client.get_records(103, modified_since="2024-08-28 14:43:43")
+            none = client.get_records(101)
+        self.assertTrue(all(r["rec_Modified"] > "2024-08-28 14:43:43" for r in records))
+        self.assertEqual(none, [])
+
+    def test_invalid_credentials(self):
+        with MockHeuristServer(login="user", password="secret") as server:
+            with self.assertRaises(SystemExit):
+                with self.connect(server):
+                    pass
+
+    def test_stalled_request_is_retried(self):
+        with MockHeuristServer(stalls=1, stall_seconds=1) as server:
+            with self.connect(server, read_timeout=0.2) as client:
+                records = client.get_records(103)
+        self.assertEqual(len(records), len(RECORD_JSON["heurist"]["records"]))
+        gets = [path for method, path in server.requests if method == "GET"]
+        self.assertEqual(len(gets), 2)
+
+    def test_synthetic_records(self):
+        records = list(generate_records(1000))
+        with MockHeuristServer(records=records) as server:
+            with self.connect(server) as client:
+                downloaded = client.get_records(103)
+        self.assertEqual(
+            [r["rec_ID"] for r in downloaded], [r["rec_ID"] for r in records]
+        )
+
+    def test_async_client(self):
+        async def download(url):
+            async with HeuristAPIConnection(
+                db="mock_db", login="user", password="pass", server=url
+            ) as client:
+                return await asyncio.gather(
+                    client.get_structure(), client.get_records(103)
+                )
+
+        with MockHeuristServer(latency=0.01) as server:
+            structure, records = asyncio.run(download(server.url))
+        self.assertEqual(structure, DB_STRUCTURE_XML)
+        self.assertEqual(len(records), len(RECORD_JSON["heurist"]["records"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
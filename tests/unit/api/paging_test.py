@@ -0,0 +1,64 @@
+import unittest
+from urllib.parse import parse_qs, urlsplit
+
+from heurist.api.connection import HeuristAPIConnection
+from mock_data.server import MockHeuristServer
+from mock_data.synthetic import generate_records
+
+
+class PagingTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.records = list(generate_records(250))
+
+    def connect(self, server: MockHeuristServer, **kwargs) -> HeuristAPIConnection:
+        return HeuristAPIConnection(
+            db="mock_db", login="user", password="pass", server=server.url, **kwargs
+        )
+
+    def offsets(self, server: MockHeuristServer) -> list[int]:
+        return sorted(
+            int(parse_qs(urlsplit(path).query)["offset"][0])
+            for method, path in server.requests
+            if method == "GET" and "offset=" in path
+        )
+
+    def test_pages_are_merged_in_order(self):
+        with MockHeuristServer(records=self.records) as server:
+            with self.connect(server, page_size=40) as client:
+                records = client.get_records(103)
+        self.assertEqual(
+            [r["rec_ID"] for r in records], [r["rec_ID"] for r in self.records]
+        )
+        # The first page, then waves of 5 pages until one isn't full
+        self.assertEqual(self.offsets(server), list(range(0, 440, 40)))
+
+    def test_small_record_type_takes_one_request(self):
+        with MockHeuristServer(records=self.records[:10]) as server:
+            with self.connect(server, page_size=40) as client:
+                records = client.get_records(103)
+        self.assertEqual(len(records), 10)
+        self.assertEqual(self.offsets(server), [0])
+
+    def test_streamed_pages(self):
+        with MockHeuristServer(records=self.records) as server:
+            with self.connect(server, page_size=50) as client:
+                records = list(client.get_records(103, stream=True))
+        self.assertEqual(
+            [r["rec_ID"] for r in records], [r["rec_ID"] for r in self.records]
+        )
+        # The last full page is followed by an empty one
+        self.assertEqual(self.offsets(server), [0, 50, 100, 150, 200, 250])
+
+    def test_stalled_page_is_retried_alone(self):
+        with MockHeuristServer(records=self.records, stalls=1, stall_seconds=1) as (
+            server
+        ):
+            with self.connect(server, page_size=100, read_timeout=0.2) as client:
+                records = client.get_records(103)
+        self.assertEqual(len(records), len(self.records))
+        # Only the first page, which stalled, was requested twice
+        self.assertEqual(self.offsets(server), [0, 0, 100, 200, 300, 400, 500])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from heurist.api.connection import HeuristAPIConnection
+from heurist.api.rate_limit import RateLimiter
+from heurist.api.retry import RetryPolicy
+from mock_data.server import MockHeuristServer
+from mock_data.synthetic import generate_records
+
+
+class RateLimiterTest(unittest.TestCase):
+    def test_rate_is_shared_by_threads(self):
+        limiter = RateLimiter(max_rps=50, burst=1, adaptive=False)
+
+        def request(_):
+            with limiter.request():
+                return time.perf_counter()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            times = list(executor.map(request, range(11)))
+        # After the first request, the others wait for a token every 20 ms
+        self.assertGreaterEqual(max(times) - start, 0.19)
+
+    def test_rate_is_shared_by_tasks(self):
+        limiter = RateLimiter(max_rps=50, burst=1, adaptive=False)
+
+        async def request():
+            async with limiter.request_async():
+                return time.perf_counter()
+
+        async def main():
+            return await asyncio.gather(*[request() for _ in range(11)])
+
+        start = time.perf_counter()
+        times = asyncio.run(main())
+        self.assertGreaterEqual(max(times) - start, 0.19)
+
+    def test_concurrent_requests(self):
+        limiter = RateLimiter(max_rps=1000, max_concurrent=2, adaptive=False)
+        lock = threading.Lock()
+        in_flight = [0, 0]
+
+        def request(_):
+            with limiter.request():
+                with lock:
+                    in_flight[0] += 1
+                    in_flight[1] = max(in_flight)
+                time.sleep(0.02)
+                with lock:
+                    in_flight[0] -= 1
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            list(executor.map(request, range(12)))
+        self.assertEqual(in_flight[1], 2)
+
+    def test_back_off_is_bounded(self):
+        limiter = RateLimiter(max_rps=1, min_rps=0.25)
+        for _ in range(5):
+            limiter.back_off()
+        self.assertEqual(limiter.rate, 0.25)
+        static = RateLimiter(max_rps=1, adaptive=False)
+        static.back_off()
+        self.assertEqual(static.rate, 1)
+
+    def test_large_responses_are_compared_per_mib(self):
+        now = [0.0]
+        limiter = RateLimiter(max_rps=10, clock=lambda: now[0])
+        for seconds, size in [(0.1, 1000), (1.0, 10 * 1024**2), (2.0, 20 * 1024**2)]:
+            now[0] += 1
+            limiter.observe(seconds, size)
+        self.assertEqual(limiter.rate, 10)
+
+    def test_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            RateLimiter(max_rps=0)
+
+
+class RateLimitedClientTest(unittest.TestCase):
+    def connect(self, server: MockHeuristServer, **kwargs) -> HeuristAPIConnection:
+        return HeuristAPIConnection(
+            db="mock_db", login="user", password="pass", server=server.url, **kwargs
+        )
+
+    def test_pages_are_rate_limited(self):
+        records = list(generate_records(200))
+        limiter = RateLimiter(max_rps=20, burst=1, adaptive=False)
+        with MockHeuristServer(records=records) as server:
+            with self.connect(server, page_size=20, rate_limiter=limiter) as client:
+                start = time.perf_counter()
+                downloaded = client.get_records(103)
+                seconds = time.perf_counter() - start
+        self.assertEqual(len(downloaded), len(records))
+        gets = [path for method, path in server.requests if method == "GET"]
+        # The first request takes the bucket's token, the others wait for theirs
+        self.assertGreaterEqual(seconds, (len(gets) - 1) / 20 - 0.01)
+
+    def test_slot_is_held_until_the_stream_is_read(self):
+        limiter = RateLimiter(max_rps=1000, max_concurrent=1, adaptive=False)
+        with MockHeuristServer() as server:
+            with self.connect(server, rate_limiter=limiter) as client:
+                records = client.get_records(103, stream=True)
+                self.assertFalse(limiter._slots.acquire(blocking=False))
+                self.assertEqual(len(list(records)), 175)
+                self.assertTrue(limiter._slots.acquire(blocking=False))
+
+    def test_overloaded_server_lowers_rate(self):
+        limiter = RateLimiter(max_rps=10)
+        policy = RetryPolicy(backoff_base=0.01)
+        with MockHeuristServer(failures=2) as server:
+            with self.connect(
+                server, rate_limiter=limiter, retry_policy=policy
+            ) as client:
+                client.get_structure()
+        self.assertEqual(limiter.rate, 2.5)
+
+    def test_async_client(self):
+        limiter = RateLimiter(max_rps=10, burst=1, adaptive=False)
+
+        async def download(url):
+            async with HeuristAPIConnection(
+                db="mock_db",
+                login="user",
+                password="pass",
+                server=url,
+                rate_limiter=limiter,
+            ) as client:
+                return await asyncio.gather(*[client.get_structure() for _ in range(3)])
+
+        with MockHeuristServer() as server:
+            start = time.perf_counter()
+            asyncio.run(download(server.url))
+            seconds = time.perf_counter() - start
+        self.assertGreaterEqual(seconds, 0.19)
+
+
+if __name__ == "__main__":
+    unittest.main()
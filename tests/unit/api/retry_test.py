@@ -0,0 +1,103 @@
+import json
+import logging
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import requests
+from heurist.api.connection import HeuristAPIConnection
+from heurist.api.retry import RetryPolicy
+from heurist.api.utils import log_requests, logger
+from mock_data import RECORD_JSON
+from mock_data.server import MockHeuristServer
+
+N_RECORDS = len(RECORD_JSON["heurist"]["records"])
+
+
+class FlakySession:
+    """Session whose first requests fail, as if the server reset the connection."""
+
+    def __init__(self, session: requests.Session, resets: int) -> None:
+        self.session = session
+        self.resets = resets
+
+    def get(self, url, **kwargs):
+        if self.resets > 0:
+            self.resets -= 1
+            raise requests.exceptions.ConnectionError("Connection reset by peer")
+        return self.session.get(url, **kwargs)
+
+
+class RetryTest(unittest.TestCase):
+    def connect(self, server: MockHeuristServer, **kwargs) -> HeuristAPIConnection:
+        return HeuristAPIConnection(
+            db="mock_db",
+            login="user",
+            password="pass",
+            server=server.url,
+            retry_policy=kwargs.pop("retry_policy", RetryPolicy(backoff_base=0.01)),
+            **kwargs,
+        )
+
+    def gets(self, server: MockHeuristServer) -> int:
+        return len([path for method, path in server.requests if method == "GET"])
+
+    def test_overloaded_server_is_retried(self):
+        with MockHeuristServer(failures=2) as server, self.connect(server) as client:
+            records = client.get_records(103)
+        self.assertEqual(len(records), N_RECORDS)
+        self.assertEqual(self.gets(server), 3)
+
+    def test_retry_after_is_honoured(self):
+        with MockHeuristServer(failures=1, retry_after=1) as server:
+            with self.connect(server) as client:
+                start = time.perf_counter()
+                client.get_structure()
+                seconds = time.perf_counter() - start
+        self.assertGreaterEqual(seconds, 1)
+        self.assertEqual(self.gets(server), 2)
+
+    def test_other_status_is_not_retried(self):
+        with MockHeuristServer(failures=1, failure_status=500) as server:
+            with self.connect(server) as client:
+                with self.assertRaisesRegex(SystemExit, "Status 500"):
+                    client.get_records(103)
+        self.assertEqual(self.gets(server), 1)
+
+    def test_exhausted_retries(self):
+        policy = RetryPolicy(max_attempts=2, backoff_base=0.01)
+        with MockHeuristServer(failures=5) as server:
+            with self.connect(server, retry_policy=policy) as client:
+                with self.assertRaisesRegex(SystemExit, "Status 503"):
+                    list(client.get_records(103, stream=True))
+        self.assertEqual(self.gets(server), 2)
+
+    def test_connection_reset_is_retried(self):
+        with MockHeuristServer() as server, self.connect(server) as client:
+            client.session = FlakySession(client.session, resets=2)
+            records = client.get_records(103)
+        self.assertEqual(len(records), N_RECORDS)
+
+    def test_structured_log(self):
+        path = Path(tempfile.mkdtemp()).joinpath("requests.log")
+        handler = log_requests(path)
+        try:
+            with MockHeuristServer(failures=1) as server:
+                with self.connect(server) as client:
+                    client.get_records(103)
+        finally:
+            logger.removeHandler(handler)
+            logger.setLevel(logging.NOTSET)
+            handler.close()
+        events = [json.loads(line) for line in path.read_text().splitlines()]
+        self.assertEqual(
+            [(e["event"], e.get("status")) for e in events],
+            [("attempt", 503), ("retry", None), ("attempt", 200)],
+        )
+        self.assertGreater(events[-1]["bytes"], 0)
+        self.assertIn("seconds", events[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
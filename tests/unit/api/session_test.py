@@ -0,0 +1,141 @@
+import asyncio
+import tempfile
+import unittest
+from unittest import mock
+
+import requests
+from heurist.api.connection import HeuristAPIConnection
+from heurist.api.session import SessionStore, build_session
+from mock_data.server import MockHeuristServer
+
+# The server's description of a logged-in user
+LOGGED_IN = {"status": "ok", "data": {"currentUser": {"ugr_ID": 2}}}
+
+
+class SessionStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.store = SessionStore(directory=self.tempdir.name)
+        jar = requests.cookies.RequestsCookieJar()
+        jar.set("PHPSESSID", "abc", domain="heurist.huma-num.fr")
+        self.store.save("mock_db", "user", jar)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def connection(self) -> HeuristAPIConnection:
+        return HeuristAPIConnection(
+            db="mock_db", login="user", password="pw", session_store=self.store
+        )
+
+    def test_expired_session_is_not_reused(self):
+        store = SessionStore(directory=self.tempdir.name, ttl_seconds=-1)
+        store.save("mock_db", "user", requests.cookies.RequestsCookieJar())
+        self.assertFalse(store.load("mock_db", "user", requests.Session().cookies))
+        self.assertFalse(store.path("mock_db", "user").exists())
+
+    def test_stored_session_skips_login(self):
+        accepted = mock.Mock(status_code=200, **{"json.return_value": LOGGED_IN})
+        with (
+            mock.patch.object(requests.Session, "get", return_value=accepted) as get,
+            mock.patch.object(requests.Session, "post") as post,
+        ):
+            with self.connection() as client:
+                cookie = client.session.cookies.get("PHPSESSID")
+        get.assert_called_once()
+        post.assert_not_called()
+        self.assertEqual(cookie, "abc")
+
+
+class ExpiredSessionTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.store = SessionStore(directory=self.tempdir.name)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def connect(self, server: MockHeuristServer) -> HeuristAPIConnection:
+        return HeuristAPIConnection(
+            db="mock_db",
+            login="user",
+            password="pass",
+            server=server.url,
+            session_store=self.store,
+        )
+
+    def logins(self, server: MockHeuristServer) -> int:
+        return len([path for method, path in server.requests if method == "POST"])
+
+    def test_valid_session_is_reused(self):
+        with MockHeuristServer() as server:
+            with self.connect(server):
+                pass
+            with self.connect(server) as client:
+                client.get_structure()
+        self.assertEqual(self.logins(server), 1)
+
+    def test_expired_session_logs_in_again(self):
+        with MockHeuristServer() as server:
+            with self.connect(server) as client:
+                expired = client.session.cookies.get_dict()
+            server.expire_sessions()
+            with self.connect(server) as client:
+                records = client.get_records(103)
+        self.assertEqual(len(records), 175)
+        self.assertEqual(self.logins(server), 2)
+        # The stored session is replaced by the new one
+        jar = requests.cookies.RequestsCookieJar()
+        self.store.load("mock_db", "user", jar, server=server.url)
+        self.assertNotEqual(jar.get_dict(), expired)
+
+    def test_expired_session_logs_in_again_async(self):
+        async def download(server):
+            async with self.connect(server) as client:
+                return await client.get_structure()
+
+        with MockHeuristServer() as server:
+            asyncio.run(download(server))
+            server.expire_sessions()
+            structure = asyncio.run(download(server))
+        self.assertIsNotNone(structure)
+        self.assertEqual(self.logins(server), 2)
+
+    def test_rejected_session_is_discarded(self):
+        with MockHeuristServer(failure_status=401) as server:
+            with self.connect(server):
+                pass
+            with self.assertRaisesRegex(SystemExit, "Status 401"):
+                with self.connect(server) as client:
+                    server.failures = 1
+                    client.get_structure()
+        path = self.store.path("mock_db", "user", server=server.url)
+        self.assertFalse(path.exists())
+
+    def test_other_errors_keep_the_session(self):
+        with MockHeuristServer() as server:
+            with self.connect(server):
+                pass
+            with self.assertRaises(KeyboardInterrupt):
+                with self.connect(server):
+                    raise KeyboardInterrupt
+        path = self.store.path("mock_db", "user", server=server.url)
+        self.assertTrue(path.exists())
+
+
+class BuildSessionTest(unittest.TestCase):
+    def test_pool_and_retries(self):
+        session = build_session(pool_size=12, max_retries=2)
+        adapter = session.get_adapter("https://heurist.huma-num.fr")
+        self.assertEqual(adapter._pool_maxsize, 12)
+        self.assertEqual(adapter.max_retries.connect, 2)
+        self.assertFalse(adapter.max_retries.read)
+
+    def test_requests_are_only_retried_by_the_client(self):
+        adapter = build_session().get_adapter("https://heurist.huma-num.fr")
+        self.assertEqual(adapter.max_retries.total, 0)
+        self.assertEqual(adapter.max_retries.connect, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
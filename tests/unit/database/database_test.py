@@ -1,8 +1,10 @@
 import unittest
 
+import duckdb
+import pyarrow as pa
+from heurist.database.database import TransformedDatabase, ValidatedRecords
+from heurist.models.dynamic.arrow import model_to_arrow_schema
 from heurist.validators.record_validator import VALIDATION_LOG
-
-from heurist.database.database import TransformedDatabase
 from mock_data import DB_STRUCTURE_XML, RECORD_JSON
 
 
@@ -31,6 +33,53 @@ class DatabaseTest(unittest.TestCase):
         # Confirm that the converted record's Heurist ID (H-ID) is an integer
         self.assertIsInstance(d["H-ID"], int)
 
+    def test_streamed_records(self):
+        # Load the extracted records from a generator, as when streaming them
+        rel = self.db.insert_records(
+            records=(r for r in self.extracted_records),
+            record_type_id=self.rectype,
+        )
+        self.assertEqual(len(rel.fetchall()), len(self.extracted_records))
+
+    def test_column_types_follow_model(self):
+        # Load the records and compare the table's column types to the model's
+        rel = self.db.insert_records(
+            records=self.extracted_records,
+            record_type_id=self.rectype,
+        )
+        model = self.db.pydantic_models[self.rectype].model
+        schema = model_to_arrow_schema(model)
+        self.assertEqual(rel.columns, schema.names)
+        self.assertEqual(rel.arrow().schema, schema)
+
+    def test_failed_upsert_keeps_the_loaded_records(self):
+        self.db.insert_records(records=self.extracted_records, record_type_id=103)
+        last_modified = self.db.get_last_modified(record_type_id=103)
+        # Merge records with a column that the table doesn't have, so that their
+        # insert fails after the existing rows were deleted
+        arrow_table = self.db.validate_records(103, self.extracted_records).arrow_table
+        arrow_table = arrow_table.append_column(
+            "unknown", pa.array([0] * arrow_table.num_rows)
+        )
+        validated = ValidatedRecords(103, arrow_table, "2099-01-01 00:00:00")
+        with self.assertRaises(duckdb.Error):
+            self.db.load_records(validated=validated, upsert=True)
+        count = self.db.conn.table("Story").count("*").fetchone()[0]
+        self.assertEqual(count, len(self.extracted_records))
+        self.assertEqual(self.db.get_last_modified(record_type_id=103), last_modified)
+
+    def test_empty_columns_keep_their_types(self):
+        # Load records without any details, so that every data column is empty
+        records = [{**r, "details": []} for r in self.extracted_records]
+        rel = self.db.insert_records(records=records, record_type_id=self.rectype)
+
+        # The column types come from the model's DDL, not from the (null) data
+        conn = duckdb.connect()
+        conn.execute(self.db.pydantic_models[self.rectype].create_table_statement)
+        expected = conn.table(rel.alias)
+        self.assertEqual(rel.types, expected.types)
+        self.assertIn("STRUCT", str(rel.types))
+
 
 if __name__ == "__main__":
     unittest.main()
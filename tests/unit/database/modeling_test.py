@@ -1,9 +1,9 @@
 import unittest
 
 import duckdb
-from heurist.validators.record_validator import VALIDATION_LOG
-
 from heurist.database.database import TransformedDatabase
+from heurist.sql import RECORD_TYPE_METADATA
+from heurist.validators.record_validator import VALIDATION_LOG
 from mock_data import DB_STRUCTURE_XML
 
 
@@ -35,6 +35,22 @@ class ModelingTest(unittest.TestCase):
             r = self.db.describe_record_schema(id)
             self.assertIsNotNone(r)
 
+    def test_one_query_describes_each_record_type(self):
+        descriptions = self.db.describe_record_schemas(self.record_types)
+        self.assertEqual(list(descriptions), self.record_types)
+        for id in self.record_types:
+            with self.subTest(rty_ID=id):
+                expected = self.db.describe_record_schema(id)
+                self.assertEqual(descriptions[id].columns, expected.columns)
+                self.assertEqual(descriptions[id].fetchall(), expected.fetchall())
+
+    def test_one_query_selects_each_record_types_metadata(self):
+        metadata = self.db.get_detail_metadata(self.record_types)
+        for id in self.record_types:
+            with self.subTest(rty_ID=id):
+                rel = self.db.conn.sql(query=RECORD_TYPE_METADATA, params=[id])
+                self.assertEqual(metadata[id], rel.pl().to_dicts())
+
 
 if __name__ == "__main__":
     unittest.main()
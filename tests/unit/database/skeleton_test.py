@@ -1,7 +1,9 @@
 import unittest
 
+import duckdb
+import polars as pl
 from heurist.database.basedb import HeuristDatabase
-
+from heurist.models.structural.loader import load_structure_tables
 from mock_data import DB_STRUCTURE_XML
 
 
@@ -12,7 +14,44 @@ class DuckBaseTest(unittest.TestCase):
 
         self.db = HeuristDatabase(hml_xml=DB_STRUCTURE_XML)
         rel = self.db.conn.sql("show tables")
-        self.assertEqual(len(rel), 5)
+        # Internal tables, such as the structure's snapshot, start with "_"
+        tables = [t for (t,) in rel.fetchall() if not t.startswith("_")]
+        self.assertEqual(len(tables), 5)
+
+    def test_streamed_tables_match_model(self):
+        """The tables streamed from the XML should have the same rows as the \
+        tables built from the nested HMLStructure model."""
+
+        db = HeuristDatabase(hml_xml=DB_STRUCTURE_XML)
+        tables = load_structure_tables(DB_STRUCTURE_XML)
+        for name, model_name in HeuristDatabase.BASE_TABLES:
+            with self.subTest(table=name):
+                model = getattr(getattr(db.hml, model_name), name)
+                expected = pl.DataFrame(model, infer_schema_length=None)
+                streamed = pl.from_arrow(tables[name])
+                self.assertEqual(streamed.columns, expected.columns)
+                self.assertEqual(streamed.to_dicts(), expected.to_dicts())
+
+    def test_snapshot_is_reused_for_same_structure(self):
+        conn = duckdb.connect()
+        first = HeuristDatabase(hml_xml=DB_STRUCTURE_XML, conn=conn)
+        self.assertFalse(first.from_snapshot)
+        second = HeuristDatabase(hml_xml=DB_STRUCTURE_XML, conn=conn)
+        self.assertTrue(second.from_snapshot)
+        self.assertEqual(len(second.conn.table("rty")), len(first.conn.table("rty")))
+
+    def test_snapshot_is_replaced_for_changed_structure(self):
+        conn = duckdb.connect()
+        HeuristDatabase(hml_xml=DB_STRUCTURE_XML, conn=conn)
+        changed = DB_STRUCTURE_XML.replace(b"My record types", b"Changed group")
+        db = HeuristDatabase(hml_xml=changed, conn=conn)
+        self.assertFalse(db.from_snapshot)
+        (name,) = db.conn.sql(
+            "SELECT rtg_Name FROM rtg WHERE rtg_Name = 'Changed group'"
+        ).fetchone()
+        self.assertEqual(name, "Changed group")
+        (n,) = db.conn.sql("SELECT count(*) FROM _structure_snapshot").fetchone()
+        self.assertEqual(n, 1)
 
 
 if __name__ == "__main__":
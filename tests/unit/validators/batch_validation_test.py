@@ -0,0 +1,48 @@
+import gc
+import unittest
+import weakref
+
+from heurist.database.database import TransformedDatabase
+from heurist.models.dynamic import HeuristRecord
+from heurist.validators.record_validator import (
+    VALIDATION_LOG,
+    RecordValidator,
+    list_adapter,
+)
+from mock_data import DB_STRUCTURE_XML, RECORD_JSON
+
+
+class BatchValidationTest(unittest.TestCase):
+    def setUp(self) -> None:
+        db = TransformedDatabase(DB_STRUCTURE_XML)
+        self.model = db.pydantic_models[103].model
+        self.records = RECORD_JSON["heurist"]["records"]
+
+    def tearDown(self):
+        VALIDATION_LOG.unlink(missing_ok=True)
+
+    def test_same_output_as_per_record_validation(self):
+        validator = RecordValidator(self.model, self.records, rty_ID=103)
+        expected = [m.model_dump(by_alias=True) for m in validator]
+
+        validator = RecordValidator(self.model, self.records, rty_ID=103)
+        batches = list(validator.iter_batches(batch_size=7))
+        self.assertEqual([r for batch in batches for r in batch], expected)
+        self.assertEqual(len(batches[0]), 7)
+
+    def test_adapter_does_not_keep_model_alive(self):
+        db = TransformedDatabase(DB_STRUCTURE_XML)
+        metadata = db.get_detail_metadata([103])[103]
+        model = HeuristRecord(
+            rty_ID=103, rty_Name="Story", detail_metadata=metadata
+        ).model
+        list(RecordValidator(model, self.records, rty_ID=103).iter_batches())
+        self.assertIs(list_adapter(model), list_adapter(model))
+        ref = weakref.ref(model)
+        del model
+        gc.collect()
+        self.assertIsNone(ref())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+from heurist.validators.parse_heurist_date import (
+    _parse_heurist_date,
+    _parse_heurist_date_cached,
+    parse_heurist_date,
+)
+
+RAW_DATES = ["1180", 1180, 1250.1231, "1250.12", "-0044-03-15", " 2024-03-19 "]
+
+
+class DateCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        _parse_heurist_date_cached.cache_clear()
+
+    def test_same_result_as_uncached(self):
+        for _ in range(2):
+            for raw in RAW_DATES:
+                with self.subTest(raw=raw):
+                    self.assertEqual(
+                        parse_heurist_date(raw).model_dump(),
+                        _parse_heurist_date(raw).model_dump(),
+                    )
+        info = _parse_heurist_date_cached.cache_info()
+        self.assertEqual(info.misses, len(RAW_DATES))
+        self.assertEqual(info.hits, len(RAW_DATES))
+
+    def test_invalid_date_is_not_cached(self):
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                parse_heurist_date("circa 1200")
+        self.assertEqual(_parse_heurist_date_cached.cache_info().currsize, 0)
+
+    def test_cached_date_is_immutable(self):
+        date = parse_heurist_date("1180")
+        with self.assertRaises(Exception):
+            date.year = 1181
+        self.assertEqual(parse_heurist_date("1180").iso, "1180-01-01")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from heurist.models.dynamic import HeuristRecord
+from heurist.validators.record_validator import VALIDATION_LOG, RecordValidator
+
+METADATA = [
+    {
+        "dty_ID": 1,
+        "rst_DisplayName": "name",
+        "dty_Type": "freetext",
+        "rst_MaxValues": 1,
+    }
+]
+
+
+def detail(dty_ID: int, value: str) -> dict:
+    return {
+        "dty_ID": dty_ID,
+        "value": value,
+        "fieldName": f"field {dty_ID}",
+        "fieldType": "freetext",
+    }
+
+
+class DetailPlanTest(unittest.TestCase):
+    def setUp(self) -> None:
+        hr = HeuristRecord(rty_ID=100, rty_Name="Example", detail_metadata=METADATA)
+        self.validator = RecordValidator(hr.model, records=[], rty_ID=100)
+
+    def tearDown(self):
+        VALIDATION_LOG.unlink(missing_ok=True)
+
+    def test_known_detail(self):
+        record = {"rec_ID": 1, "rec_RecTypeID": 100, "details": [detail(1, "A")]}
+        kwargs = self.validator.flatten_details_to_dynamic_pydantic_fields(record)
+        self.assertEqual(kwargs["DTY1"], "A")
+
+    def test_detail_outside_model(self):
+        # A detail type that's not in the record structure isn't converted, but
+        # repeated values are still reported in the log.
+        record = {
+            "rec_ID": 1,
+            "rec_RecTypeID": 100,
+            "details": [detail(2, "A"), detail(2, "B")],
+        }
+        with self.assertLogs(level="WARNING") as logs:
+            kwargs = self.validator.flatten_details_to_dynamic_pydantic_fields(record)
+        self.assertEqual(len(logs.records), 1)
+        self.assertNotIn("DTY2", kwargs)
+
+        record["details"] = [detail(2, "A")]
+        kwargs = self.validator.flatten_details_to_dynamic_pydantic_fields(record)
+        self.assertNotIn("DTY2", kwargs)
+
+
+if __name__ == "__main__":
+    unittest.main()
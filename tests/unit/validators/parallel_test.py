@@ -0,0 +1,105 @@
+import unittest
+from unittest.mock import patch
+
+from heurist.database.database import TransformedDatabase
+from heurist.models.dynamic import HeuristRecord
+from heurist.validators.parallel import (
+    create_process_pool,
+    validate_in_processes,
+)
+from heurist.validators.record_validator import VALIDATION_LOG
+from mock_data import DB_STRUCTURE_XML, RECORD_JSON
+
+# Detail that takes only 1 value
+LIMITED_METADATA = [
+    {
+        "dty_ID": 1090,
+        "rst_DisplayName": "language",
+        "dty_Type": "enum",
+        "rst_MaxValues": 1,
+    }
+]
+
+# Records whose limited detail has 2 values
+DETAIL = {
+    "dty_ID": 1090,
+    "value": "9728",
+    "termLabel": "dum (Middle Dutch)",
+    "termCode": "dum",
+    "fieldName": "language",
+    "fieldType": "enum",
+    "conceptID": "",
+}
+RECORDS = [
+    {"rec_ID": i, "rec_RecTypeID": 100, "details": [DETAIL, DETAIL]}
+    for i in range(1000, 1004)
+]
+
+
+class ParallelValidationTest(unittest.TestCase):
+    def tearDown(self):
+        VALIDATION_LOG.unlink(missing_ok=True)
+
+    def test_same_rows_as_serial_validation(self):
+        records = RECORD_JSON["heurist"]["records"]
+        serial = TransformedDatabase(DB_STRUCTURE_XML).insert_records(
+            record_type_id=103, records=records
+        )
+        parallel = TransformedDatabase(DB_STRUCTURE_XML).insert_records(
+            record_type_id=103, records=records, processes=2, chunk_size=1
+        )
+        self.assertEqual(serial.fetchall(), parallel.fetchall())
+
+    def test_small_record_type_does_not_start_a_pool(self):
+        records = RECORD_JSON["heurist"]["records"]
+        db = TransformedDatabase(DB_STRUCTURE_XML)
+        with patch("heurist.validators.parallel.ProcessPoolExecutor") as executor:
+            validated = db.validate_records(
+                record_type_id=103, records=iter(records), processes=2
+            )
+        executor.assert_not_called()
+        self.assertEqual(validated.arrow_table.num_rows, len(records))
+
+    def test_record_types_share_a_pool(self):
+        db = TransformedDatabase(DB_STRUCTURE_XML)
+        records = RECORD_JSON["heurist"]["records"]
+        with (
+            create_process_pool(2) as pool,
+            patch("heurist.validators.parallel.create_process_pool") as create,
+        ):
+            for batch in [records[:100], records[100:]]:
+                validated = db.validate_records(
+                    record_type_id=103,
+                    records=batch,
+                    processes=2,
+                    chunk_size=10,
+                    pool=pool,
+                )
+                self.assertEqual(validated.arrow_table.num_rows, len(batch))
+        create.assert_not_called()
+
+    def test_chunks_keep_order(self):
+        records = RECORD_JSON["heurist"]["records"]
+        record_type = TransformedDatabase(DB_STRUCTURE_XML).pydantic_models[103]
+        table = validate_in_processes(
+            record_type=record_type, records=iter(records), processes=2, chunk_size=1
+        )
+        expected = [int(r["rec_ID"]) for r in records]
+        self.assertEqual(table["H-ID"].to_pylist(), expected)
+
+    def test_warnings_are_logged_by_main_process(self):
+        hr = HeuristRecord(
+            rty_ID=100, rty_Name="Example", detail_metadata=LIMITED_METADATA
+        )
+        with self.assertLogs(level="WARNING") as logs:
+            validate_in_processes(
+                record_type=hr, records=RECORDS, processes=2, chunk_size=1
+            )
+        # Every worker's warning is logged once, in the order of the records
+        self.assertEqual(len(logs.records), len(RECORDS))
+        for log, record in zip(logs.output, RECORDS):
+            self.assertIn("[rec_ID {}]".format(record["rec_ID"]), log)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+from itertools import chain
+
+from heurist.models.dynamic import HeuristRecord
+from heurist.validators.record_validator import VALIDATION_LOG, RecordValidator
+from mock_data.synthetic import generate_records, synthesize_detail_metadata
+
+
+class SyntheticRecordsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.metadata = synthesize_detail_metadata()
+        self.model = HeuristRecord(
+            rty_ID=103, rty_Name="Synthetic", detail_metadata=self.metadata
+        ).model
+
+    def tearDown(self):
+        VALIDATION_LOG.unlink(missing_ok=True)
+
+    def test_records_are_valid(self):
+        records = list(generate_records(500, self.metadata, seed=1))
+        validator = RecordValidator(self.model, records, rty_ID=103)
+        rows = list(chain.from_iterable(validator.iter_batches()))
+        self.assertEqual(len(rows), 500)
+        # Every field of the record type has a value in some record
+        for field in self.metadata:
+            name = field["rst_DisplayName"]
+            column = name if field["dty_Type"] != "resource" else f"{name} H-ID"
+            self.assertTrue(any(row[column] for row in rows), column)
+
+    def test_records_are_reproducible(self):
+        first = list(generate_records(50, self.metadata, seed=2))
+        second = list(generate_records(50, self.metadata, seed=2))
+        self.assertEqual(first, second)
+        other = list(generate_records(50, self.metadata, seed=3))
+        self.assertNotEqual(first, other)
+
+
+if __name__ == "__main__":
+    unittest.main()
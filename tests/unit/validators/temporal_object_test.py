@@ -0,0 +1,66 @@
+import unittest
+
+from heurist.models.dynamic.date import TemporalObject, dump_temporal_object
+from heurist.validators.detail_validator import DetailValidator
+from mock_data.date import (
+    compound_repeated,
+    compound_single,
+    simple_single,
+    timestamp_repeated,
+)
+from pydantic import ValidationError
+
+PIPE_DATE = "|VER=1|TYP=p|TPQ=1449-01-01|TAQ=1480-12-31"
+
+RAW_TEMPORAL_OBJECTS = [
+    {},
+    {"value": "2024-03-19"},
+    {"value": 1188, "comment": "circa"},
+    {"start": None, "end": None, "timestamp": None},
+    {"start": {"earliest": "1180", "latest": 1231.05, "profile": "0"}},
+    {"end": {"determination": "3"}, "determination": "1", "profile": "2"},
+    {"timestamp": {"in": "1200", "type": "s", "circa": True}},
+    {"timestamp": {"circa": None}},
+    # Values that only the Pydantic model converts
+    {"timestamp": {"circa": "true"}},
+    {"timestamp": {"circa": 1}},
+]
+
+INVALID_TEMPORAL_OBJECTS = [
+    {"profile": "9"},
+    {"determination": ""},
+    {"comment": 5},
+    {"value": ""},
+    {"start": "1180"},
+]
+
+
+def model_dump(raw: dict) -> dict:
+    return TemporalObject.model_validate(raw).model_dump(by_alias=True)
+
+
+class TemporalObjectTest(unittest.TestCase):
+    def test_same_output_as_model(self):
+        pipe_date = DetailValidator.parse_pipe_date(PIPE_DATE)
+        for raw in RAW_TEMPORAL_OBJECTS + [pipe_date]:
+            with self.subTest(raw=raw):
+                self.assertEqual(dump_temporal_object(raw), model_dump(raw))
+
+    def test_same_error_as_model(self):
+        for raw in INVALID_TEMPORAL_OBJECTS:
+            with self.subTest(raw=raw):
+                with self.assertRaises(ValidationError):
+                    dump_temporal_object(raw)
+
+    def test_fixtures(self):
+        details = [simple_single.DETAIL, compound_single.DETAIL]
+        details += compound_repeated.DETAIL + timestamp_repeated.DETAIL
+        for detail in details:
+            value = detail.get("value")
+            raw = value if isinstance(value, dict) else detail
+            with self.subTest(detail=detail):
+                self.assertEqual(DetailValidator.convert(detail), model_dump(raw))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,198 @@
+import copy
+import json
+import threading
+import time
+import unittest
+
+import duckdb
+from heurist.api.connection import HeuristAPIConnection
+from heurist.validators.record_validator import VALIDATION_LOG
+from heurist.workflows import extract_transform_load
+from mock_data import DB_STRUCTURE_XML, RECORD_JSON
+from mock_data.server import MockHeuristServer
+
+
+class OfflineClient:
+    """Stand-in for the API client that serves the mock data."""
+
+    def __init__(self, delay: float = 0.0, records: list | None = None) -> None:
+        self.delay = delay
+        self.page_size = None
+        self.threads = set()
+        # Threads that read the streamed records
+        self.readers = set()
+        self.requests = []
+        if records is None:
+            records = RECORD_JSON["heurist"]["records"]
+        self.records = records
+
+    def get_structure(self) -> bytes:
+        return DB_STRUCTURE_XML
+
+    def get_records(
+        self,
+        record_type_id: int,
+        users: tuple = (),
+        stream: bool = False,
+        modified_since: str | None = None,
+        timings: dict | None = None,
+    ) -> list:
+        self.threads.add(threading.get_ident())
+        self.requests.append((record_type_id, modified_since))
+        time.sleep(self.delay)
+        records = [
+            r
+            for r in self.records
+            if r["rec_RecTypeID"] == str(record_type_id)
+            and (not modified_since or r["rec_Modified"] > modified_since)
+        ]
+        return self.read(records) if stream else records
+
+    def read(self, records: list):
+        for record in records:
+            self.readers.add(threading.get_ident())
+            yield record
+
+    def get_records_content(
+        self,
+        record_type_id: int,
+        users: tuple = (),
+        modified_since: str | None = None,
+    ) -> bytes:
+        records = self.get_records(record_type_id, users, False, modified_since)
+        return json.dumps({"heurist": {"records": records}}).encode("utf-8")
+
+
+class ConcurrentDownloadTest(unittest.TestCase):
+    def tearDown(self):
+        VALIDATION_LOG.unlink(missing_ok=True)
+
+    def load(self, workers: int) -> tuple[OfflineClient, list]:
+        client = OfflineClient(delay=0.05)
+        conn = duckdb.connect()
+        extract_transform_load(
+            client=client,
+            duckdb_connection=conn,
+            workers=workers,
+        )
+        tables = sorted(t[0] for t in conn.sql("show tables").fetchall())
+        return client, tables
+
+    def test_same_tables_as_serial_download(self):
+        _, serial = self.load(workers=1)
+        client, concurrent = self.load(workers=4)
+        self.assertListEqual(serial, concurrent)
+        self.assertGreater(len(client.threads), 1)
+
+    def test_streams_are_read_by_the_download_threads(self):
+        client = OfflineClient(delay=0.05)
+        extract_transform_load(
+            client=client, duckdb_connection=duckdb.connect(), workers=4, stream=True
+        )
+        # The records are read where they're downloaded, not by the validation
+        self.assertTrue(client.readers)
+        self.assertLessEqual(client.readers, client.threads)
+
+
+class IncrementalDownloadTest(unittest.TestCase):
+    def tearDown(self):
+        VALIDATION_LOG.unlink(missing_ok=True)
+
+    def test_upsert_modified_records(self):
+        records = copy.deepcopy(RECORD_JSON["heurist"]["records"])
+        conn = duckdb.connect()
+        extract_transform_load(
+            client=OfflineClient(records=records), duckdb_connection=conn
+        )
+        count = conn.table("Story").count("*").fetchone()[0]
+
+        # Edit one of the records on the "server"
+        edited = records[0]
+        edited["rec_Modified"] = "2099-01-01 00:00:00"
+        edited["details"][0]["value"] = "Edited name"
+
+        client = OfflineClient(records=records)
+        extract_transform_load(client=client, duckdb_connection=conn, incremental=True)
+
+        # Only the records modified since the last download were requested
+        since = dict(client.requests)[103]
+        self.assertIsNotNone(since)
+        self.assertEqual(count, conn.table("Story").count("*").fetchone()[0])
+        name = conn.sql(
+            f"""SELECT preferred_name FROM Story WHERE "H-ID" = {edited["rec_ID"]}"""
+        ).fetchone()[0]
+        self.assertEqual(name, "Edited name")
+
+
+class FailingClient(OfflineClient):
+    def get_records_content(self, record_type_id: int, *args, **kwargs) -> bytes:
+        if record_type_id == 103:
+            raise SystemExit("Status 500")
+        return super().get_records_content(record_type_id, *args, **kwargs)
+
+
+class PipelineErrorTest(unittest.TestCase):
+    def tearDown(self):
+        VALIDATION_LOG.unlink(missing_ok=True)
+
+    def test_failed_download_is_raised(self):
+        conn = duckdb.connect()
+        with self.assertRaisesRegex(SystemExit, "Status 500"):
+            extract_transform_load(
+                client=FailingClient(), duckdb_connection=conn, workers=2
+            )
+        tables = [t for (t,) in conn.sql("show tables").fetchall()]
+        self.assertNotIn("Story", tables)
+
+
+class MetricsTest(unittest.TestCase):
+    def tearDown(self):
+        VALIDATION_LOG.unlink(missing_ok=True)
+
+    def stages(self, stream: bool = False, page_size: int | None = None) -> dict:
+        conn = duckdb.connect()
+        with MockHeuristServer() as server:
+            with HeuristAPIConnection(
+                db="mock_db",
+                login="user",
+                password="pass",
+                server=server.url,
+                page_size=page_size,
+            ) as client:
+                extract_transform_load(
+                    client=client, duckdb_connection=conn, stream=stream
+                )
+        rows = conn.sql(
+            "SELECT stage, records, payload_bytes FROM _etl_metrics WHERE rty_ID = 103"
+        ).fetchall()
+        return {stage: (records, size) for stage, records, size in rows}
+
+    def assertFetchAndDecode(self, stages: dict):
+        self.assertEqual(
+            set(stages),
+            {
+                "fetch",
+                "json decode",
+                "flatten",
+                "validate",
+                "dataframe build",
+                "table create",
+            },
+        )
+        self.assertEqual(stages["json decode"][0], 175)
+        self.assertEqual(stages["table create"][0], 175)
+        self.assertGreater(stages["fetch"][1], 0)
+
+    def test_stages_of_each_record_type(self):
+        self.assertFetchAndDecode(self.stages())
+
+    def test_streamed_records_are_decoded_apart_from_fetch(self):
+        self.assertFetchAndDecode(self.stages(stream=True))
+
+    def test_pages_are_decoded_apart_from_fetch(self):
+        self.assertFetchAndDecode(self.stages(page_size=50))
+        self.assertFetchAndDecode(self.stages(stream=True, page_size=50))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import duckdb
+from heurist.database.database import TransformedDatabase
+from heurist.validators.record_validator import VALIDATION_LOG
+from heurist.workflows.export import export_table, export_tables
+from mock_data import DB_STRUCTURE_XML, RECORD_JSON
+
+
+class ExportTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.conn = duckdb.connect()
+        db = TransformedDatabase(DB_STRUCTURE_XML, conn=cls.conn)
+        db.insert_records(record_type_id=103, records=RECORD_JSON["heurist"]["records"])
+
+    @classmethod
+    def tearDownClass(cls):
+        VALIDATION_LOG.unlink(missing_ok=True)
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.outdir = Path(self.tempdir.name)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_parquet_keeps_nested_columns(self):
+        fp = export_table(
+            conn=self.conn,
+            table_name="Story",
+            outdir=self.outdir,
+            output_format="parquet",
+            compression="zstd",
+            row_group_size=10,
+        )
+        self.assertEqual(fp.name, "Story.parquet")
+        exported = self.conn.read_parquet(str(fp))
+        self.assertEqual(exported.types, self.conn.table("Story").types)
+        self.assertEqual(
+            exported.fetchall(), self.conn.table("Story").order('"H-ID"').fetchall()
+        )
+        (compression,) = self.conn.sql(
+            f"SELECT DISTINCT compression FROM parquet_metadata('{fp}')"
+        ).fetchone()
+        self.assertEqual(compression, "ZSTD")
+
+    def test_hive_partitions(self):
+        path = export_table(
+            conn=self.conn,
+            table_name="Story",
+            outdir=self.outdir,
+            output_format="parquet",
+            partition_by=("type_id",),
+        )
+        self.assertTrue(path.joinpath("type_id=103").is_dir())
+        rel = self.conn.read_parquet(
+            str(path.joinpath("**", "*.parquet")), hive_partitioning=True
+        )
+        expected = self.conn.table("Story").count("*").fetchone()
+        self.assertEqual(rel.count("*").fetchone(), expected)
+
+    def test_tables_exported_concurrently(self):
+        tables = ["Story", "StoryCopy1", "StoryCopy2"]
+        for name in tables[1:]:
+            self.conn.execute(f"CREATE OR REPLACE TABLE {name} AS FROM Story")
+        paths = export_tables(
+            conn=self.conn,
+            tables=tables,
+            outdir=self.outdir,
+            workers=3,
+            output_format="parquet",
+            sort=False,
+        )
+        self.assertEqual([p.stem for p in paths], tables)
+        for path in paths:
+            count = self.conn.read_parquet(str(path)).count("*").fetchone()
+            self.assertEqual(count, self.conn.table("Story").count("*").fetchone())
+
+    def test_unknown_partition_column(self):
+        with self.assertRaises(ValueError):
+            export_table(
+                conn=self.conn,
+                table_name="Story",
+                outdir=self.outdir,
+                partition_by=("rec_AddedByUGrpID",),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
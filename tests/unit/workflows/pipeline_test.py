@@ -0,0 +1,68 @@
+import threading
+import time
+import unittest
+
+from heurist.workflows.pipeline import Pipeline, Stage
+
+
+class PipelineTest(unittest.TestCase):
+    def test_stages_overlap(self):
+        def slow(x):
+            time.sleep(0.05)
+            return x
+
+        pipeline = Pipeline(stages=[Stage("a", slow), Stage("b", slow)])
+        start = time.perf_counter()
+        self.assertEqual(sorted(pipeline.run(range(10))), list(range(10)))
+        # One stage after the other would take 10 x 2 x 0.05 seconds
+        self.assertLess(time.perf_counter() - start, 0.8)
+
+    def test_backpressure(self):
+        produced = []
+        in_flight = []
+
+        def produce(x):
+            produced.append(x)
+            return x
+
+        pipeline = Pipeline(stages=[Stage("produce", produce)], queue_size=2)
+        for consumed, _ in enumerate(pipeline.run(range(50)), start=1):
+            in_flight.append(len(produced) - consumed)
+            time.sleep(0.005)
+        self.assertEqual(len(produced), 50)
+        # At most a full queue, and the item being produced, wait for the consumer
+        self.assertLessEqual(max(in_flight), 3)
+
+    def test_error_stops_pipeline(self):
+        fed = []
+
+        def items():
+            for i in range(1000):
+                fed.append(i)
+                yield i
+
+        def fail(x):
+            if x == 3:
+                raise RuntimeError("Record type 3 failed")
+            return x
+
+        pipeline = Pipeline(stages=[Stage("fail", fail, workers=2)])
+        with self.assertRaisesRegex(RuntimeError, "Record type 3"):
+            list(pipeline.run(items()))
+        self.assertLess(len(fed), 1000)
+        self.assertFalse(
+            [t for t in threading.enumerate() if t.name.startswith("pipeline-")]
+        )
+
+    def test_consumer_error_stops_threads(self):
+        pipeline = Pipeline(stages=[Stage("noop", lambda x: x)])
+        results = pipeline.run(range(1000))
+        next(results)
+        results.close()
+        self.assertFalse(
+            [t for t in threading.enumerate() if t.name.startswith("pipeline-")]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()